@@ -0,0 +1,447 @@
+"""
+bench_grid.py — Grid algorithm benchmark for Macan Bubble Shooter
+
+Times the flood fills behind every shot on seeded random boards, from the
+game's own 14×20 up to 200×200, across fill densities and color counts:
+
+    match      find_matching from a filled cell
+    cluster    find_connected_cluster from a filled cell
+    floating   find_floating_bubbles over the whole board
+    attach     a burst of landed shots the way GameState.land does it:
+               set, find_matching, clear the group (>= 3), pop_floating,
+               clear the floaters
+
+Implementations:
+
+    bubble_grid    module list API (packs the 2-D list on every call)
+    BubbleGrid     flat storage, no repacking; ``attach`` uses the
+                   incremental ``pop_floating``
+    bubble_engine  compiled wheel, when it imports on this platform
+    reference      the old recursive code (``tests/grid_reference.py``), only on
+                   boards up to ``REFERENCE_MAX_CELLS``
+    --impl MOD     any other module with the list API, e.g. a candidate
+                   replacement; it is parity-checked before it is timed
+
+Plain ``time.perf_counter`` harness, no extra dependencies. Each case is
+auto-calibrated to run at least ``--min-time`` per repeat; the report
+shows the best and median time per call.
+
+    python benchmarks/bench_grid.py                         # full matrix
+    python benchmarks/bench_grid.py --quick                 # 14x20 and 50x50 only
+    python benchmarks/bench_grid.py --json grid_bench.json
+    python benchmarks/bench_grid.py --compare grid_bench.json --threshold 0.25
+
+``--compare`` matches cases by board/impl/op against an earlier ``--json``
+report and exits with code 1 when any best time got slower than the
+threshold (25 % = 0.25). Numbers are only comparable on the same machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Modul game ada di root repo, satu level di atas benchmarks/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bubble_grid
+from bubble_grid import BubbleGrid
+from tests.grid_reference import random_grid, ref_connected, ref_floating, ref_matching
+
+
+SIZES = ((14, 20), (50, 50), (100, 100), (200, 200))
+QUICK_SIZES = SIZES[:2]
+DENSITIES = (0.5, 0.85)
+COLORS = (3, 6)
+OPS = ("match", "cluster", "floating", "attach")
+
+PROBES = 16                 # Cell awal berbeda per papan untuk match/cluster
+ATTACH_SHOTS = 20           # Tembakan per run attach
+REFERENCE_MAX_CELLS = 1000  # Referensi rekursif: di atas ini recursion limit
+MIN_TIME = 0.05             # Detik minimum per repeat (kalibrasi jumlah loop)
+REPEATS = 5
+THRESHOLD = 0.25
+
+
+# ============================================================
+# PAPAN & IMPLEMENTASI
+# ============================================================
+
+class Board:
+    """One seeded benchmark board plus the probe cells and shots used on it."""
+
+    def __init__(self, rows: int, cols: int, density: float, colors: int, seed: int):
+        self.rows = rows
+        self.cols = cols
+        self.density = density
+        self.colors = colors
+        rng = random.Random(f"{seed}:{rows}x{cols}:{density}:{colors}")
+        self.grid = random_grid(rng, rows, cols, density, colors)
+        filled = [(r, c) for r in range(rows) for c in range(cols) if self.grid[r][c] is not None]
+        empty = [(r, c) for r in range(rows) for c in range(cols) if self.grid[r][c] is None]
+        self.probes = rng.sample(filled, min(PROBES, len(filled)))
+        self.shots = [(r, c, rng.randrange(colors))
+                      for r, c in rng.sample(empty, min(ATTACH_SHOTS, len(empty)))]
+
+    @property
+    def key(self) -> str:
+        return f"{self.rows}x{self.cols}/d{self.density}/c{self.colors}"
+
+
+class _Reference:
+    """List API over the recursive reference in ``tests/grid_reference.py``."""
+
+    @staticmethod
+    def find_matching(grid, row, col):
+        matched = set()
+        ref_matching(grid, row, col, grid[row][col], matched)
+        return list(matched)
+
+    @staticmethod
+    def find_connected_cluster(grid, row, col):
+        connected = set()
+        ref_connected(grid, row, col, connected)
+        return list(connected)
+
+    @staticmethod
+    def find_floating_bubbles(grid):
+        return list(ref_floating(grid))
+
+
+def load_implementations(extra=()) -> dict:
+    """name -> module dengan list API. bubble_engine ikut kalau bisa di-import."""
+    impls = {"bubble_grid": bubble_grid}
+    try:
+        import bubble_engine
+        impls["bubble_engine"] = bubble_engine
+    except ImportError:
+        print("bubble_engine (compiled) not available — skipped", file=sys.stderr)
+    impls["reference"] = _Reference
+    for name in extra:
+        impls[name] = importlib.import_module(name)
+    return impls
+
+
+def _supports(impl_name: str, board: Board) -> bool:
+    return impl_name != "reference" or board.rows * board.cols <= REFERENCE_MAX_CELLS
+
+
+# ============================================================
+# CASE
+# ============================================================
+
+def _list_cases(impl, board: Board) -> dict:
+    """op -> fungsi tanpa argumen yang menjalankan satu panggilan list API."""
+    grid = board.grid
+    probes = board.probes
+    n = len(probes)
+    state = {"i": 0}
+
+    def match():
+        r, c = probes[state["i"] % n]
+        state["i"] += 1
+        impl.find_matching(grid, r, c)
+
+    def cluster():
+        r, c = probes[state["i"] % n]
+        state["i"] += 1
+        impl.find_connected_cluster(grid, r, c)
+
+    def floating():
+        impl.find_floating_bubbles(grid)
+
+    return {"match": match, "cluster": cluster, "floating": floating}
+
+
+def _attach_burst(board: BubbleGrid, shots) -> int:
+    """Tembakan beruntun seperti GameState.land (tanpa skor/power-up). Return cell yang hilang."""
+    removed = 0
+    for r, c, color in shots:
+        board.set(r, c, color)
+        matched = board.find_matching(r, c)
+        if len(matched) < 3:
+            continue
+        for mr, mc in matched:
+            board.set(mr, mc, None)
+        floating = board.pop_floating()
+        for fr, fc in floating:
+            board.set(fr, fc, None)
+        removed += len(matched) + len(floating)
+    return removed
+
+
+def _flat_cases(board: Board, engine=None) -> dict:
+    """Case di atas BubbleGrid (penyimpanan flat; ``engine`` = delegasi list API)."""
+    flat = BubbleGrid(board.rows, board.cols, 22, board.colors, engine=engine)
+    flat.grid = board.grid
+    probes = board.probes
+    n = len(probes)
+    state = {"i": 0}
+
+    def match():
+        r, c = probes[state["i"] % n]
+        state["i"] += 1
+        flat.find_matching(r, c)
+
+    def cluster():
+        r, c = probes[state["i"] % n]
+        state["i"] += 1
+        flat.find_connected_cluster(r, c)
+
+    def floating():
+        flat.find_floating_bubbles()
+
+    return {"match": match, "cluster": cluster, "floating": floating}
+
+
+def _attach_case(board: Board, engine=None):
+    """
+    ``(setup, run)`` untuk op attach. Papan di-reload di ``setup`` (tidak
+    diukur) karena setiap burst mengubahnya.
+    """
+    flat = BubbleGrid(board.rows, board.cols, 22, board.colors, engine=engine)
+
+    def setup():
+        flat.grid = board.grid
+        flat.pop_floating()     # Full rescan setelah load, di luar pengukuran
+
+    def run():
+        _attach_burst(flat, board.shots)
+
+    return setup, run
+
+
+def check_parity(impls: dict, board: Board) -> list:
+    """Bandingkan tiap implementasi dengan bubble_grid di papan ini sebelum diukur."""
+    problems = []
+    grid = board.grid
+    want_float = sorted(bubble_grid.find_floating_bubbles(grid))
+    for name, impl in impls.items():
+        if impl is bubble_grid or not _supports(name, board):
+            continue
+        if sorted(impl.find_floating_bubbles(grid)) != want_float:
+            problems.append(f"{name} {board.key}: find_floating_bubbles differs")
+        for r, c in board.probes:
+            if sorted(impl.find_matching(grid, r, c)) != sorted(bubble_grid.find_matching(grid, r, c)):
+                problems.append(f"{name} {board.key}: find_matching({r}, {c}) differs")
+            if (sorted(impl.find_connected_cluster(grid, r, c))
+                    != sorted(bubble_grid.find_connected_cluster(grid, r, c))):
+                problems.append(f"{name} {board.key}: find_connected_cluster({r}, {c}) differs")
+    return problems
+
+
+# ============================================================
+# TIMING
+# ============================================================
+
+def time_case(fn, setup=None, min_time: float = MIN_TIME, repeats: int = REPEATS) -> dict:
+    """
+    Per-call seconds of ``fn`` as ``{"best", "median", "loops"}``.
+
+    Without ``setup`` the loop count doubles until one repeat takes
+    ``min_time`` (like ``timeit.Timer.autorange``). With ``setup`` every call
+    is timed on its own after ``setup()`` and a repeat keeps calling until
+    ``min_time`` of measured time has accumulated.
+    """
+    clock = time.perf_counter
+    samples = []
+    loops = 1
+    if setup is None:
+        while True:
+            start = clock()
+            for _ in range(loops):
+                fn()
+            elapsed = clock() - start
+            if elapsed >= min_time:
+                break
+            loops *= 2
+        samples.append(elapsed / loops)
+        for _ in range(repeats - 1):
+            start = clock()
+            for _ in range(loops):
+                fn()
+            samples.append((clock() - start) / loops)
+    else:
+        for _ in range(repeats):
+            measured = 0.0
+            calls = 0
+            while measured < min_time:
+                setup()
+                start = clock()
+                fn()
+                measured += clock() - start
+                calls += 1
+            samples.append(measured / calls)
+            loops = max(loops, calls)
+    return {"best": min(samples), "median": statistics.median(samples), "loops": loops}
+
+
+def run(sizes=SIZES, densities=DENSITIES, colors=COLORS, seed: int = 0,
+        extra=(), min_time: float = MIN_TIME, repeats: int = REPEATS, progress=None) -> dict:
+    """Jalankan seluruh matrix; return report JSON-friendly."""
+    impls = load_implementations(extra)
+    engine = impls.get("bubble_engine")
+    boards = [Board(r, c, d, k, seed) for r, c in sizes for d in densities for k in colors]
+
+    results = []
+    problems = []
+    for n, board in enumerate(boards, 1):
+        problems.extend(check_parity(impls, board))
+
+        cases = []      # (impl, op, fn, setup)
+        for name, impl in impls.items():
+            if not _supports(name, board):
+                continue
+            for op, fn in _list_cases(impl, board).items():
+                cases.append((name, op, fn, None))
+        for op, fn in _flat_cases(board).items():
+            cases.append(("BubbleGrid", op, fn, None))
+        setup, fn = _attach_case(board)
+        cases.append(("BubbleGrid", "attach", fn, setup))
+        if engine is not None:
+            setup, fn = _attach_case(board, engine)
+            cases.append(("bubble_engine", "attach", fn, setup))
+
+        for name, op, fn, setup in cases:
+            t = time_case(fn, setup, min_time, repeats)
+            results.append({
+                "board": board.key, "impl": name, "op": op,
+                "best_us": round(t["best"] * 1e6, 2),
+                "median_us": round(t["median"] * 1e6, 2),
+                "loops": t["loops"],
+            })
+        if progress is not None:
+            progress(n, len(boards), board.key)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "impls": list(impls),
+            "min_time": min_time,
+            "repeats": repeats,
+        },
+        "parity_problems": problems,
+        "results": results,
+    }
+
+
+# ============================================================
+# REPORT
+# ============================================================
+
+def format_table(report: dict) -> str:
+    """Satu baris per papan × implementasi, kolom per op (best µs/call)."""
+    rows = {}
+    for res in report["results"]:
+        rows.setdefault((res["board"], res["impl"]), {})[res["op"]] = res["best_us"]
+    lines = [f"{'board':<22} {'impl':<14}" + "".join(f"{op:>12}" for op in OPS),
+             "-" * (37 + 12 * len(OPS))]
+    last_board = None
+    for (board, impl), ops in rows.items():
+        if last_board is not None and board != last_board:
+            lines.append("")
+        last_board = board
+        cells = "".join(f"{ops[op]:>12.1f}" if op in ops else f"{'-':>12}" for op in OPS)
+        lines.append(f"{board:<22} {impl:<14}{cells}")
+    lines.append("(best µs per call; attach = one burst of "
+                 f"{ATTACH_SHOTS} shots)")
+    return "\n".join(lines)
+
+
+def compare(report: dict, baseline: dict, threshold: float = THRESHOLD) -> tuple:
+    """
+    ``(lines, regressions)``: rasio best time report / baseline per case yang
+    ada di keduanya. Regresi = lebih lambat dari ``1 + threshold``.
+    """
+    base = {(r["board"], r["impl"], r["op"]): r["best_us"] for r in baseline["results"]}
+    lines = []
+    regressions = 0
+    for res in report["results"]:
+        key = (res["board"], res["impl"], res["op"])
+        if key not in base or base[key] <= 0:
+            continue
+        ratio = res["best_us"] / base[key]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + threshold):
+            flag = "  faster"
+        if flag:
+            lines.append(f"{key[0]:<22} {key[1]:<14} {key[2]:<9} "
+                         f"{base[key]:>10.1f} -> {res['best_us']:>10.1f} µs  x{ratio:.2f}{flag}")
+    missing = set(base) - {(r["board"], r["impl"], r["op"]) for r in report["results"]}
+    if missing:
+        lines.append(f"{len(missing)} baseline case(s) not run this time")
+    return lines, regressions
+
+
+def _parse_size(text: str) -> tuple:
+    rows, cols = text.lower().split("x")
+    return int(rows), int(cols)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="bench_grid", description="Grid algorithm benchmark (match / cluster / floating / attach).")
+    parser.add_argument("--sizes", type=lambda s: [_parse_size(p) for p in s.split(",")],
+                        default=None, metavar="RxC,...", help="mis. 14x20,200x200")
+    parser.add_argument("--quick", action="store_true", help="hanya 14x20 dan 50x50")
+    parser.add_argument("--density", type=lambda s: [float(p) for p in s.split(",")],
+                        default=list(DENSITIES))
+    parser.add_argument("--colors", type=lambda s: [int(p) for p in s.split(",")],
+                        default=list(COLORS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--impl", action="append", default=[], metavar="MODULE",
+                        help="modul tambahan dengan list API (boleh berulang)")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--json", default=None, metavar="PATH", help="tulis report JSON")
+    parser.add_argument("--compare", default=None, metavar="PATH", help="report JSON baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+
+    def progress(done, total, key):
+        print(f"\r{done}/{total} boards  {key:<22}", end="", file=sys.stderr, flush=True)
+
+    report = run(sizes, args.density, args.colors, args.seed, args.impl,
+                 args.min_time, args.repeats, progress)
+    print(file=sys.stderr)
+    print(format_table(report))
+
+    failed = False
+    for line in report["parity_problems"][:20]:
+        print("MISMATCH", line)
+    if report["parity_problems"]:
+        failed = True
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=1), encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        lines, regressions = compare(report, baseline, args.threshold)
+        print()
+        print(f"vs {args.compare} (threshold {args.threshold:.0%}):")
+        for line in lines:
+            print(line)
+        print(f"{regressions} regression(s)")
+        failed |= regressions > 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""
+bench_render.py — Offscreen rendering stress benchmark for Macan Bubble Shooter
+
+Plays scripted shots through the real ``GameScene`` (via ``MainWindow``, so
+every HUD signal stays connected) with no display and no human:
+
+- ``QT_QPA_PLATFORM=offscreen`` unless the caller set a platform
+- ``scene.timer`` is stopped; the benchmark calls ``update_game`` itself as
+  fast as it can. The scene's animation clock (``scene.frames``) and shot
+  physics clock (``scene.shot_clock``) read a virtual clock that moves
+  ``FRAME_MS`` per frame, so the game sees 60 fps worth of time however
+  fast or slow the frames really are
+- every frame is rendered with ``QGraphicsScene.render`` into one reused
+  ``QImage`` (antialiased, like ``GameView``)
+- shots are seeded random angles, or ``--angles FILE``: a JSON list of
+  angles, or a replay (``replays.json`` entry) whose shot angles are used
+- ``--powers`` fires a charged power-up every few shots (more particles,
+  bigger removals)
+
+After a shot lands the loop keeps rendering for ``--settle`` frames and at
+least ``CEILING_WAIT_S`` of wall time (ceiling drops still run on a 100 ms
+``QTimer.singleShot``). On game over a new game starts and the run goes on.
+Saves go to a throwaway home directory, so benchmark games never touch the
+real save, high score or leaderboard. Sound runs in ``sfx_mode="null"``
+(``SfxMixer`` into ``NullSink``, no BGM), so neither an audio device nor
+QtMultimedia is needed. ``update_game`` pumps the null sink once per frame,
+so SFX mixing is part of the update time and shows up as the ``audio`` phase.
+
+Reported: frames/sec (update + render), per-frame update / render time at
+p50/p95/p99, the ``bubble_perf`` phase split, scene item count (sampled),
+bubble pool / particle / tween peaks and peak RSS.
+
+    python benchmarks/bench_render.py --shots 200
+    python benchmarks/bench_render.py --shots 300 --powers --json render_bench.json
+    python benchmarks/bench_render.py --min-fps 120          # exit 1 below this
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Save/leaderboard ke home sementara (Path.home() baca HOME / USERPROFILE)
+_HOME = tempfile.mkdtemp(prefix="bubble_bench_")
+os.environ["HOME"] = os.environ["USERPROFILE"] = _HOME
+atexit.register(shutil.rmtree, _HOME, True)
+
+# Modul game ada di root repo, satu level di atas benchmarks/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import resource
+except ImportError:       # Windows
+    resource = None
+
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication
+
+from bubble_perf import FrameProfiler, PHASES, percentile
+
+
+FRAME_MS = 16               # Sama dengan interval GameScene.timer
+SETTLE_FRAMES = 30          # Frame setelah bubble nempel (popup, ceiling tween, partikel)
+CEILING_WAIT_S = 0.12       # Ceiling drop: QTimer.singleShot(100) di wall time
+MAX_FLIGHT_FRAMES = 600     # Pengaman kalau tembakan tidak pernah mendarat
+ITEM_SAMPLE_EVERY = 30      # scene.items() mahal — sampel tiap N frame, di luar pengukuran
+POWER_EVERY = 6             # --powers: satu power-up tiap N tembakan
+POWER_CYCLE = ("bomb", "laser", "fireball", "rainbow", "freeze")
+
+
+class VirtualClock:
+    """Monotonic stand-in that only moves when ``advance()`` is called."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def peak_rss_mb():
+    """Peak RSS proses ini (MB), ``None`` kalau modul ``resource`` tidak ada."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: kilobyte, macOS: byte
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def load_angles(path) -> list:
+    """Sudut tembakan dari list JSON, replay dict, atau list replay (yang pertama)."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        data = data[0]
+    if isinstance(data, dict):
+        return [e["d"]["angle"] for e in data.get("events", []) if e.get("k") == "shot"]
+    return [float(a) for a in data]
+
+
+def _spread_ms(values) -> dict:
+    ordered = sorted(values)
+    return {
+        "p50": round(percentile(ordered, 0.50), 3),
+        "p95": round(percentile(ordered, 0.95), 3),
+        "p99": round(percentile(ordered, 0.99), 3),
+        "max": round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+# ============================================================
+# BENCHMARK
+# ============================================================
+
+class RenderBench:
+    """
+    Drives one ``MainWindow``'s scene frame by frame. ``frame()`` is one
+    game-loop iteration plus one render; ``shoot(angle)`` fires and runs
+    frames until the shot has landed and settled.
+    """
+
+    def __init__(self, app, seed: int = 0, scale: float = 1.0, settle: int = SETTLE_FRAMES):
+        # Audio selalu null sink tanpa BGM: CI headless sering tanpa QtMultimedia/libpulse.
+        # update_game mem-pump NullSink tiap frame -> mixing terukur di fase "audio"
+        from bubble_fx import get_sound_manager
+        get_sound_manager(sfx_mode="null")
+        import macan_bubble_shooter as game
+
+        self.app = app
+        self.settle = settle
+        random.seed(seed)          # Grid awal & seed replay ikut modul random
+        self.window = game.MainWindow()
+        self.window.start_new_game()
+        self.window.hide()         # Hanya scene.render yang menggambar, GameView tidak
+        scene = self.scene = self.window.scene
+        scene.timer.stop()         # Frame digerakkan benchmark, bukan QTimer
+
+        self.clock = VirtualClock()
+        scene.frames.clock = self.clock
+        scene.frames.resume()
+        scene.shot_clock.clock = self.clock
+
+        # Game over -> langsung game baru (tanpa dialog modal)
+        self.games = 1
+        self._over = False
+        scene.game_over.disconnect()
+        scene.game_over.connect(self._on_game_over)
+
+        rect = scene.sceneRect()
+        self.image = QImage(max(1, int(rect.width() * scale)), max(1, int(rect.height() * scale)),
+                            QImage.Format_ARGB32_Premultiplied)
+        self._target = QRectF(0, 0, self.image.width(), self.image.height())
+
+        self.profiler = FrameProfiler(window=1_000_000)
+        scene.frame_prof = self.profiler
+        self.update_ms = []
+        self.render_ms = []
+        self.item_counts = []
+        self.peak = {"particles": 0, "tweens": 0, "tasks": 0}
+        self.shots = 0
+        self.wall = 0.0
+
+    def _on_game_over(self):
+        self._over = True
+
+    # --- Frame ---
+
+    def frame(self):
+        scene = self.scene
+        fp = self.profiler
+        clock = time.perf_counter
+        self.clock.advance(FRAME_MS / 1000.0)
+
+        start = clock()
+        scene.update_game()
+        mid = clock()
+        fp.enter("paint")
+        painter = QPainter(self.image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        scene.render(painter, self._target, scene.sceneRect())
+        painter.end()
+        fp.leave()
+        end = clock()
+        self.update_ms.append((mid - start) * 1000.0)
+        self.render_ms.append((end - mid) * 1000.0)
+        self.wall += end - start
+
+        # Event Qt (singleShot ceiling, HUD) — tidak dihitung ke frame
+        self.app.processEvents()
+        peak = self.peak
+        peak["particles"] = max(peak["particles"], len(scene.particles))
+        peak["tweens"] = max(peak["tweens"], len(scene.tweens))
+        peak["tasks"] = max(peak["tasks"], len(scene.frames))
+        if len(self.update_ms) % ITEM_SAMPLE_EVERY == 0:
+            self.item_counts.append(len(scene.items()))
+
+    def shoot(self, angle: float, power: str = None):
+        scene = self.scene
+        if self._over:
+            self._over = False
+            self.games += 1
+            self.window.start_new_game()
+            scene.timer.stop()
+        if power is not None:
+            scene.power_manager.add_powerup_charge(power)
+            scene.activate_power(power)
+        scene.update_aim_line(angle)
+        scene.shoot_bubble(angle)
+        self.shots += 1
+        for _ in range(MAX_FLIGHT_FRAMES):
+            if not (scene.flying_bubble or scene.shooting):
+                break
+            self.frame()
+        landed = time.perf_counter()
+        for _ in range(self.settle):
+            self.frame()
+        while time.perf_counter() - landed < CEILING_WAIT_S:
+            self.frame()
+
+    # --- Report ---
+
+    def report(self) -> dict:
+        frames = len(self.update_ms)
+        summary = self.profiler.summary()
+        pool = self.scene.bubble_pool.stats()
+        items = self.item_counts or [len(self.scene.items())]
+        return {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "qpa": os.environ.get("QT_QPA_PLATFORM"),
+                "image": [self.image.width(), self.image.height()],
+            },
+            "shots": self.shots,
+            "games": self.games,
+            "frames": frames,
+            "wall_s": round(self.wall, 3),
+            "fps": round(frames / self.wall, 1) if self.wall else 0.0,
+            "update_ms": _spread_ms(self.update_ms),
+            "render_ms": _spread_ms(self.render_ms),
+            "phases_ms": {name: summary["phases_ms"][name] for name in PHASES},
+            "items": {"min": min(items), "mean": round(sum(items) / len(items), 1),
+                      "max": max(items)},
+            "pool": pool,
+            "peak": dict(self.peak),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+def format_report(report: dict) -> str:
+    up, rd = report["update_ms"], report["render_ms"]
+    items = report["items"]
+    pool = report["pool"]
+    peak = report["peak"]
+    rss = report["peak_rss_mb"]
+    lines = [
+        f"{report['shots']} shots, {report['games']} game(s), {report['frames']} frames "
+        f"in {report['wall_s']:.2f}s  ->  {report['fps']:.1f} fps "
+        f"({report['meta']['image'][0]}x{report['meta']['image'][1]})",
+        f"{'':<11} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  ms",
+        f"{'update':<11} {up['p50']:>8.3f} {up['p95']:>8.3f} {up['p99']:>8.3f} {up['max']:>8.3f}",
+        f"{'render':<11} {rd['p50']:>8.3f} {rd['p95']:>8.3f} {rd['p99']:>8.3f} {rd['max']:>8.3f}",
+    ]
+    for name, ph in report["phases_ms"].items():
+        lines.append(f"  {name:<9} {ph['p50']:>8.3f} {ph['p95']:>8.3f} {ph['p99']:>8.3f} {ph['max']:>8.3f}")
+    lines += [
+        f"scene items  min {items['min']}  mean {items['mean']}  max {items['max']}",
+        f"bubble pool  live {pool['live']}  free {pool['free']}  peak {pool['peak_live']}"
+        f"  created {pool['created']}",
+        f"peak         particles {peak['particles']}  tweens {peak['tweens']}  tasks {peak['tasks']}",
+        f"peak RSS     {rss if rss is not None else 'n/a'} MB",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="bench_render", description="Offscreen GameScene rendering stress benchmark.")
+    parser.add_argument("--shots", "-n", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--angles", default=None, metavar="FILE",
+                        help="JSON list sudut, atau replay (replays.json)")
+    parser.add_argument("--powers", action="store_true",
+                        help=f"power-up tiap {POWER_EVERY} tembakan")
+    parser.add_argument("--settle", type=int, default=SETTLE_FRAMES,
+                        help="frame setelah bubble nempel")
+    parser.add_argument("--scale", type=float, default=1.0, help="skala QImage target")
+    parser.add_argument("--json", default=None, metavar="PATH", help="tulis report JSON")
+    parser.add_argument("--min-fps", type=float, default=None,
+                        help="exit 1 kalau fps di bawah ini (CI)")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    bench = RenderBench(app, args.seed, args.scale, args.settle)
+
+    if args.angles:
+        angles = load_angles(args.angles)
+    else:
+        aim = random.Random(args.seed)
+        angles = [aim.uniform(20, 160) for _ in range(args.shots)]
+
+    for i in range(min(args.shots, len(angles))):
+        power = POWER_CYCLE[(i // POWER_EVERY) % len(POWER_CYCLE)] \
+            if args.powers and i % POWER_EVERY == POWER_EVERY - 1 else None
+        bench.shoot(angles[i], power)
+        print(f"\r{i + 1}/{args.shots} shots", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+
+    report = bench.report()
+    print(format_report(report))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=1), encoding="utf-8")
+    if args.min_fps is not None and report["fps"] < args.min_fps:
+        print(f"fps {report['fps']:.1f} < {args.min_fps:.1f}  FAIL")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,7 @@ Modul ini mengelola:
 - Achievement HUD display
 """
 
-from PySide6.QtCore import QObject, Signal, QTimer
+from PySide6.QtCore import QObject, Signal
 from PySide6.QtWidgets import QGraphicsRectItem, QGraphicsTextItem, QGraphicsEllipseItem
 from PySide6.QtGui import QColor, QBrush, QPen, QLinearGradient, QFont, QRadialGradient
 from PySide6.QtCore import Qt
@@ -17,6 +17,8 @@ from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Optional
 
+from bubble_anim import tweens_for, OUT_CUBIC
+
 
 # ============================================================
 # ACHIEVEMENT DEFINITION
@@ -292,6 +294,9 @@ class AchievementToast:
     TOAST_W = 320
     TOAST_H = 72
     PADDING = 14
+    SLIDE_MS = 330     # Slide masuk dari kanan
+    HOLD_MS = 2900     # Diam di tempat
+    FADE_MS = 480      # Fade out lalu dihapus
 
     def __init__(self, scene, ach_def: AchievementDef, scene_width: int):
         self.scene = scene
@@ -367,51 +372,21 @@ class AchievementToast:
             scene.addItem(reward)
             self._items.append(reward)
 
-        # Auto-dismiss setelah 3.5 detik
-        self._frame = 0
-        self._phase = 0  # 0=slide in, 1=hold, 2=fade out
-        self._start_x = scene_width + 10
-        self._target_x = x
-        self._current_x = float(self._start_x)
+        # Slide masuk, tahan ~3 detik, lalu fade out — semua lewat tween scene
+        start_x = scene_width + 10
+        tweens = tweens_for(scene)
+        for item in self._items:
+            item.setPos(item.x() + (start_x - x), item.y())
+            tweens.move(item, item.x() - (start_x - x), item.y(), self.SLIDE_MS, OUT_CUBIC)
+            tweens.fade(item, 0.0, self.FADE_MS, delay_ms=self.SLIDE_MS + self.HOLD_MS)
+        tweens.fade(bg, 0.0, self.FADE_MS, delay_ms=self.SLIDE_MS + self.HOLD_MS,
+                    on_done=self._remove)
 
+    def _remove(self):
         for item in self._items:
-            item.setPos(item.x() + (self._start_x - x), item.y())
-
-        self._timer = QTimer()
-        self._timer.setInterval(16)
-        self._timer.timeout.connect(self._animate)
-        self._timer.start()
-
-    def _animate(self):
-        self._frame += 1
-
-        if self._phase == 0:
-            # Slide in
-            dx = (self._target_x - self._current_x) * 0.25
-            self._current_x += dx
-            offset = self._current_x - self._target_x
-            for item in self._items:
-                item.moveBy(dx, 0)
-            if abs(offset) < 1.0:
-                self._phase = 1
-                self._frame = 0
-
-        elif self._phase == 1:
-            # Hold 3 detik
-            if self._frame > 180:
-                self._phase = 2
-                self._frame = 0
-
-        elif self._phase == 2:
-            # Fade out
-            opacity = max(0.0, 1.0 - self._frame / 30.0)
-            for item in self._items:
-                item.setOpacity(opacity)
-            if self._frame >= 30:
-                self._timer.stop()
-                for item in self._items:
-                    if item.scene():
-                        self.scene.removeItem(item)
+            if item.scene():
+                self.scene.removeItem(item)
+        self._items.clear()
 
 
 # ============================================================
@@ -0,0 +1,451 @@
+"""
+bubble_anim.py — Shared animation clock for Macan Bubble Shooter
+
+Scene animations (score popups, achievement toasts, boss and danger-zone
+pulses, the countdown flash, power-up effects, the shot timer) all run off
+one ``FrameScheduler`` instead of a ``QTimer`` each. ``GameScene`` owns the
+scheduler as ``scene.frames`` and ticks it once per frame from
+``update_game``. Stopping the game loop therefore freezes every animation
+together. ``pause()``/``resume()`` also make sure the pause itself is not
+counted as elapsed time.
+
+A task is a callback plus an optional interval, start delay and lifetime.
+Intervals and lifetimes are in milliseconds of *scheduler* time: monotonic
+time that only advances while the scheduler ticks unpaused, with each frame
+clamped like ``FixedStepClock``. ``after(ms, fn)`` replaces
+``QTimer.singleShot``.
+
+Position and opacity tweens go through a ``TweenSet`` (``scene.tweens``)
+instead of one ``QVariantAnimation`` per item. Each row holds item, kind,
+start, end, start time, duration and easing code, stored in preallocated
+parallel arrays. One scheduler task advances every row per frame, and
+finished rows are compacted away. As in ``bubble_particles``, the step
+runs on whole NumPy arrays when NumPy is importable, otherwise a loop over
+``array`` storage. The easing curves reproduce the ``QEasingCurve`` ones
+of the same name.
+
+No PySide6 dependency here apart from the fallback timer.
+``scheduler_for(scene)``/``tweens_for(scene)`` fall back to a module-level
+scheduler driven by its own ``QTimer`` for scenes that do not own one.
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+
+from bubble_physics import MAX_FRAME_SECONDS
+
+# NumPy opsional: tanpa NumPy, TweenSet.step() jalan di loop Python atas array('d').
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+FRAME_MS = 16   # Interval game loop (GameScene.timer)
+
+
+class FrameTask:
+    """
+    Handle returned by ``FrameScheduler.add``. ``cancel()`` stops it without
+    calling ``on_done``; the scheduler drops it on the next tick.
+    """
+
+    __slots__ = ("callback", "interval", "lifetime", "delay", "on_done",
+                 "age", "due", "active")
+
+    def __init__(self, callback, interval, lifetime, delay, on_done):
+        self.callback = callback
+        self.interval = interval
+        self.lifetime = lifetime
+        self.delay = delay
+        self.on_done = on_done
+        self.age = 0.0      # detik sejak task ditambahkan
+        self.due = 0.0      # akumulator interval
+        self.active = True
+
+    def cancel(self):
+        self.active = False
+
+
+class FrameScheduler:
+    """
+    One clock for every animated component of a scene.
+
+    ``add(callback, interval_ms=0, lifetime_ms=None, delay_ms=0, on_done=None)``
+    registers ``callback()``. With ``interval_ms=0`` it runs every frame;
+    otherwise it runs each time ``interval_ms`` of scheduler time has
+    passed, catching up after a slow frame. A callback returning ``False``
+    ends its task. A task also ends once it is ``lifetime_ms`` old. Either
+    way ``on_done()`` then runs.
+    """
+
+    def __init__(self, max_frame: float = MAX_FRAME_SECONDS, clock=None):
+        self.max_frame = max_frame
+        self.clock = clock or time.monotonic
+        self.tasks = []
+        self.paused = False
+        self.now = 0.0        # waktu scheduler (detik), tidak jalan saat pause
+        self.frames = 0
+        self._last = None
+
+    def __len__(self):
+        return sum(1 for task in self.tasks if task.active)
+
+    # ── Registrasi ─────────────────────────────────────────────────────────
+
+    def add(self, callback=None, interval_ms: float = 0, lifetime_ms: float = None,
+            delay_ms: float = 0, on_done=None) -> FrameTask:
+        task = FrameTask(callback, interval_ms / 1000.0,
+                         None if lifetime_ms is None else lifetime_ms / 1000.0,
+                         delay_ms / 1000.0, on_done)
+        self.tasks.append(task)
+        return task
+
+    def after(self, delay_ms: float, callback) -> FrameTask:
+        """Panggil ``callback()`` sekali setelah ``delay_ms`` (pengganti singleShot)."""
+        return self.add(None, lifetime_ms=delay_ms, on_done=callback)
+
+    def clear(self):
+        """Batalkan semua task tanpa memanggil ``on_done``."""
+        for task in self.tasks:
+            task.active = False
+        self.tasks.clear()
+
+    # ── Pause ──────────────────────────────────────────────────────────────
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        """Lanjut dari sekarang — durasi pause tidak dihitung."""
+        self.paused = False
+        self._last = None
+
+    # ── Frame ──────────────────────────────────────────────────────────────
+
+    def tick(self):
+        """Majukan semua task satu frame. Dipanggil sekali per frame game loop."""
+        if self.paused:
+            return
+        now = self.clock()
+        elapsed = 0.0 if self._last is None else min(max(now - self._last, 0.0),
+                                                      self.max_frame)
+        self._last = now
+        self.now += elapsed
+        self.frames += 1
+
+        # Snapshot: task yang ditambah di tengah tick mulai di frame berikutnya
+        for task in tuple(self.tasks):
+            if task.active:
+                self._step(task, elapsed)
+        self.tasks = [task for task in self.tasks if task.active]
+
+    def _step(self, task: FrameTask, elapsed: float):
+        task.age += elapsed
+        if task.callback is not None and task.age >= task.delay:
+            if task.interval <= 0:
+                if task.callback() is False:
+                    self._finish(task)
+                    return
+            else:
+                task.due += min(elapsed, task.age - task.delay)
+                while task.due >= task.interval and task.active:
+                    task.due -= task.interval
+                    if task.callback() is False:
+                        self._finish(task)
+                        return
+        if task.active and task.lifetime is not None and task.age >= task.lifetime:
+            self._finish(task)
+
+    def _finish(self, task: FrameTask):
+        if not task.active:
+            return
+        task.active = False
+        if task.on_done is not None:
+            task.on_done()
+
+
+# ── Tween ──────────────────────────────────────────────────────────────────
+
+# Kurva easing (kode disimpan per baris tween)
+LINEAR = 0
+OUT_QUAD = 1
+OUT_CUBIC = 2
+OUT_BOUNCE = 3
+
+# Jenis properti yang di-tween
+TWEEN_POS = 0        # item.setPos(x, y)
+TWEEN_OPACITY = 1    # item.setOpacity(x)
+
+TWEEN_CAPACITY = 256   # Tumbuh 2x kalau penuh (board penuh + popup + toast)
+
+_TWEEN_FIELDS = (
+    ("kind", 'b'), ("ease", 'b'),
+    ("x0", 'd'), ("y0", 'd'), ("x1", 'd'), ("y1", 'd'),
+    ("t0", 'd'), ("duration", 'd'),
+)
+_DTYPES = {'d': 'float64', 'b': 'int8'}
+
+
+def _bounce(t: float) -> float:
+    # Sama dengan QEasingCurve.OutBounce (amplitudo 1)
+    if t >= 1.0:
+        return 1.0
+    if t < 4 / 11.0:
+        return 7.5625 * t * t
+    if t < 8 / 11.0:
+        t -= 6 / 11.0
+        return 7.5625 * t * t + 0.75
+    if t < 10 / 11.0:
+        t -= 9 / 11.0
+        return 7.5625 * t * t + 0.9375
+    t -= 21 / 22.0
+    return 7.5625 * t * t + 0.984375
+
+
+def ease(code: int, t: float) -> float:
+    """Nilai kurva ``code`` di progress ``t`` (0..1)."""
+    if code == OUT_QUAD:
+        return t * (2.0 - t)
+    if code == OUT_CUBIC:
+        t -= 1.0
+        return t * t * t + 1.0
+    if code == OUT_BOUNCE:
+        return _bounce(t)
+    return t
+
+
+def _ease_numpy(codes, t):
+    out = t.copy()
+    m = codes == OUT_QUAD
+    if m.any():
+        out[m] = t[m] * (2.0 - t[m])
+    m = codes == OUT_CUBIC
+    if m.any():
+        u = t[m] - 1.0
+        out[m] = u * u * u + 1.0
+    m = codes == OUT_BOUNCE
+    if m.any():
+        u = t[m]
+        # Empat segmen parabola: (batas, pergeseran, offset)
+        seg = np.select([u < 4 / 11.0, u < 8 / 11.0, u < 10 / 11.0],
+                        [0.0, 6 / 11.0, 9 / 11.0], 21 / 22.0)
+        off = np.select([u < 4 / 11.0, u < 8 / 11.0, u < 10 / 11.0],
+                        [0.0, 0.75, 0.9375], 0.984375)
+        v = u - seg
+        out[m] = np.where(u >= 1.0, 1.0, 7.5625 * v * v + off)
+    return out
+
+
+class TweenSet:
+    """
+    All running tweens of a scene, advanced by one ``FrameScheduler`` task.
+
+    ``move(item, x, y, ms)`` and ``fade(item, opacity, ms)`` add a row. A
+    new tween of the same kind on the same item replaces the old row and
+    starts from the item's current value. ``delay_ms`` postpones the start;
+    until then the item is left alone. ``on_done()`` runs after the final
+    value is applied. ``cancel(item)`` drops an item's rows without
+    calling ``on_done``. ``use_numpy=None`` picks NumPy when it is
+    available.
+    """
+
+    def __init__(self, frames: FrameScheduler, capacity: int = TWEEN_CAPACITY,
+                 use_numpy: bool = None):
+        self.frames = frames
+        self.use_numpy = NUMPY_AVAILABLE if use_numpy is None else (use_numpy and NUMPY_AVAILABLE)
+        self.capacity = 0
+        for name, code in _TWEEN_FIELDS:
+            setattr(self, name, np.zeros(0, dtype=_DTYPES[code]) if self.use_numpy
+                    else array(code))
+        self._grow(capacity)
+        self.items = []        # item per baris (None = dibatalkan)
+        self.on_done = []      # callback per baris
+        self.count = 0
+        self._slots = {}       # (id(item), kind) -> baris
+        self.task = frames.add(self.step)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, capacity: int):
+        extra = capacity - self.capacity
+        for name, code in _TWEEN_FIELDS:
+            a = getattr(self, name)
+            if self.use_numpy:
+                setattr(self, name, np.concatenate((a, np.zeros(extra, dtype=_DTYPES[code]))))
+            else:
+                a.extend(array(code, [0]) * extra)
+        self.capacity = capacity
+
+    # --- Tambah / batal ---
+
+    def move(self, item, x: float, y: float, duration_ms: float, easing: int = OUT_QUAD,
+             delay_ms: float = 0, on_done=None):
+        pos = item.pos()
+        self._add(item, TWEEN_POS, pos.x(), pos.y(), x, y, duration_ms, easing,
+                  delay_ms, on_done)
+
+    def fade(self, item, opacity: float, duration_ms: float, easing: int = LINEAR,
+             delay_ms: float = 0, on_done=None):
+        self._add(item, TWEEN_OPACITY, item.opacity(), 0.0, opacity, 0.0, duration_ms,
+                  easing, delay_ms, on_done)
+
+    def _add(self, item, kind, x0, y0, x1, y1, duration_ms, easing, delay_ms, on_done):
+        key = (id(item), kind)
+        i = self._slots.get(key)
+        if i is None:
+            if self.count == self.capacity:
+                self._grow(self.capacity * 2)
+            i = self.count
+            self.count += 1
+            self.items.append(item)
+            self.on_done.append(on_done)
+            self._slots[key] = i
+        else:
+            self.on_done[i] = on_done
+        self.kind[i] = kind
+        self.ease[i] = easing
+        self.x0[i] = x0
+        self.y0[i] = y0
+        self.x1[i] = x1
+        self.y1[i] = y1
+        self.t0[i] = self.frames.now + delay_ms / 1000.0
+        self.duration[i] = max(duration_ms / 1000.0, 1e-6)
+
+    def cancel(self, item):
+        for kind in (TWEEN_POS, TWEEN_OPACITY):
+            i = self._slots.pop((id(item), kind), None)
+            if i is not None:
+                self.items[i] = None
+                self.on_done[i] = None
+
+    def clear(self):
+        self.count = 0
+        self.items.clear()
+        self.on_done.clear()
+        self._slots.clear()
+
+    # --- Frame ---
+
+    def step(self):
+        """Terapkan nilai semua tween untuk waktu scheduler sekarang."""
+        if not self.count:
+            return
+        if self.use_numpy:
+            done = self._step_numpy()
+        else:
+            done = self._step_python()
+        if done:
+            self._compact(done)
+
+    def _step_numpy(self) -> list:
+        n = self.count
+        t = (self.frames.now - self.t0[:n]) / self.duration[:n]
+        started = t >= 0.0
+        np.clip(t, 0.0, 1.0, out=t)
+        e = _ease_numpy(self.ease[:n], t)
+        x0, y0 = self.x0[:n], self.y0[:n]
+        xs = (x0 + (self.x1[:n] - x0) * e).tolist()
+        ys = (y0 + (self.y1[:n] - y0) * e).tolist()
+        kinds = self.kind[:n].tolist()
+        items = self.items
+        # tolist(): float/int Python biasa (akses per elemen NumPy lambat)
+        for i in np.flatnonzero(started).tolist():
+            item = items[i]
+            if item is None:
+                continue
+            if kinds[i] == TWEEN_POS:
+                item.setPos(xs[i], ys[i])
+            else:
+                item.setOpacity(xs[i])
+        return np.flatnonzero(t >= 1.0).tolist()
+
+    def _step_python(self) -> list:
+        now = self.frames.now
+        kind, code = self.kind, self.ease
+        x0, y0, x1, y1 = self.x0, self.y0, self.x1, self.y1
+        t0, duration = self.t0, self.duration
+        items = self.items
+        done = []
+        for i in range(self.count):
+            t = (now - t0[i]) / duration[i]
+            if t < 0.0:
+                continue
+            if t >= 1.0:
+                t = 1.0
+                done.append(i)
+            item = items[i]
+            if item is None:
+                continue
+            e = ease(code[i], t)
+            if kind[i] == TWEEN_POS:
+                item.setPos(x0[i] + (x1[i] - x0[i]) * e, y0[i] + (y1[i] - y0[i]) * e)
+            else:
+                item.setOpacity(x0[i] + (x1[i] - x0[i]) * e)
+        return done
+
+    def _compact(self, done: list):
+        """Buang baris selesai/dibatalkan (urutan tetap), lalu panggil on_done."""
+        finished = set(done)
+        callbacks = [self.on_done[i] for i in done if self.items[i] is not None]
+        keep = [i for i in range(self.count)
+                if i not in finished and self.items[i] is not None]
+        k = len(keep)
+        for name, _ in _TWEEN_FIELDS:
+            a = getattr(self, name)
+            if self.use_numpy:
+                a[:k] = a[keep]
+            else:
+                for j, i in enumerate(keep):
+                    a[j] = a[i]
+        self.items = [self.items[i] for i in keep]
+        self.on_done = [self.on_done[i] for i in keep]
+        self.count = k
+        self._slots = {(id(item), kind): j for j, (item, kind)
+                       in enumerate(zip(self.items, self.kind[:k].tolist()))}
+        for callback in callbacks:
+            if callback is not None:
+                callback()
+
+
+# ── Fallback untuk scene tanpa scheduler ───────────────────────────────────
+
+_fallback = None
+_fallback_timer = None
+
+
+def scheduler_for(scene=None) -> FrameScheduler:
+    """
+    Scheduler milik ``scene`` (``scene.frames``). Scene lain memakai satu
+    scheduler bersama yang di-tick oleh ``QTimer`` sendiri.
+    """
+    frames = getattr(scene, "frames", None)
+    if isinstance(frames, FrameScheduler):
+        return frames
+    global _fallback, _fallback_timer
+    if _fallback is None:
+        from PySide6.QtCore import QTimer
+        _fallback = FrameScheduler()
+        _fallback_timer = QTimer()
+        _fallback_timer.timeout.connect(_fallback.tick)
+        _fallback_timer.start(FRAME_MS)
+    return _fallback
+
+
+_fallback_tweens = None
+
+
+def tweens_for(scene=None) -> TweenSet:
+    """TweenSet milik ``scene`` (``scene.tweens``), atau milik scheduler fallback."""
+    tweens = getattr(scene, "tweens", None)
+    if isinstance(tweens, TweenSet):
+        return tweens
+    global _fallback_tweens
+    if _fallback_tweens is None:
+        _fallback_tweens = TweenSet(scheduler_for())
+    return _fallback_tweens
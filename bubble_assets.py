@@ -0,0 +1,137 @@
+"""
+bubble_assets.py — Background asset loader for Macan Bubble Shooter
+
+Wallpapers and generated graphics are decoded off the GUI thread. A worker
+from a private ``QThreadPool`` reads (or generates) each asset as a
+``QImage`` and scales it there; the result is posted back to the GUI
+thread, turned into a ``QPixmap`` (pixmaps may only be created on the GUI
+thread) and cached under its key.
+
+Callers never block: ``load()`` returns the cached pixmap or ``None``, and
+the callback fires once the pixmap is ready. Until then widgets draw their
+own placeholder (a gradient, a solid fill). Several callers asking for the
+same key share one decode.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from PySide6.QtCore import (QCoreApplication, QObject, QRunnable, QThread,
+                            QThreadPool, Qt, Signal)
+from PySide6.QtGui import QImage, QPixmap
+
+
+# Jumlah worker: decode webp/PNG berat di CPU, 2 thread cukup
+LOADER_THREADS = 2
+
+
+class _ImageJob(QRunnable):
+    """Decode/generate satu image di worker thread (hanya QImage, tanpa QPixmap)."""
+
+    def __init__(self, loader, key, path, generator, size, aspect):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+        self.path = path
+        self.generator = generator
+        self.size = size
+        self.aspect = aspect
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            if self.generator is not None:
+                image = self.generator()
+            else:
+                image = QImage(str(self.path))
+            if image is not None and not image.isNull() and self.size:
+                image = image.scaled(self.size[0], self.size[1], self.aspect,
+                                     Qt.SmoothTransformation)
+        except Exception as e:
+            print(f"  ⚠️ Asset '{self.key}' gagal dimuat: {e}")
+            image = None
+        if image is None:
+            image = QImage()
+        # Signal dari worker -> queued ke GUI thread
+        self.loader._image_ready.emit(self.key, image, start, time.perf_counter())
+
+
+class AssetLoader(QObject):
+    """
+    Asynchronous image cache.
+
+    ``load(key, path=...)`` decodes a file; ``load(key, generator=fn)`` runs
+    ``fn() -> QImage`` instead (it must only paint on ``QImage``). ``size``
+    scales the image in the worker. ``ready(key)`` is emitted for every
+    finished asset; ``wait()`` blocks until all pending loads are delivered.
+    """
+
+    ready = Signal(str)
+    _image_ready = Signal(str, QImage, float, float)
+
+    def __init__(self, threads: int = LOADER_THREADS):
+        super().__init__()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max(1, min(threads, QThread.idealThreadCount())))
+        self.cache = {}         # key -> QPixmap (None kalau gagal)
+        self.callbacks = {}     # key -> [callback, ...] yang menunggu
+        self.timings = {}       # key -> detik decode di worker
+        self.spans = {}         # key -> (mulai, selesai) perf_counter di worker
+        self._image_ready.connect(self._deliver)
+
+    def load(self, key: str, path=None, generator=None, size=None,
+             aspect=Qt.IgnoreAspectRatio, callback=None):
+        """
+        Minta asset ``key``. Return pixmap kalau sudah ada di cache, selain
+        itu ``None`` (pakai placeholder). ``callback(pixmap_or_None)``
+        dipanggil di GUI thread begitu asset siap (langsung kalau sudah ada).
+        """
+        if key in self.cache:
+            pixmap = self.cache[key]
+            if callback is not None:
+                callback(pixmap)
+            return pixmap
+
+        pending = key in self.callbacks
+        waiting = self.callbacks.setdefault(key, [])
+        if callback is not None:
+            waiting.append(callback)
+        if not pending:
+            self.pool.start(_ImageJob(self, key, Path(path) if path else None,
+                                      generator, size, aspect))
+        return None
+
+    def pixmap(self, key: str):
+        return self.cache.get(key)
+
+    def is_pending(self, key: str = None) -> bool:
+        return bool(self.callbacks) if key is None else key in self.callbacks
+
+    def _deliver(self, key, image, start, end):
+        # GUI thread: QPixmap baru boleh dibuat di sini
+        pixmap = None if image.isNull() else QPixmap.fromImage(image)
+        self.cache[key] = pixmap
+        self.timings[key] = end - start
+        self.spans[key] = (start, end)
+        for callback in self.callbacks.pop(key, []):
+            callback(pixmap)
+        self.ready.emit(key)
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """Blok sampai semua worker selesai dan hasilnya terkirim (test/profiling)."""
+        done = self.pool.waitForDone(timeout_ms)
+        QCoreApplication.sendPostedEvents(self, 0)
+        return done and not self.callbacks
+
+
+# --- Singleton ---
+_asset_loader = None
+
+
+def get_asset_loader() -> AssetLoader:
+    global _asset_loader
+    if _asset_loader is None:
+        _asset_loader = AssetLoader()
+    return _asset_loader
@@ -3,9 +3,384 @@ bubble_fx.py - Sound Effects Manager untuk Macan Bubble Shooter
 Modul terpisah untuk mengelola semua sound effect dan background music
 """
 
+import math
+import sys
+import time
+import wave
+from array import array
 from pathlib import Path
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PySide6.QtCore import QUrl
+from PySide6.QtCore import QUrl, QTimer
+
+# QtMultimedia opsional: tanpa itu SfxMixer + NullSink tetap jalan (headless)
+try:
+    from PySide6.QtMultimedia import (QMediaPlayer, QAudioOutput, QSoundEffect,
+                                      QAudioSink, QAudioFormat, QMediaDevices)
+    QT_AUDIO_AVAILABLE = True
+except ImportError:
+    QT_AUDIO_AVAILABLE = False
+
+# NumPy opsional: tanpa NumPy, mixer jalan di loop Python atas array('h')
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Jumlah voice per effect (berapa instance effect yang sama bisa bunyi bersamaan)
+SFX_VOICES = 3
+
+# Jarak minimum (detik) antar pemutaran effect yang sama; request lebih rapat di-drop
+SFX_MIN_INTERVAL = {
+    'shoot': 0.05,
+    'burst': 0.03,
+    'clear': 0.05,
+    'combo': 0.08,
+}
+
+
+class SfxBank:
+    """
+    Bank sound effect low-latency berbasis QSoundEffect.
+
+    Setiap WAV di-load & di-decode sekali ke memori (QSoundEffect menyimpan
+    PCM-nya), tidak seperti QMediaPlayer.setSource yang membuka ulang file
+    tiap kali bunyi. Tiap effect punya beberapa voice; kalau semua sedang
+    bunyi, voice yang paling lama mulai dicuri. Request effect yang sama
+    yang lebih rapat dari ``min_interval`` di-drop (rate limit).
+    """
+
+    def __init__(self, files, voices=SFX_VOICES, min_interval=None, volume=0.6,
+                 clock=time.monotonic):
+        """
+        Args:
+            files: Dict nama effect -> Path file WAV
+            voices: Jumlah voice per effect
+            min_interval: Dict nama effect -> detik (default: SFX_MIN_INTERVAL)
+            volume: Volume awal 0.0 - 1.0
+            clock: Sumber waktu (detik) untuk rate limit
+        """
+        self.min_interval = dict(SFX_MIN_INTERVAL if min_interval is None else min_interval)
+        self.clock = clock
+        self.voices = {}        # nama -> [QSoundEffect, ...]
+        self.started = {}       # nama -> [waktu mulai per voice]
+        self.last_played = {}   # nama -> waktu play terakhir
+        self.stats = {'played': 0, 'stolen': 0, 'limited': 0}
+
+        for name, path in files.items():
+            url = QUrl.fromLocalFile(str(path))
+            effects = []
+            for _ in range(max(1, voices)):
+                effect = QSoundEffect()
+                effect.setSource(url)
+                effect.setVolume(volume)
+                effects.append(effect)
+            self.voices[name] = effects
+            self.started[name] = [float('-inf')] * len(effects)
+
+    def play(self, name):
+        """Bunyikan effect. Return False kalau effect tidak ada atau kena rate limit."""
+        effects = self.voices.get(name)
+        if not effects:
+            return False
+
+        now = self.clock()
+        if now - self.last_played.get(name, float('-inf')) < self.min_interval.get(name, 0.0):
+            self.stats['limited'] += 1
+            return False
+        self.last_played[name] = now
+
+        started = self.started[name]
+        for i, effect in enumerate(effects):
+            if not effect.isPlaying():
+                break
+        else:
+            # Semua voice sibuk: curi yang paling lama bunyi
+            i = started.index(min(started))
+            effects[i].stop()
+            self.stats['stolen'] += 1
+
+        started[i] = now
+        effects[i].play()
+        self.stats['played'] += 1
+        return True
+
+    def set_volume(self, volume):
+        for effects in self.voices.values():
+            for effect in effects:
+                effect.setVolume(volume)
+
+    def stop_all(self):
+        for effects in self.voices.values():
+            for effect in effects:
+                effect.stop()
+
+
+# ============================================================
+# MIXER - semua SFX dicampur ke satu stream PCM
+# ============================================================
+
+# Format stream: 16-bit signed, stereo (sama dengan file WAV di bubble_sound/)
+MIXER_RATE = 44100
+MIXER_CHANNELS = 2
+
+# Voice aktif maksimum di mixer (setelah coalescing)
+MIXER_VOICES = 6
+
+# Prioritas effect: kalau voice penuh, effect prioritas lebih tinggi mencuri
+# voice prioritas terendah. combo/clear tidak boleh tertutup burst.
+SFX_PRIORITY = {
+    'combo': 3,
+    'clear': 2,
+    'shoot': 1,
+    'burst': 0,
+}
+
+# Gain maksimum saat N request identik digabung jadi satu voice (gain = sqrt(N))
+COALESCE_MAX_GAIN = 2.0
+
+# Ukuran buffer QAudioSink (~46 ms) dan interval pengisian
+MIXER_BUFFER_FRAMES = 2048
+MIXER_PUMP_MS = 10
+
+
+class _MixerVoice:
+    __slots__ = ('name', 'clip', 'pos', 'gain', 'priority', 'serial')
+
+    def __init__(self, name, clip, gain, priority, serial):
+        self.name = name
+        self.clip = clip
+        self.pos = 0            # posisi dalam frame
+        self.gain = gain
+        self.priority = priority
+        self.serial = serial    # urutan mulai (untuk mencuri yang paling tua)
+
+
+class SfxMixer:
+    """
+    Software mixer untuk sound effect.
+
+    ``request()`` hanya mencatat effect yang diminta. Pada ``render()``
+    berikutnya semua request identik sejak render sebelumnya digabung jadi
+    satu voice dengan gain ``sqrt(N)`` (maks ``COALESCE_MAX_GAIN``), lalu
+    dimulai urut prioritas. Kalau ``max_voices`` penuh, voice dengan
+    prioritas terendah (paling tua bila sama) dicuri, asal prioritasnya
+    tidak lebih tinggi dari effect baru; kalau tidak, request di-drop.
+
+    Hasil ``render()`` berupa bytes PCM int16 interleaved siap ditulis ke
+    sink. Tidak butuh Qt sama sekali, jadi bisa dites & di-benchmark headless
+    bersama ``NullSink``. Pakai NumPy kalau ada, selain itu loop ``array``.
+    """
+
+    def __init__(self, rate=MIXER_RATE, max_voices=MIXER_VOICES, priority=None,
+                 volume=0.6, use_numpy=None):
+        """
+        Args:
+            rate: Sample rate stream (Hz)
+            max_voices: Voice aktif maksimum
+            priority: Dict nama effect -> prioritas (default: SFX_PRIORITY)
+            volume: Master volume SFX 0.0 - 1.0
+            use_numpy: None = pakai NumPy kalau tersedia
+        """
+        self.rate = rate
+        self.max_voices = max_voices
+        self.priority = dict(SFX_PRIORITY if priority is None else priority)
+        self.volume = volume
+        self.use_numpy = NUMPY_AVAILABLE if use_numpy is None else (use_numpy and NUMPY_AVAILABLE)
+
+        self.clips = {}         # nama -> PCM stereo (ndarray (n, 2) atau array('h') interleaved)
+        self.pending = {}       # nama -> jumlah request sejak render terakhir
+        self.voices = []
+        self._serial = 0
+        self.stats = {'requested': 0, 'played': 0, 'coalesced': 0, 'stolen': 0, 'dropped': 0}
+
+    # --- Clip ---
+
+    def load(self, name, path):
+        """Decode WAV ke memori. Return False kalau format tidak didukung."""
+        try:
+            with wave.open(str(path), 'rb') as wav:
+                channels = wav.getnchannels()
+                width = wav.getsampwidth()
+                rate = wav.getframerate()
+                raw = wav.readframes(wav.getnframes())
+        except (OSError, EOFError, wave.Error) as e:
+            print(f"Warning: Gagal load audio {path}: {e}")
+            return False
+
+        if width != 2 or rate != self.rate or channels not in (1, 2):
+            print(f"Warning: Format audio {Path(path).name} tidak didukung mixer "
+                  f"({channels} ch, {width * 8}-bit, {rate} Hz)")
+            return False
+        self.add_clip(name, raw, channels)
+        return True
+
+    def add_clip(self, name, raw, channels=MIXER_CHANNELS):
+        """Daftarkan PCM int16 little-endian (mono otomatis jadi stereo)."""
+        if self.use_numpy:
+            clip = np.frombuffer(raw, dtype='<i2').reshape(-1, channels)
+            if channels == 1:
+                clip = np.repeat(clip, 2, axis=1)
+            self.clips[name] = np.ascontiguousarray(clip)
+        else:
+            samples = array('h', raw)
+            if sys.byteorder == 'big':
+                samples.byteswap()
+            if channels == 1:
+                stereo = array('h', [0]) * (2 * len(samples))
+                stereo[0::2] = samples
+                stereo[1::2] = samples
+                samples = stereo
+            self.clips[name] = samples
+
+    def _frames(self, clip):
+        return len(clip) if self.use_numpy else len(clip) // MIXER_CHANNELS
+
+    # --- Request & voice ---
+
+    def request(self, name):
+        """Minta effect diputar; digabung dengan request identik sampai render berikutnya."""
+        if name not in self.clips:
+            return False
+        self.stats['requested'] += 1
+        self.pending[name] = self.pending.get(name, 0) + 1
+        return True
+
+    def _start_pending(self):
+        pending, self.pending = self.pending, {}
+        # Prioritas tertinggi dulu supaya combo/clear dapat voice sebelum burst
+        for name in sorted(pending, key=lambda n: -self.priority.get(n, 0)):
+            count = pending[name]
+            self.stats['coalesced'] += count - 1
+            self._start_voice(name, min(COALESCE_MAX_GAIN, math.sqrt(count)))
+
+    def _start_voice(self, name, gain):
+        priority = self.priority.get(name, 0)
+        if len(self.voices) >= self.max_voices:
+            victim = min(self.voices, key=lambda v: (v.priority, v.serial))
+            if victim.priority > priority:
+                self.stats['dropped'] += 1
+                return
+            self.voices.remove(victim)
+            self.stats['stolen'] += 1
+        self._serial += 1
+        self.voices.append(_MixerVoice(name, self.clips[name], gain, priority, self._serial))
+        self.stats['played'] += 1
+
+    def stop_all(self):
+        self.voices.clear()
+        self.pending.clear()
+
+    # --- Render ---
+
+    def render(self, frames):
+        """Mulai request yang tertunda lalu campur ``frames`` frame jadi bytes PCM."""
+        if self.pending:
+            self._start_pending()
+        if not self.voices or frames <= 0:
+            return bytes(max(0, frames) * MIXER_CHANNELS * 2)
+        if self.use_numpy:
+            return self._render_numpy(frames)
+        return self._render_python(frames)
+
+    def _render_numpy(self, frames):
+        # float64 seperti loop Python, supaya hasil kedua jalur identik per byte
+        acc = np.zeros((frames, MIXER_CHANNELS), dtype=np.float64)
+        alive = []
+        for v in self.voices:
+            k = min(frames, len(v.clip) - v.pos)
+            acc[:k] += v.clip[v.pos:v.pos + k] * (v.gain * self.volume)
+            v.pos += k
+            if v.pos < len(v.clip):
+                alive.append(v)
+        self.voices = alive
+        np.clip(acc, -32768, 32767, out=acc)
+        return acc.astype('<i2').tobytes()
+
+    def _render_python(self, frames):
+        n = frames * MIXER_CHANNELS
+        acc = [0.0] * n
+        alive = []
+        for v in self.voices:
+            clip = v.clip
+            start = v.pos * MIXER_CHANNELS
+            end = min(start + n, len(clip))
+            g = v.gain * self.volume
+            for j, s in enumerate(clip[start:end]):
+                acc[j] += s * g
+            v.pos = end // MIXER_CHANNELS
+            if end < len(clip):
+                alive.append(v)
+        self.voices = alive
+        out = array('h', [-32768 if s < -32768 else 32767 if s > 32767 else int(s) for s in acc])
+        if sys.byteorder == 'big':
+            out.byteswap()
+        return out.tobytes()
+
+
+class NullSink:
+    """
+    Sink headless: tidak butuh device audio.
+
+    ``pump()`` me-render satu blok (default 1/60 detik) dan membuang
+    hasilnya; dipakai untuk test, benchmark dan CI.
+    """
+
+    def __init__(self, mixer, frames_per_pump=None):
+        self.mixer = mixer
+        self.frames_per_pump = frames_per_pump or mixer.rate // 60
+        self.frames_written = 0
+        self.last_block = b''
+
+    def pump(self, frames=None):
+        self.last_block = self.mixer.render(frames or self.frames_per_pump)
+        self.frames_written += len(self.last_block) // (MIXER_CHANNELS * 2)
+        return self.last_block
+
+    def set_volume(self, volume):
+        self.mixer.volume = volume
+
+    def stop(self):
+        self.mixer.stop_all()
+
+
+class QtAudioSink:
+    """
+    Output mixer ke device audio lewat satu QAudioSink (push mode).
+
+    QTimer mengisi buffer sink tiap ``MIXER_PUMP_MS`` sebanyak ``bytesFree()``,
+    jadi latency maksimum kira-kira ukuran buffer (``MIXER_BUFFER_FRAMES``).
+    """
+
+    def __init__(self, mixer, buffer_frames=MIXER_BUFFER_FRAMES, interval_ms=MIXER_PUMP_MS):
+        self.mixer = mixer
+        fmt = QAudioFormat()
+        fmt.setSampleRate(mixer.rate)
+        fmt.setChannelCount(MIXER_CHANNELS)
+        fmt.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+        self.sink = QAudioSink(QMediaDevices.defaultAudioOutput(), fmt)
+        self.sink.setBufferSize(buffer_frames * MIXER_CHANNELS * 2)
+        self.device = self.sink.start()
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.pump)
+        self.timer.start(interval_ms)
+
+    def pump(self):
+        if self.device is None:
+            return
+        frames = self.sink.bytesFree() // (MIXER_CHANNELS * 2)
+        if frames > 0:
+            self.device.write(self.mixer.render(frames))
+
+    def set_volume(self, volume):
+        self.mixer.volume = volume
+
+    def stop(self):
+        self.timer.stop()
+        self.sink.stop()
+        self.mixer.stop_all()
+
 
 class BubbleSoundManager:
     """
@@ -13,20 +388,29 @@ class BubbleSoundManager:
     
     Features:
     - Background music looping
-    - Multiple sound effect channels
+    - Sound effect dicampur software mixer ke satu output stream
     - Volume control
     - Easy play/stop methods
     """
     
-    def __init__(self, sound_folder="bubble_sound"):
+    def __init__(self, sound_folder="bubble_sound", sfx_voices=SFX_VOICES, sfx_mode="mixer"):
         """
         Initialize sound manager
         
         Args:
             sound_folder: Folder name yang berisi file audio (default: "bubble_sound")
+            sfx_voices: Jumlah voice per sound effect untuk mode "voices" (default: SFX_VOICES)
+            sfx_mode: "mixer" (SfxMixer -> QAudioSink), "null" (SfxMixer -> NullSink,
+                      tanpa device audio dan tanpa BGM) atau "voices" (SfxBank, satu
+                      QSoundEffect per voice). Tanpa QtMultimedia selalu jadi "null".
         """
         # Path ke folder sound (relatif terhadap file game)
         self.sound_path = Path(__file__).parent / sound_folder
+        self.bgm_player = None          # None: tanpa BGM (headless / tanpa QtMultimedia)
+        self.bgm_audio_output = None
+        self.sfx_mixer = None
+        self.sfx_sink = None
+        self.sfx_bank = None
         
         # Cek apakah folder exists
         if not self.sound_path.exists():
@@ -35,32 +419,41 @@ class BubbleSoundManager:
             self.sound_enabled = False
             return
         
+        if not QT_AUDIO_AVAILABLE and sfx_mode != "null":
+            # SfxMixer gak butuh Qt: tetap dicampur (pump_sfx tiap frame),
+            # hasilnya dibuang NullSink
+            print("Warning: QtMultimedia tidak tersedia. Audio dimatikan (null sink, tanpa BGM).")
+            sfx_mode = "null"
+        
         self.sound_enabled = True
+        self.sfx_mode = sfx_mode
         
         # === BGM Player (Background Music) ===
-        self.bgm_player = QMediaPlayer()
-        self.bgm_audio_output = QAudioOutput()
-        self.bgm_player.setAudioOutput(self.bgm_audio_output)
-        self.bgm_audio_output.setVolume(0.3)  # Volume BGM 30%
-        
-        # === SFX Players (Sound Effects) - Multiple channels ===
-        # Buat 5 player untuk SFX agar bisa play bersamaan
-        self.sfx_players = []
-        self.sfx_outputs = []
-        
-        for i in range(5):
-            player = QMediaPlayer()
-            output = QAudioOutput()
-            player.setAudioOutput(output)
-            output.setVolume(0.6)  # Volume SFX 60%
-            self.sfx_players.append(player)
-            self.sfx_outputs.append(output)
-        
-        self.current_sfx_index = 0  # Rotating index untuk sfx players
+        if sfx_mode != "null":
+            self.bgm_player = QMediaPlayer()
+            self.bgm_audio_output = QAudioOutput()
+            self.bgm_player.setAudioOutput(self.bgm_audio_output)
+            self.bgm_audio_output.setVolume(0.3)  # Volume BGM 30%
         
         # Load semua sound files
         self._load_sounds()
         
+        # === SFX (Sound Effects) ===
+        sfx_files = {name: path for name, path in self.sounds.items()
+                     if name != 'bgm' and path.exists()}
+        if sfx_mode == "voices":
+            # Preloaded QSoundEffect, beberapa voice per effect
+            self.sfx_bank = SfxBank(sfx_files, voices=sfx_voices, volume=0.6)  # Volume SFX 60%
+        else:
+            # Satu mixer, satu output stream; request per frame digabung
+            self.sfx_mixer = SfxMixer(volume=0.6)  # Volume SFX 60%
+            for name, path in sfx_files.items():
+                self.sfx_mixer.load(name, path)
+            if sfx_mode == "null":
+                self.sfx_sink = NullSink(self.sfx_mixer)
+            else:
+                self.sfx_sink = QtAudioSink(self.sfx_mixer)
+        
     def _load_sounds(self):
         """Load semua file sound ke dictionary untuk akses cepat"""
         self.sounds = {
@@ -87,7 +480,7 @@ class BubbleSoundManager:
         Args:
             loop: True untuk looping BGM (default: True)
         """
-        if not self.sound_enabled:
+        if self.bgm_player is None:
             return
             
         bgm_file = self.sounds.get('bgm')
@@ -107,19 +500,24 @@ class BubbleSoundManager:
             self.bgm_player.setPosition(0)
             self.bgm_player.play()
     
+    def is_bgm_playing(self):
+        """True kalau BGM sedang diputar (selalu False tanpa BGM player)"""
+        return (self.bgm_player is not None
+                and self.bgm_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState)
+    
     def stop_bgm(self):
         """Stop background music"""
-        if self.sound_enabled:
+        if self.bgm_player is not None:
             self.bgm_player.stop()
     
     def pause_bgm(self):
         """Pause background music"""
-        if self.sound_enabled:
+        if self.bgm_player is not None:
             self.bgm_player.pause()
     
     def resume_bgm(self):
         """Resume background music setelah pause"""
-        if self.sound_enabled:
+        if self.bgm_player is not None:
             self.bgm_player.play()
     
     def play_sfx(self, effect_name):
@@ -132,17 +530,20 @@ class BubbleSoundManager:
         if not self.sound_enabled:
             return
         
-        sfx_file = self.sounds.get(effect_name)
-        if not sfx_file or not sfx_file.exists():
-            return
-        
-        # Gunakan rotating player agar bisa play multiple sounds bersamaan
-        player = self.sfx_players[self.current_sfx_index]
-        player.setSource(QUrl.fromLocalFile(str(sfx_file)))
-        player.play()
-        
-        # Rotate ke player berikutnya
-        self.current_sfx_index = (self.current_sfx_index + 1) % len(self.sfx_players)
+        # Buffer sudah di-decode saat init; coalescing/prioritas di SfxMixer,
+        # voice stealing & rate limit di SfxBank
+        if self.sfx_mixer is not None:
+            self.sfx_mixer.request(effect_name)
+        else:
+            self.sfx_bank.play(effect_name)
+    
+    def pump_sfx(self):
+        """
+        Campur satu frame SFX kalau output-nya NullSink. Dipanggil sekali per
+        frame game loop; QtAudioSink diisi QTimer-nya sendiri, jadi no-op.
+        """
+        if isinstance(self.sfx_sink, NullSink):
+            self.sfx_sink.pump()
     
     def set_bgm_volume(self, volume):
         """
@@ -151,7 +552,7 @@ class BubbleSoundManager:
         Args:
             volume: Float 0.0 - 1.0
         """
-        if self.sound_enabled:
+        if self.bgm_audio_output is not None:
             self.bgm_audio_output.setVolume(max(0.0, min(1.0, volume)))
     
     def set_sfx_volume(self, volume):
@@ -162,8 +563,11 @@ class BubbleSoundManager:
             volume: Float 0.0 - 1.0
         """
         if self.sound_enabled:
-            for output in self.sfx_outputs:
-                output.setVolume(max(0.0, min(1.0, volume)))
+            volume = max(0.0, min(1.0, volume))
+            if self.sfx_sink is not None:
+                self.sfx_sink.set_volume(volume)
+            else:
+                self.sfx_bank.set_volume(volume)
     
     def set_master_volume(self, volume):
         """
@@ -190,11 +594,11 @@ class BubbleSoundManager:
 # Singleton instance untuk easy access
 _sound_manager = None
 
-def get_sound_manager():
-    """Get singleton instance of sound manager"""
+def get_sound_manager(sfx_mode="mixer"):
+    """Get singleton instance of sound manager (``sfx_mode`` hanya dipakai saat pertama dibuat)"""
     global _sound_manager
     if _sound_manager is None:
-        _sound_manager = BubbleSoundManager()
+        _sound_manager = BubbleSoundManager(sfx_mode=sfx_mode)
     return _sound_manager
 
 def play_shoot():
@@ -213,6 +617,10 @@ def play_combo():
     """Quick function: Play combo sound"""
     get_sound_manager().play_sfx('combo')
 
+def pump_sfx():
+    """Quick function: Mix one frame of SFX into the null sink (headless)"""
+    get_sound_manager().pump_sfx()
+
 def start_bgm():
     """Quick function: Start background music"""
     get_sound_manager().play_bgm()
@@ -4,14 +4,23 @@ Mengelola aset grafis dengan sistem Caching untuk performa maksimal.
 """
 
 from pathlib import Path
-from PySide6.QtGui import QPixmap, QPainter, QColor, QBrush, QPen, QRadialGradient, QLinearGradient, QPolygonF
-from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QPixmap, QImage, QPainter, QColor, QBrush, QPen, QRadialGradient, QLinearGradient, QPolygonF, QFont
+from PySide6.QtCore import Qt, QPointF, QRectF
 import sys
 import random
 import os
 
+from bubble_assets import get_asset_loader
+
 class BubbleGraphicsManager:
-    def __init__(self, gfx_folder="bubble_img"):
+    # cache_key -> nama file di folder cache
+    ASSET_FILES = {
+        **{f"bubble_{i}": f"bubble_{i}.png" for i in range(6)},
+        "launcher": "launcher.png",
+        "background": "background_nebula.png",
+    }
+
+    def __init__(self, gfx_folder="bubble_img", loader=None):
         # 1. Tentukan Path Cache (Sama dengan lokasi Save Data + folder 'cache')
         # Lokasi: C:/Users/[User]/AppData/Local/MacanBubbleShooter6/cache
         self.user_data_dir = Path.home() / "AppData" / "Local" / "MacanBubbleShooter6"
@@ -33,59 +42,80 @@ class BubbleGraphicsManager:
         ]
         
         # Load assets (Cek Cache dulu, baru Generate)
-        self._initialize_assets()
+        # Dengan loader (bubble_assets), load/generate jalan di worker thread
+        self.loader = loader
+        self._initialize_assets(loader)
 
-    def _initialize_assets(self):
+    def _initialize_assets(self, loader=None):
         """Orchestrator untuk memuat aset"""
         print(f"📂 Cache Directory: {self.cache_dir}")
         
-        # 1. Bubbles (0-5)
-        for i in range(6):
-            filename = f"bubble_{i}.png"
+        for cache_key in self.ASSET_FILES:
+            if loader is None:
+                self._load_or_create(cache_key)
+            else:
+                loader.load(f"gfx:{cache_key}",
+                            generator=lambda key=cache_key: self.load_image(key),
+                            callback=lambda pixmap, key=cache_key: self._store(key, pixmap))
+        
+        if loader is None:
+            print("✅ All graphics assets ready!")
+
+    def _generator(self, cache_key):
+        if cache_key.startswith("bubble_"):
             # Kita generate ukuran cukup besar (100px) agar tajam saat di-scale
-            self._load_or_create(f"bubble_{i}", filename, lambda: self._generate_bubble_graphic(i, 100))
+            return lambda: self._generate_bubble_graphic(int(cache_key[7:]), 100)
+        if cache_key == "launcher":
+            return lambda: self._generate_launcher_graphic(100, 160)
+        # Background (Ukuran Full HD)
+        return lambda: self._generate_background_graphic(1920, 1080)
 
-        # 2. Launcher
-        self._load_or_create("launcher", "launcher.png", lambda: self._generate_launcher_graphic(100, 160))
+    def _store(self, cache_key, pixmap):
+        if pixmap is not None and cache_key not in self.cache:
+            self.cache[cache_key] = pixmap
 
-        # 3. Background (Ukuran Full HD)
-        self._load_or_create("background", "background_nebula.png", lambda: self._generate_background_graphic(1920, 1080))
-        
-        print("✅ All graphics assets ready!")
+    def _load_or_create(self, cache_key):
+        """Load sinkron di GUI thread (tanpa loader / asset belum selesai di worker)"""
+        image = self.load_image(cache_key)
+        if not image.isNull():
+            self.cache[cache_key] = QPixmap.fromImage(image)
 
-    def _load_or_create(self, cache_key, filename, generator_func):
+    def load_image(self, cache_key):
         """
         Logika Cerdas: Cek file -> Load jika ada -> Generate & Save jika tidak ada
+
+        Hanya memakai QImage, jadi aman dipanggil dari worker thread.
         """
+        filename = self.ASSET_FILES[cache_key]
         file_path = self.cache_dir / filename
         
         # A. Coba Load dari Disk
         if file_path.exists():
             try:
-                pixmap = QPixmap(str(file_path))
-                if not pixmap.isNull():
-                    self.cache[cache_key] = pixmap
+                image = QImage(str(file_path))
+                if not image.isNull():
                     # print(f"  ⚡ Loaded cached: {filename}")
-                    return
+                    return image
             except Exception as e:
                 print(f"  ⚠️ Corrupt cache {filename}, regenerating... ({e})")
 
         # B. Generate Baru (Jika file tidak ada atau rusak)
         print(f"  🎨 Generating new asset: {filename}...")
-        pixmap = generator_func()
-        self.cache[cache_key] = pixmap
+        image = self._generator(cache_key)()
         
         # C. Simpan ke Disk untuk pemakaian berikutnya
         try:
-            pixmap.save(str(file_path), "PNG")
+            image.save(str(file_path), "PNG")
             print(f"  💾 Saved to cache: {filename}")
         except Exception as e:
             print(f"  ❌ Failed to save cache: {e}")
+        return image
 
     # --- GENERATORS (Logika Menggambar Asli) ---
+    # Menggambar ke QImage (bukan QPixmap) supaya bisa jalan di worker thread
 
     def _generate_bubble_graphic(self, color_index, size):
-        pixmap = QPixmap(size, size)
+        pixmap = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
         pixmap.fill(Qt.transparent)
         
         painter = QPainter(pixmap)
@@ -134,7 +164,7 @@ class BubbleGraphicsManager:
         return pixmap
 
     def _generate_launcher_graphic(self, w, h):
-        pixmap = QPixmap(w, h)
+        pixmap = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
         pixmap.fill(Qt.transparent)
         painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.Antialiasing)
@@ -189,8 +219,10 @@ class BubbleGraphicsManager:
         return pixmap
 
     def _generate_background_graphic(self, w, h):
-        pixmap = QPixmap(w, h)
+        pixmap = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
         painter = QPainter(pixmap)
+        # RNG sendiri: generator bisa jalan di worker, jangan ganggu stream global
+        rng = random.Random()
         
         # Base Gradient
         grad = QLinearGradient(0, 0, w, h)
@@ -203,8 +235,8 @@ class BubbleGraphicsManager:
         # Nebula Clouds
         painter.setCompositionMode(QPainter.CompositionMode_Plus)
         for _ in range(8):
-            x, y = random.randint(-w//4, w), random.randint(-h//4, h)
-            r = random.randint(200, 600)
+            x, y = rng.randint(-w//4, w), rng.randint(-h//4, h)
+            r = rng.randint(200, 600)
             nebula = QRadialGradient(x, y, r)
             nebula.setColorAt(0, QColor(100, 50, 150, 40))
             nebula.setColorAt(0.5, QColor(80, 40, 120, 20))
@@ -214,8 +246,8 @@ class BubbleGraphicsManager:
             painter.drawEllipse(x-r, y-r, r*2, r*2)
         
         for _ in range(6):
-            x, y = random.randint(-w//4, w), random.randint(-h//4, h)
-            r = random.randint(250, 700)
+            x, y = rng.randint(-w//4, w), rng.randint(-h//4, h)
+            r = rng.randint(250, 700)
             nebula = QRadialGradient(x, y, r)
             nebula.setColorAt(0, QColor(50, 100, 200, 35))
             nebula.setColorAt(0.5, QColor(30, 70, 150, 18))
@@ -229,20 +261,20 @@ class BubbleGraphicsManager:
         painter.setPen(Qt.NoPen)
         # Distant
         for _ in range(300):
-            painter.setBrush(QColor(200, 200, 255, random.randint(100, 180)))
-            s = random.uniform(0.5, 1.5)
-            painter.drawEllipse(int(random.randint(0, w)), int(random.randint(0, h)), int(s), int(s))
+            painter.setBrush(QColor(200, 200, 255, rng.randint(100, 180)))
+            s = rng.uniform(0.5, 1.5)
+            painter.drawEllipse(int(rng.randint(0, w)), int(rng.randint(0, h)), int(s), int(s))
         
         # Mid
         for _ in range(150):
-            painter.setBrush(QColor(255, 255, 255, random.randint(150, 220)))
-            s = random.uniform(1.5, 3)
-            painter.drawEllipse(int(random.randint(0, w)), int(random.randint(0, h)), int(s), int(s))
+            painter.setBrush(QColor(255, 255, 255, rng.randint(150, 220)))
+            s = rng.uniform(1.5, 3)
+            painter.drawEllipse(int(rng.randint(0, w)), int(rng.randint(0, h)), int(s), int(s))
         
         # Bright Stars
         for _ in range(80):
-            x, y = random.randint(0, w), random.randint(0, h)
-            s = random.uniform(2, 4)
+            x, y = rng.randint(0, w), rng.randint(0, h)
+            s = rng.uniform(2, 4)
             glow = QRadialGradient(x, y, s*3)
             glow.setColorAt(0, QColor(255, 255, 255, 200))
             glow.setColorAt(0.3, QColor(255, 255, 255, 100))
@@ -260,9 +292,18 @@ class BubbleGraphicsManager:
     def has_graphics(self):
         return len(self.cache) > 0
     
+    def _pixmap(self, cache_key):
+        if cache_key not in self.cache:
+            # Masih dikerjakan worker: tunggu hasilnya, jangan generate dua kali
+            if self.loader is not None and self.loader.is_pending(f"gfx:{cache_key}"):
+                self.loader.wait()
+            if cache_key not in self.cache:
+                self._load_or_create(cache_key)
+        return self.cache.get(cache_key)
+    
     def get_bubble_pixmap(self, color_index, size=None):
         key = f"bubble_{color_index}"
-        pixmap = self.cache.get(key)
+        pixmap = self._pixmap(key)
         if pixmap and size:
             if isinstance(size, tuple):
                 return pixmap.scaled(size[0], size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
@@ -271,7 +312,7 @@ class BubbleGraphicsManager:
         return pixmap
 
     def get_launcher_pixmap(self, size=None):
-        pixmap = self.cache.get("launcher")
+        pixmap = self._pixmap("launcher")
         if pixmap and size:
             if isinstance(size, tuple):
                 return pixmap.scaled(size[0], size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
@@ -280,7 +321,7 @@ class BubbleGraphicsManager:
         return pixmap
 
     def get_background_pixmap(self, size=None):
-        pixmap = self.cache.get("background")
+        pixmap = self._pixmap("background")
         if pixmap and size:
             if isinstance(size, tuple):
                 return pixmap.scaled(size[0], size[1], Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
@@ -289,13 +330,93 @@ class BubbleGraphicsManager:
         return pixmap
 
 
+# --- Sprite Atlas (bubble grid) ---
+
+class BubbleSpriteAtlas:
+    """
+    Sprite bubble in-game (gradient + outline + simbol color-blind/rainbow),
+    digambar sekali per (color_index, radius, colorblind) lalu dipakai ulang
+    oleh semua ``Bubble``. Tampilan identik dengan gradient per-item lama;
+    dirender 2x supaya tetap tajam saat view di-scale fullscreen.
+    """
+
+    PAD = 3        # ruang untuk outline (pen rainbow 3px)
+    SCALE = 2.0    # device pixel ratio sprite
+
+    def __init__(self, palette):
+        self.palette = palette
+        self.sprites = {}
+
+    def sprite(self, color_index, radius, colorblind=False):
+        key = (color_index, radius, colorblind and color_index != -1)
+        pixmap = self.sprites.get(key)
+        if pixmap is None:
+            pixmap = self.sprites[key] = self._render(*key)
+        return pixmap
+
+    def offset(self, radius):
+        """Offset item supaya pusat sprite ada di pos() bubble."""
+        return -(radius + self.PAD)
+
+    def _render(self, color_index, radius, colorblind):
+        half = radius + self.PAD
+        side = int(2 * half * self.SCALE + 0.999)
+        pixmap = QPixmap(side, side)
+        pixmap.setDevicePixelRatio(self.SCALE)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.translate(half, half)   # (0, 0) = pusat bubble, sama seperti koordinat item
+
+        gradient = QRadialGradient(-radius * 0.3, -radius * 0.3, radius * 1.5)
+        label = None
+        if color_index == -1:
+            # Rainbow bubble
+            for stop, color in ((0, QColor(255, 255, 255)), (0.2, QColor(255, 0, 0)),
+                                (0.4, QColor(255, 255, 0)), (0.6, QColor(0, 255, 0)),
+                                (0.8, QColor(0, 0, 255)), (1, QColor(255, 0, 255))):
+                gradient.setColorAt(stop, color)
+            pen = QPen(QColor(255, 255, 255), 3)
+            label = ("🌈", QFont("Segoe UI Emoji", int(radius * 0.8), QFont.Bold))
+        elif colorblind:
+            # Warna high-contrast + simbol
+            from bubble_special import get_cb_color, get_cb_symbol
+            cb_col = get_cb_color(color_index)
+            gradient.setColorAt(0, cb_col.lighter(140))
+            gradient.setColorAt(0.3, cb_col)
+            gradient.setColorAt(1, cb_col.darker(140))
+            pen = QPen(cb_col.darker(140).darker(150), 1.5)
+            label = (get_cb_symbol(color_index), QFont("Segoe UI", int(radius * 0.55), QFont.Bold))
+        else:
+            c = self.palette[color_index]
+            gradient.setColorAt(0, c["light"])
+            gradient.setColorAt(0.3, c["base"])
+            gradient.setColorAt(1, c["dark"])
+            pen = QPen(c["dark"].darker(150), 1.5)
+
+        painter.setBrush(QBrush(gradient))
+        painter.setPen(pen)
+        painter.drawEllipse(QRectF(-radius, -radius, radius * 2, radius * 2))
+
+        if label:
+            text, font = label
+            painter.setFont(font)
+            painter.setPen(QColor(255, 255, 255))
+            painter.drawText(QRectF(-half, -half, half * 2, half * 2), Qt.AlignCenter, text)
+
+        painter.end()
+        return pixmap
+
+
 # --- Singleton & Helpers ---
 _gfx_manager = None
 
 def get_graphics_manager():
     global _gfx_manager
     if _gfx_manager is None:
-        _gfx_manager = BubbleGraphicsManager()
+        _gfx_manager = BubbleGraphicsManager(loader=get_asset_loader())
     return _gfx_manager
 
 def get_bubble_pixmap(color_index, diameter):
@@ -0,0 +1,465 @@
+"""
+bubble_grid.py — Pure-Python grid engine for Macan Bubble Shooter
+
+Portable counterpart of the compiled ``bubble_engine`` wheel, which is only
+shipped as a Windows ``.pyd``. Exposes the same API:
+
+    find_matching(grid, row, col)        -> [(row, col), ...]
+    find_connected_cluster(grid, row, col) -> [(row, col), ...]
+    find_floating_bubbles(grid)          -> [(row, col), ...]
+
+Internally the 2-D list grid is packed into a flat ``array('b')`` with an
+EMPTY sentinel, hex-neighbour lookups come from tables precomputed once per
+grid shape, and every flood fill is iterative (no recursion-depth limit).
+
+``BubbleGrid`` keeps the game's grid in that flat form permanently, so the
+flood fills run on its storage directly without repacking a 2-D list. It
+also tracks which cells changed since the last floating check, so
+``pop_floating`` only explores the components around those cells instead
+of flood-filling the whole board from row 0.
+
+No PySide6 dependency — safe to import from headless tools.
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+from array import array
+from functools import lru_cache
+
+
+# ── Cell encoding ─────────────────────────────────────────────────────────────
+
+EMPTY   = -128   # Flat-grid sentinel for an empty cell (None in the 2-D grid)
+RAINBOW = -1     # Wildcard color: matches every neighbour color
+
+# Neighbour offsets per row parity — odd rows are indented by one radius
+_EVEN_ROW_DIRS = ((-1, -1), (-1, 0), (0, -1), (0, 1), (1, -1), (1, 0))
+_ODD_ROW_DIRS  = ((-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0), (1, 1))
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(rows: int, cols: int) -> tuple:
+    """
+    Flat-index neighbour table for a rows x cols hex grid.
+    Entry ``i`` is a tuple of in-bounds neighbour indices of cell ``i``,
+    in the same direction order as ``BubbleGrid.get_neighbors``.
+    """
+    table = []
+    for r in range(rows):
+        dirs = _ODD_ROW_DIRS if r % 2 == 1 else _EVEN_ROW_DIRS
+        for c in range(cols):
+            table.append(tuple(
+                (r + dr) * cols + (c + dc)
+                for dr, dc in dirs
+                if 0 <= r + dr < rows and 0 <= c + dc < cols
+            ))
+    return tuple(table)
+
+
+def pack_grid(grid: list) -> tuple:
+    """Pack a 2-D list grid into ``(cells, rows, cols)``; None becomes EMPTY."""
+    rows = len(grid)
+    cols = max((len(row) for row in grid), default=0)
+    cells = array('b', [EMPTY]) * (rows * cols)
+    for r, row in enumerate(grid):
+        base = r * cols
+        for c, value in enumerate(row):
+            if value is not None:
+                cells[base + c] = value
+    return cells, rows, cols
+
+
+# ── Flat-grid flood fills ─────────────────────────────────────────────────────
+
+def match_indices(cells, rows: int, cols: int, start: int) -> list:
+    """
+    Same-color group reachable from ``start`` (flat indices).
+
+    Rainbow cells match anything and pass their neighbour's color down the
+    branch. The explicit stack visits cells in exactly the order the old
+    recursive ``GameScene.find_matching`` did, so rainbow branches resolve
+    identically.
+    """
+    color = cells[start]
+    if color == EMPTY:
+        return []
+    table = neighbor_table(rows, cols)
+    seen = bytearray(rows * cols)
+    seen[start] = 1
+    found = [start]
+    # Frames: [cell, search color, next neighbour position]
+    stack = [[start, color, 0]]
+    while stack:
+        frame = stack[-1]
+        nbrs = table[frame[0]]
+        k = frame[2]
+        if k >= len(nbrs):
+            stack.pop()
+            continue
+        frame[2] = k + 1
+        j = nbrs[k]
+        if seen[j]:
+            continue
+        cell = cells[j]
+        if cell == EMPTY:
+            continue
+        search = frame[1]
+        if cell == search or cell == RAINBOW or search == RAINBOW:
+            seen[j] = 1
+            found.append(j)
+            stack.append([j, search if search != RAINBOW else cell, 0])
+    return found
+
+
+def cluster_indices(cells, rows: int, cols: int, start: int) -> list:
+    """Every filled cell connected to ``start`` regardless of color."""
+    if cells[start] == EMPTY:
+        return []
+    table = neighbor_table(rows, cols)
+    seen = bytearray(rows * cols)
+    seen[start] = 1
+    found = [start]
+    stack = [start]
+    while stack:
+        for j in table[stack.pop()]:
+            if not seen[j] and cells[j] != EMPTY:
+                seen[j] = 1
+                found.append(j)
+                stack.append(j)
+    return found
+
+
+def floating_indices(cells, rows: int, cols: int) -> list:
+    """Filled cells with no filled path to any row-0 cell."""
+    table = neighbor_table(rows, cols)
+    seen = bytearray(rows * cols)
+    stack = [c for c in range(cols) if cells[c] != EMPTY]
+    for c in stack:
+        seen[c] = 1
+    while stack:
+        for j in table[stack.pop()]:
+            if not seen[j] and cells[j] != EMPTY:
+                seen[j] = 1
+                stack.append(j)
+    return [i for i in range(rows * cols) if cells[i] != EMPTY and not seen[i]]
+
+
+# ── bubble_engine-compatible API (2-D list in, list of (row, col) out) ────────
+
+def _to_cells(indices, cols: int) -> list:
+    return [divmod(i, cols) for i in indices]
+
+
+def find_matching(grid: list, row: int, col: int) -> list:
+    cells, rows, cols = pack_grid(grid)
+    return _to_cells(match_indices(cells, rows, cols, row * cols + col), cols)
+
+
+def find_connected_cluster(grid: list, row: int, col: int) -> list:
+    cells, rows, cols = pack_grid(grid)
+    return _to_cells(cluster_indices(cells, rows, cols, row * cols + col), cols)
+
+
+def find_floating_bubbles(grid: list) -> list:
+    cells, rows, cols = pack_grid(grid)
+    return _to_cells(floating_indices(cells, rows, cols), cols)
+
+
+def _probe_anchor(cells, table, cols: int, start: int, state: dict) -> tuple:
+    """
+    Best-first search from ``start`` toward row 0 over filled cells.
+
+    The frontier is a heap of flat indices, and a smaller index means a
+    higher row, so the search climbs straight to the ceiling when it can.
+    It stops as soon as it reaches row 0 or a cell already known to be
+    anchored in ``state``. Returns ``(visited, anchored)``. All visited
+    cells are in the same component, so they share the verdict.
+    """
+    visited = {start}
+    heap = [start]
+    while heap:
+        i = heapq.heappop(heap)
+        if i < cols or state.get(i):
+            return visited, True
+        for j in table[i]:
+            if j not in visited and cells[j] != EMPTY:
+                visited.add(j)
+                heapq.heappush(heap, j)
+    return visited, False
+
+
+def _outward(center: int, size: int, delta):
+    """
+    Yield ``(i, delta(i))`` for 0 <= i < size in order of growing
+    ``abs(delta(i))``, walking both ways from ``center``. ``center`` must be
+    the index with the smallest distance, and ``delta`` must be linear in i.
+    """
+    lo, hi = center - 1, center + 1
+    yield center, delta(center)
+    while lo >= 0 or hi < size:
+        if hi >= size or (lo >= 0 and abs(delta(lo)) <= abs(delta(hi))):
+            yield lo, delta(lo)
+            lo -= 1
+        else:
+            yield hi, delta(hi)
+            hi += 1
+
+
+# ── BubbleGrid: flat storage used by GameScene ──────────────────────────────
+
+class BubbleGrid:
+    """
+    Hex grid of bubble colors stored in a single ``array('b')``.
+
+    Cell values are the usual color indices plus the specials (-1 rainbow,
+    -2 obstacle, -3 boss reservation); empty cells hold EMPTY internally and
+    read back as None through ``get``. Neighbours come from ``neighbor_table``,
+    so lookups are index arithmetic with no per-call allocation.
+
+    ``grid`` is a 2-D list compatibility view (a fresh snapshot on read) for
+    ``save_game``; assigning a 2-D list to it reloads the whole grid, which is
+    how load/daily injection replace the board.
+
+    ``engine`` is an optional compiled module with the list API
+    (``bubble_engine``); when given, flood fills are delegated to it. The
+    2-D list it needs is built once per grid ``version`` and reused until
+    the next write.
+
+    Every ``set`` marks the cell dirty. ``pop_floating`` re-checks only the
+    components that touch dirty cells, so its cost follows the size of the
+    last change rather than the board. Loading a grid (``initialize_grid`` or
+    assigning ``grid``) and ``push_row`` (which flips every row's parity)
+    schedule one full scan instead. Writes straight into
+    ``cells`` bypass this tracking.
+    """
+
+    def __init__(self, rows: int, cols: int, radius: float,
+                 num_colors: int = 6, initial_rows: int = 5, engine=None,
+                 rng=None):
+        self.rows = rows
+        self.cols = cols
+        self.radius = radius
+        self.num_colors = num_colors
+        self.initial_rows = initial_rows
+        self.engine = engine
+        self.rng = rng or random       # Sumber warna initialize_grid (default: modul random)
+        self.grid_offset_x = 0  # Offset horizontal agar grid di tengah scene lebar
+        self.cells = array('b', [EMPTY]) * (rows * cols)
+        self.neighbors = neighbor_table(rows, cols)
+        self._dirty = set()            # Flat indices changed since last pop_floating()
+        self._last_floating = set()    # Reported floating but maybe not removed yet
+        self._full_rescan = True
+        self.version = 0               # Bumped on every write; lets callers detect a stale snapshot
+        self._engine_grid = None       # 2-D snapshot for ``engine``, valid for ``_engine_version``
+        self._engine_version = -1
+        self.initialize_grid()
+
+    def _mark_rescan(self):
+        self.version += 1
+        self._dirty.clear()
+        self._last_floating.clear()
+        self._full_rescan = True
+
+    def initialize_grid(self):
+        cells = self.cells
+        cols = self.cols
+        randint = self.rng.randint
+        for i in range(len(cells)):
+            cells[i] = EMPTY
+        for row in range(min(self.initial_rows, self.rows)):
+            is_indented = (row % 2 == 1)
+            for col in range(cols):
+                if is_indented and col == cols - 1:
+                    continue
+                cells[row * cols + col] = randint(0, self.num_colors - 1)
+        self._mark_rescan()
+
+    # -- 2-D compatibility view ------------------------------------------------
+
+    @property
+    def grid(self) -> list:
+        cols = self.cols
+        cells = self.cells
+        return [
+            [None if v == EMPTY else v for v in cells[r * cols:(r + 1) * cols]]
+            for r in range(self.rows)
+        ]
+
+    @grid.setter
+    def grid(self, grid: list):
+        cells = self.cells
+        cols = self.cols
+        for i in range(len(cells)):
+            cells[i] = EMPTY
+        for r, row in enumerate(grid[:self.rows]):
+            base = r * cols
+            for c, value in enumerate(row[:cols]):
+                if value is not None:
+                    cells[base + c] = value
+        self._mark_rescan()
+
+    # -- Cell access -------------------------------------------------------------
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def get(self, row: int, col: int):
+        v = self.cells[row * self.cols + col]
+        return None if v == EMPTY else v
+
+    def set(self, row: int, col: int, value):
+        i = row * self.cols + col
+        self.cells[i] = EMPTY if value is None else value
+        self._dirty.add(i)
+        self.version += 1
+
+    def iter_filled(self):
+        """Yield ``(row, col, value)`` for every filled cell, row-major."""
+        cols = self.cols
+        for i, v in enumerate(self.cells):
+            if v != EMPTY:
+                r, c = divmod(i, cols)
+                yield r, c, v
+
+    def row_has_bubbles(self, row: int) -> bool:
+        base = row * self.cols
+        return any(v != EMPTY for v in self.cells[base:base + self.cols])
+
+    def push_row(self, new_row: list):
+        """Shift every row down by one (bottom row is discarded) and put ``new_row`` on top."""
+        cols = self.cols
+        cells = self.cells
+        cells[cols:] = cells[:-cols]
+        for c in range(cols):
+            value = new_row[c] if c < len(new_row) else None
+            cells[c] = EMPTY if value is None else value
+        # Shifting a row flips its parity, so every neighbour relation changes
+        self._mark_rescan()
+
+    # -- Geometry ------------------------------------------------------------------
+
+    def get_position(self, row: int, col: int):
+        radius = self.radius
+        offset = radius if row % 2 == 1 else 0
+        x = col * radius * 2 + radius + offset + self.grid_offset_x
+        y = row * radius * 1.732 + radius
+        return x, y
+
+    def nearest_row_col(self, x: float, y: float) -> tuple:
+        """Grid cell whose centre is nearest to (x, y); may lie outside the grid."""
+        radius = self.radius
+        row = round((y - radius) / (radius * 1.732))
+        offset = radius if row % 2 == 1 else 0
+        col = round((x - self.grid_offset_x - radius - offset) / (radius * 2))
+        return row, col
+
+    def nearest_empty_cell(self, x: float, y: float):
+        """
+        Empty cell whose centre is closest to (x, y), or None when the grid is full.
+
+        Rows are visited outward from the nearest row in order of vertical
+        distance, and the columns of each row outward from the nearest
+        column. The search stops once the vertical (or horizontal) gap alone
+        exceeds the best distance found. Ties go to the earlier cell in
+        row-major order, the same answer a full scan with ``<`` gives.
+        """
+        cells = self.cells
+        cols = self.cols
+        radius = self.radius
+        row_h = radius * 1.732
+        r0 = min(max(round((y - radius) / row_h), 0), self.rows - 1)
+        best = None
+        best_key = None
+        for row, dy in _outward(r0, self.rows, lambda r: y - (r * radius * 1.732 + radius)):
+            if best_key is not None and dy * dy > best_key[0]:
+                break
+            offset = radius if row % 2 == 1 else 0
+            c0 = round((x - self.grid_offset_x - radius - offset) / (radius * 2))
+            c0 = min(max(c0, 0), cols - 1)
+            base = row * cols
+            for col, dx in _outward(c0, cols, lambda c: x - self.get_position(row, c)[0]):
+                dist = dx * dx + dy * dy
+                if best_key is not None and dist > best_key[0]:
+                    break
+                if cells[base + col] == EMPTY:
+                    key = (dist, row, col)
+                    if best_key is None or key < best_key:
+                        best_key = key
+                        best = (row, col)
+        return best
+
+    def get_neighbors(self, row: int, col: int) -> list:
+        """Filled neighbours of (row, col) as ``(row, col)`` tuples."""
+        cols = self.cols
+        cells = self.cells
+        return [divmod(j, cols) for j in self.neighbors[row * cols + col] if cells[j] != EMPTY]
+
+    # -- Flood fills -----------------------------------------------------------------
+
+    def _snapshot(self) -> list:
+        # Engine cuma terima 2-D list: dibangun ulang hanya kalau grid berubah,
+        # jadi match + cluster + floating di satu tembakan berbagi satu snapshot
+        if self._engine_version != self.version:
+            self._engine_grid = self.grid
+            self._engine_version = self.version
+        return self._engine_grid
+
+    def find_matching(self, row: int, col: int) -> list:
+        if self.engine is not None:
+            return self.engine.find_matching(self._snapshot(), row, col)
+        return _to_cells(match_indices(self.cells, self.rows, self.cols, row * self.cols + col), self.cols)
+
+    def find_connected_cluster(self, row: int, col: int) -> list:
+        if self.engine is not None:
+            return self.engine.find_connected_cluster(self._snapshot(), row, col)
+        return _to_cells(cluster_indices(self.cells, self.rows, self.cols, row * self.cols + col), self.cols)
+
+    def find_floating_bubbles(self) -> list:
+        if self.engine is not None:
+            return self.engine.find_floating_bubbles(self._snapshot())
+        return _to_cells(floating_indices(self.cells, self.rows, self.cols), self.cols)
+
+    def pop_floating(self) -> list:
+        """
+        Cells that are disconnected from the ceiling, as ``(row, col)`` in
+        row-major order, then reset the dirty set.
+
+        Only the filled cells around changes since the previous call are
+        probed (plus anything reported floating last time that is still on
+        the board), so the result equals ``find_floating_bubbles`` as long as
+        callers keep removing what this returns.
+        """
+        cells = self.cells
+        cols = self.cols
+        if self._full_rescan:
+            self._full_rescan = False
+            self._dirty.clear()
+            floating = floating_indices(cells, self.rows, cols)
+            self._last_floating = set(floating)
+            return _to_cells(floating, cols)
+
+        table = self.neighbors
+        seeds = set()
+        for i in self._dirty | self._last_floating:
+            if cells[i] != EMPTY:
+                seeds.add(i)
+            for j in table[i]:
+                if cells[j] != EMPTY:
+                    seeds.add(j)
+        self._dirty.clear()
+
+        state = {}   # flat index -> True (anchored) / False (floating)
+        floating = []
+        for i in seeds:
+            if i in state:
+                continue
+            visited, anchored = _probe_anchor(cells, table, cols, i, state)
+            for j in visited:
+                state[j] = anchored
+            if not anchored:
+                floating.extend(visited)
+        floating.sort()
+        self._last_floating = set(floating)
+        return _to_cells(floating, cols)
@@ -0,0 +1,245 @@
+"""
+bubble_particles.py — Pooled particle engine for Macan Bubble Shooter
+
+All explosion and meteor-trail particles live in one ``ParticleSystem``, a
+single ``QGraphicsItem`` added to the scene once. Particle state sits in
+preallocated parallel arrays (position, velocity, size, scale, life, color).
+``step()`` advances them once per frame and ``paint()`` draws every live
+particle in a single call, so a 30-bubble clear no longer adds and removes
+240 scene items.
+
+Live particles are kept packed at the front of the arrays in spawn order
+(index 0 is the oldest). ``step()`` decrements life, compacts dead
+particles away and integrates the survivors in one pass over whole arrays.
+It uses NumPy when it is importable, otherwise a loop over ``array``
+storage. The pool has a fixed capacity; when it is full, new particles
+push out the oldest ones.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from array import array
+
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QBrush, QColor
+from PySide6.QtWidgets import QGraphicsItem
+
+# NumPy opsional: tanpa NumPy, step() jalan di loop Python atas array('d').
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# Kapasitas default: ~2 ledakan besar (30 bubble x 8 partikel) + trail
+PARTICLE_CAPACITY = 512
+
+# Fisika per frame (sama dengan Particle lama)
+DRAG = 0.95       # vx, vy *= DRAG
+GRAVITY = 0.3     # vy += GRAVITY
+SHRINK = 0.95     # scale *= SHRINK
+
+# Nama array paralel + tipe (kode array / dtype NumPy)
+_FIELDS = (
+    ("x", 'd'), ("y", 'd'), ("vx", 'd'), ("vy", 'd'),
+    ("size", 'd'), ("scale", 'd'),
+    ("life", 'i'), ("max_life", 'i'),
+    ("color", 'I'),               # QColor.rgba()
+)
+_DTYPES = {'d': 'float64', 'i': 'int32', 'I': 'uint32'}
+
+
+class ParticleSystem(QGraphicsItem):
+    """
+    Fixed-capacity particle pool drawn by one item.
+
+    ``burst`` spawns particles flying in random directions (explosions),
+    ``spawn`` adds one particle with an explicit velocity (trail). The
+    scene calls ``step()`` once per frame. ``use_numpy=None`` picks NumPy
+    when it is available.
+    """
+
+    def __init__(self, bounds: QRectF, capacity: int = PARTICLE_CAPACITY, rng=None,
+                 use_numpy: bool = None):
+        super().__init__()
+        self.bounds = QRectF(bounds)
+        self.capacity = capacity
+        self.rng = rng or random
+        self.use_numpy = NUMPY_AVAILABLE if use_numpy is None else (use_numpy and NUMPY_AVAILABLE)
+
+        # Array paralel, dialokasikan sekali; partikel hidup di [0, count)
+        for name, code in _FIELDS:
+            if self.use_numpy:
+                setattr(self, name, np.zeros(capacity, dtype=_DTYPES[code]))
+            else:
+                setattr(self, name, array(code, [0]) * capacity)
+        self.count = 0
+
+        self._brushes = {}          # rgba -> QBrush
+        self._dirty = QRectF()      # area yang digambar frame sebelumnya
+
+        self.setAcceptedMouseButtons(Qt.NoButton)
+
+    def __len__(self):
+        return self.count
+
+    # --- Spawn ---
+
+    def _make_room(self, k: int):
+        """Pastikan ada ``k`` slot kosong; kalau penuh, geser keluar yang tertua."""
+        drop = self.count + k - self.capacity
+        if drop <= 0:
+            return
+        n = self.count
+        for name, _ in _FIELDS:
+            a = getattr(self, name)
+            a[:n - drop] = a[drop:n]
+        self.count = n - drop
+
+    def spawn(self, x: float, y: float, vx: float, vy: float, color: QColor,
+              size: float, life: int = 40, scale: float = 1.0):
+        self._make_room(1)
+        i = self.count
+        self.count += 1
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.size[i] = size
+        self.scale[i] = scale
+        self.life[i] = life
+        self.max_life[i] = life
+        self.color[i] = color.rgba()
+        r = size * scale * 0.5
+        area = QRectF(x - r, y - r, 2 * r, 2 * r)
+        self._dirty = self._dirty.united(area)
+        self.update(area)
+
+    def burst(self, x: float, y: float, color: QColor, n: int = 8, life: int = 40,
+              size=(4, 9), speed=(2, 8)):
+        """``n`` partikel ke arah acak dari (x, y) — efek ledakan bubble."""
+        n = min(n, self.capacity)
+        self._make_room(n)
+        uniform = self.rng.uniform
+        for _ in range(n):
+            s = uniform(*size)
+            angle = uniform(0, 2 * math.pi)
+            v = uniform(*speed)
+            self.spawn(x, y, math.cos(angle) * v, math.sin(angle) * v, color, s, life)
+
+    def clear(self):
+        self.count = 0
+        self.update(self._dirty)
+        self._dirty = QRectF()
+
+    # --- Simulasi ---
+
+    def step(self):
+        """Majukan semua partikel satu frame, lalu minta repaint area yang berubah."""
+        if not self.count:
+            return
+        if self.use_numpy:
+            dirty = self._step_numpy()
+        else:
+            dirty = self._step_python()
+        self.update(self._dirty.united(dirty))
+        self._dirty = dirty
+
+    def _step_numpy(self) -> QRectF:
+        n = self.count
+        life = self.life[:n]
+        life -= 1
+        alive = life > 0
+        k = int(np.count_nonzero(alive))
+        if k < n:
+            # Compaction stabil: urutan spawn tetap, yang mati hilang
+            for name, _ in _FIELDS:
+                a = getattr(self, name)
+                a[:k] = a[:n][alive]
+            self.count = n = k
+        if not n:
+            return QRectF()
+
+        x, y = self.x[:n], self.y[:n]
+        vx, vy = self.vx[:n], self.vy[:n]
+        scale = self.scale[:n]
+        x += vx
+        y += vy
+        vx *= DRAG
+        vy *= DRAG
+        vy += GRAVITY
+        scale *= SHRINK
+
+        r = self.size[:n] * scale * 0.5
+        min_x = float((x - r).min())
+        min_y = float((y - r).min())
+        return QRectF(min_x, min_y, float((x + r).max()) - min_x, float((y + r).max()) - min_y)
+
+    def _step_python(self) -> QRectF:
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        size, scale = self.size, self.scale
+        life, max_life, color = self.life, self.max_life, self.color
+        min_x = min_y = math.inf
+        max_x = max_y = -math.inf
+        j = 0
+        for i in range(self.count):
+            left = life[i] - 1
+            if left <= 0:
+                continue
+            # Integrasi + compaction dalam satu loop: slot i pindah ke j
+            s = scale[i] * SHRINK
+            px = x[i] + vx[i]
+            py = y[i] + vy[i]
+            r = size[i] * s * 0.5
+            x[j] = px
+            y[j] = py
+            vx[j] = vx[i] * DRAG
+            vy[j] = vy[i] * DRAG + GRAVITY
+            scale[j] = s
+            size[j] = size[i]
+            life[j] = left
+            max_life[j] = max_life[i]
+            color[j] = color[i]
+            j += 1
+
+            if px - r < min_x: min_x = px - r
+            if px + r > max_x: max_x = px + r
+            if py - r < min_y: min_y = py - r
+            if py + r > max_y: max_y = py + r
+        self.count = j
+        if not j:
+            return QRectF()
+        return QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
+
+    # --- QGraphicsItem ---
+
+    def boundingRect(self) -> QRectF:
+        return self.bounds
+
+    def _brush(self, rgba: int) -> QBrush:
+        brush = self._brushes.get(rgba)
+        if brush is None:
+            brush = self._brushes[rgba] = QBrush(QColor.fromRgba(rgba))
+        return brush
+
+    def paint(self, painter, option, widget=None):
+        n = self.count
+        if not n:
+            return
+        # tolist(): float/int Python biasa (akses per elemen NumPy lambat)
+        xs, ys = self.x[:n].tolist(), self.y[:n].tolist()
+        sizes, scales = self.size[:n].tolist(), self.scale[:n].tolist()
+        lives, max_lives = self.life[:n].tolist(), self.max_life[:n].tolist()
+        colors = self.color[:n].tolist()
+        painter.setPen(Qt.NoPen)
+        base_opacity = painter.opacity()
+        for i in range(n):
+            r = sizes[i] * scales[i] * 0.5
+            painter.setOpacity(base_opacity * lives[i] / max_lives[i])
+            painter.setBrush(self._brush(colors[i]))
+            painter.drawEllipse(QPointF(xs[i], ys[i]), r, r)
+        painter.setOpacity(base_opacity)
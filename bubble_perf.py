@@ -0,0 +1,232 @@
+"""
+bubble_perf.py — Frame-time instrumentation for Macan Bubble Shooter
+
+``FrameProfiler`` splits every frame of the 16 ms game loop into phases:
+
+    anim       FrameScheduler tick (tweens, popups, pulses, shot timer)
+    particles  ParticleSystem.step + meteor trail
+    flight     fixed-step shot flight and boss collision
+    attach     GameState.land — attach, match, floating detection
+    removal    RemovalBatch.flush — pool release, bursts, SFX of every
+               removed group (match + floating)
+    dispatch   score popups, achievement tracking and toasts
+    aim        update_aim_line (mouse driven, counted in the frame it lands in)
+    audio      SFX mixing into NullSink (null audio mode; QtAudioSink runs on
+               its own timer and is not counted)
+    paint      GameView paint (Qt rendering of the scene)
+
+Phases nest: time spent in an inner phase is not counted in the outer one,
+so the phases of a frame add up to its work time. A frame runs from one
+``update_game`` to the next; that interval, the work time and each phase go
+into a rolling window reported as p50/p95/p99. A frame whose interval is
+more than ``DROP_FACTOR`` × budget counts as dropped; one whose work alone
+exceeds the budget counts as over budget.
+
+The scene holds the profiler as ``scene.frame_prof``, which is ``None`` when
+profiling is off. Every hook is written as
+``fp = self.frame_prof; if fp is not None: fp.enter(...)``, so a disabled
+build pays one attribute read per hook.
+
+    F3                                              toggle the HUD overlay
+    python macan_bubble_shooter.py --frame-log frames.jsonl
+
+``--frame-log`` appends one JSON summary line every ``LOG_EVERY_FRAMES``
+frames (and one at exit). This also works with ``QT_QPA_PLATFORM=offscreen``.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from collections import deque
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QLabel
+
+
+PHASES = ("anim", "particles", "flight", "attach", "removal", "dispatch", "aim", "audio",
+          "paint")
+
+FRAME_BUDGET_MS = 16.0     # Interval GameScene.timer
+FRAME_WINDOW = 240         # Frame di rolling window (~4 detik)
+DROP_FACTOR = 1.5          # Interval > 1.5x budget = frame terlewat
+LOG_EVERY_FRAMES = 60      # Satu baris JSON per ~1 detik
+OVERLAY_REFRESH_MS = 500
+
+
+def percentile(sorted_values, q: float) -> float:
+    """Nearest-rank percentile dari list yang sudah terurut."""
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[i]
+
+
+def _spread(values) -> dict:
+    ordered = sorted(values)
+    return {
+        "p50": round(percentile(ordered, 0.50), 3),
+        "p95": round(percentile(ordered, 0.95), 3),
+        "p99": round(percentile(ordered, 0.99), 3),
+        "max": round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+class FrameProfiler:
+    """
+    Per-frame phase timer with a rolling window.
+
+    ``begin_frame()`` closes the previous frame and starts a new one.
+    ``enter(phase)``/``leave()`` bracket a phase. A phase still open when
+    the next frame begins (an exception skipped its ``leave``) is dropped,
+    not charged with the idle time. ``clock`` can be swapped for a fake in
+    tests.
+    """
+
+    def __init__(self, window: int = FRAME_WINDOW, budget_ms: float = FRAME_BUDGET_MS,
+                 log_path=None, clock=None):
+        self.budget_ms = budget_ms
+        self.clock = clock or time.perf_counter
+        self.window = deque(maxlen=window)     # (interval_ms, work_ms, {phase: ms})
+        self.total_frames = 0
+        self.dropped = 0
+        self.over_budget = 0
+        self.log_path = str(log_path) if log_path else None
+        self._log = open(self.log_path, "a", encoding="utf-8") if self.log_path else None
+        self._t0 = self.clock()
+        self._acc = dict.fromkeys(PHASES, 0.0)
+        self._stack = []
+        self._mark = 0.0
+        self._frame_start = None
+
+    # --- Hook ---
+
+    def begin_frame(self):
+        now = self.clock()
+        self._stack.clear()     # fase yang tidak ditutup (exception) dibuang
+        if self._frame_start is not None:
+            self._record((now - self._frame_start) * 1000.0)
+        self._frame_start = now
+        self._acc = dict.fromkeys(PHASES, 0.0)
+
+    def enter(self, phase: str):
+        now = self.clock()
+        if self._stack:
+            self._acc[self._stack[-1]] += now - self._mark
+        self._stack.append(phase)
+        self._mark = now
+
+    def leave(self):
+        if self._stack:
+            self._close(self.clock())
+
+    def _close(self, now):
+        phase = self._stack.pop()
+        self._acc[phase] += now - self._mark
+        self._mark = now
+
+    def _record(self, interval_ms: float):
+        phases = {name: seconds * 1000.0 for name, seconds in self._acc.items()}
+        work_ms = sum(phases.values())
+        self.window.append((interval_ms, work_ms, phases))
+        self.total_frames += 1
+        if interval_ms > self.budget_ms * DROP_FACTOR:
+            self.dropped += 1
+        if work_ms > self.budget_ms:
+            self.over_budget += 1
+        if self._log is not None and self.total_frames % LOG_EVERY_FRAMES == 0:
+            self.write_log()
+
+    # --- Laporan ---
+
+    def summary(self) -> dict:
+        frames = list(self.window)
+        return {
+            "t": round(self.clock() - self._t0, 3),
+            "frames": self.total_frames,
+            "dropped": self.dropped,
+            "over_budget": self.over_budget,
+            "budget_ms": self.budget_ms,
+            "interval_ms": _spread([f[0] for f in frames]),
+            "work_ms": _spread([f[1] for f in frames]),
+            "phases_ms": {name: _spread([f[2][name] for f in frames]) for name in PHASES},
+        }
+
+    def text(self) -> str:
+        """Ringkasan multi-baris untuk overlay HUD."""
+        s = self.summary()
+        iv, wk = s["interval_ms"], s["work_ms"]
+        lines = [
+            f"frame {iv['p50']:5.1f} {iv['p95']:5.1f} {iv['p99']:5.1f} ms  (p50/95/99)",
+            f"work  {wk['p50']:5.1f} {wk['p95']:5.1f} {wk['p99']:5.1f} ms",
+            f"dropped {s['dropped']}  over {s['over_budget']}  / {s['frames']}",
+        ]
+        for name in PHASES:
+            ph = s["phases_ms"][name]
+            lines.append(f"{name:<9} {ph['p50']:5.2f} {ph['p95']:5.2f} {ph['p99']:5.2f}")
+        return "\n".join(lines)
+
+    def write_log(self):
+        if self._log is not None:
+            self._log.write(json.dumps(self.summary()) + "\n")
+            self._log.flush()
+
+    def close(self):
+        if self._log is not None:
+            self.write_log()
+            self._log.close()
+            self._log = None
+
+
+def log_path_from(argv=None):
+    """Path dari ``--frame-log PATH`` (atau ``frames.jsonl``), ``None`` kalau tidak ada."""
+    argv = sys.argv if argv is None else argv
+    if "--frame-log" not in argv:
+        return None
+    i = argv.index("--frame-log")
+    return argv[i + 1] if i + 1 < len(argv) and not argv[i + 1].startswith("-") else "frames.jsonl"
+
+
+# ============================================================
+# OVERLAY HUD
+# ============================================================
+
+class FrameStatsOverlay(QLabel):
+    """
+    Translucent text panel over the game view showing ``profiler.text()``
+    plus ``extra()`` lines (e.g. bubble pool stats), refreshed twice a
+    second while visible. Ignores the mouse so aiming is unaffected.
+    """
+
+    def __init__(self, parent, profiler: FrameProfiler, extra=None):
+        super().__init__(parent)
+        self.profiler = profiler
+        self.extra = extra
+        font = QFont("Consolas", 9)
+        font.setStyleHint(QFont.Monospace)
+        self.setFont(font)
+        self.setStyleSheet("color: #a7f3d0; background: rgba(0, 0, 0, 170);"
+                           " padding: 6px; border-radius: 6px;")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setTextInteractionFlags(Qt.NoTextInteraction)
+        self._timer = QTimer(self)
+        self._timer.setInterval(OVERLAY_REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    def refresh(self):
+        text = self.profiler.text()
+        if self.extra is not None:
+            text += "\n" + self.extra()
+        self.setText(text)
+        self.adjustSize()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._timer.stop()
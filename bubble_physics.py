@@ -0,0 +1,307 @@
+"""
+bubble_physics.py — Shot trajectory prediction for Macan Bubble Shooter
+
+Computes where a shot goes in closed form instead of marching it in small
+steps. The shot moves in straight segments between the side walls. Each
+segment is intersected with the circles around the placed bubbles, and
+only the cells near the segment are looked up in ``BubbleGrid``. The result
+is a ``ShotPath``: the bounce polyline, the exact contact point and the cell
+the bubble snaps into.
+
+The aim guide (``GameScene.update_aim_line``) and the shot itself
+(``GameScene.shoot_bubble``/``update_game``) use the same ``ShotPath``, so the
+bubble lands where the guide pointed.
+
+Flight runs on a fixed timestep. ``ShotFlight`` moves the shot a fixed
+distance along its ``ShotPath`` per tick. ``FixedStepClock`` turns
+monotonic wall-clock time into a whole number of ticks, plus a 0..1
+remainder (``alpha``) used to interpolate the drawn position. Frame
+hitches therefore never slow the shot or change where it lands, and a shot
+is bit-reproducible from its start point and direction.
+
+No PySide6 dependency — safe to import from headless tools.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+
+from bubble_grid import EMPTY
+
+
+# Jarak toleransi tabrakan, dalam kelipatan radius (sama dengan update_game)
+CONTACT_REACH = 1.8
+MAX_BOUNCES = 64
+
+# Fixed timestep: 20 px per 16 ms tick, the speed the old per-frame update had
+SHOT_SPEED = 20.0
+TICK_SECONDS = 0.016
+MAX_FRAME_SECONDS = 0.1   # Hitch besar (debugger, drag window) gak bikin lompatan jauh
+
+
+class ShotPath:
+    """
+    Polyline a shot follows, from the launch point through every wall
+    bounce to the contact point.
+
+    ``distance`` is the total path length up to contact. ``cell`` is the
+    ``(row, col)`` the bubble snaps into, or None if the grid is full.
+    ``grid_version`` is the ``BubbleGrid.version`` the prediction was made
+    against.
+    """
+
+    __slots__ = ("points", "lengths", "distance", "cell", "hit_ceiling", "grid_version")
+
+    def __init__(self, points: list, cell, hit_ceiling: bool, grid_version: int):
+        self.points = points
+        self.lengths = [
+            math.hypot(x1 - x0, y1 - y0)
+            for (x0, y0), (x1, y1) in zip(points, points[1:])
+        ]
+        self.distance = sum(self.lengths)
+        self.cell = cell
+        self.hit_ceiling = hit_ceiling
+        self.grid_version = grid_version
+
+    @property
+    def contact(self) -> tuple:
+        return self.points[-1]
+
+    def state_at(self, travelled: float) -> tuple:
+        """
+        ``(x, y, dir_x, dir_y, bounces)`` after ``travelled`` pixels along the
+        path. Past the end, the result is clamped to the contact point.
+        """
+        points = self.points
+        for i, length in enumerate(self.lengths):
+            (x0, y0), (x1, y1) = points[i], points[i + 1]
+            if travelled <= length or i == len(self.lengths) - 1:
+                t = min(travelled, length)
+                if length > 0:
+                    ux, uy = (x1 - x0) / length, (y1 - y0) / length
+                else:
+                    ux, uy = 0.0, -1.0
+                return x0 + ux * t, y0 + uy * t, ux, uy, i
+            travelled -= length
+        x, y = points[-1]
+        return x, y, 0.0, -1.0, 0
+
+    def truncated(self, max_distance: float) -> list:
+        """Polyline points up to ``max_distance`` along the path (for the aim guide)."""
+        if max_distance >= self.distance:
+            return list(self.points)
+        out = [self.points[0]]
+        remaining = max_distance
+        for (x0, y0), (x1, y1), length in zip(self.points, self.points[1:], self.lengths):
+            if remaining <= length:
+                t = remaining / length if length > 0 else 0.0
+                out.append((x0 + (x1 - x0) * t, y0 + (y1 - y0) * t))
+                break
+            out.append((x1, y1))
+            remaining -= length
+        return out
+
+
+def _segment_contact(grid, x0: float, y0: float, ux: float, uy: float,
+                     length: float, reach: float):
+    """
+    Smallest ``t`` in [0, length] at which a circle of radius ``reach`` around
+    a placed bubble contains ``(x0 + ux*t, y0 + uy*t)``, or None.
+
+    Only the rows whose band the segment crosses are visited. Within each
+    row, only the columns under the segment's x-extent (padded by ``reach``)
+    are tested.
+    """
+    radius = grid.radius
+    row_h = radius * 1.732
+    cells = grid.cells
+    cols = grid.cols
+    reach_sq = reach * reach
+    y1 = y0 + uy * length
+    lo_y, hi_y = min(y0, y1) - reach, max(y0, y1) + reach
+    first_row = max(math.floor((lo_y - radius) / row_h), 0)
+    last_row = min(math.ceil((hi_y - radius) / row_h), grid.rows - 1)
+
+    best = None
+    for row in range(first_row, last_row + 1):
+        gy = row * radius * 1.732 + radius
+        # Bagian segmen yang y-nya di dalam pita baris ini (+/- reach)
+        if abs(uy) > 1e-12:
+            ta = (gy - reach - y0) / uy
+            tb = (gy + reach - y0) / uy
+            t_lo, t_hi = max(min(ta, tb), 0.0), min(max(ta, tb), length)
+            if t_lo > t_hi:
+                continue
+        else:
+            if abs(gy - y0) >= reach:
+                continue
+            t_lo, t_hi = 0.0, length
+        xa, xb = x0 + ux * t_lo, x0 + ux * t_hi
+        offset = radius if row % 2 == 1 else 0
+        left = grid.grid_offset_x + radius + offset
+        c_lo = max(math.floor((min(xa, xb) - reach - left) / (radius * 2)), 0)
+        c_hi = min(math.ceil((max(xa, xb) + reach - left) / (radius * 2)), cols - 1)
+        base = row * cols
+        for col in range(c_lo, c_hi + 1):
+            v = cells[base + col]
+            if v == EMPTY or v == -3:   # kosong / reservasi boss (boss punya hit-test sendiri)
+                continue
+            cx = col * radius * 2 + radius + offset + grid.grid_offset_x
+            px, py = x0 - cx, y0 - gy
+            b = px * ux + py * uy
+            c = px * px + py * py - reach_sq
+            if c < 0:
+                t = 0.0
+            else:
+                disc = b * b - c
+                if disc < 0 or b > 0:
+                    continue
+                t = -b - math.sqrt(disc)
+                if t > length:
+                    continue
+            if best is None or t < best:
+                best = t
+    return best
+
+
+def predict_shot(grid, x: float, y: float, dir_x: float, dir_y: float,
+                 wall_left: float, wall_right: float,
+                 reach: float = None) -> ShotPath:
+    """
+    Trace a shot from (x, y) heading (dir_x, dir_y) until it touches a
+    placed bubble (within ``reach``, default 1.8 radius) or the ceiling.
+
+    Walls reflect the x direction, exactly as the old frame-by-frame bounce
+    did. The snap cell is the nearest empty cell to the contact point.
+    """
+    radius = grid.radius
+    if reach is None:
+        reach = radius * CONTACT_REACH
+    norm = math.hypot(dir_x, dir_y) or 1.0
+    ux, uy = dir_x / norm, dir_y / norm
+    points = [(x, y)]
+    hit_ceiling = False
+
+    for _ in range(MAX_BOUNCES):
+        # Jarak ke langit-langit (y = radius) dan ke dinding berikutnya
+        t_ceiling = (radius - y) / uy if uy < 0 else math.inf
+        if ux > 0:
+            t_wall = (wall_right - x) / ux
+        elif ux < 0:
+            t_wall = (wall_left - x) / ux
+        else:
+            t_wall = math.inf
+        t_wall = max(t_wall, 0.0)
+        seg = min(t_ceiling, t_wall)
+        if math.isinf(seg):
+            break
+
+        t_hit = _segment_contact(grid, x, y, ux, uy, seg, reach)
+        if t_hit is not None:
+            x, y = x + ux * t_hit, y + uy * t_hit
+            points.append((x, y))
+            break
+
+        x, y = x + ux * seg, y + uy * seg
+        points.append((x, y))
+        if seg == t_ceiling:
+            hit_ceiling = True
+            break
+        ux = -ux
+
+    cx, cy = points[-1]
+    cell = grid.nearest_empty_cell(cx, cy)
+    return ShotPath(points, cell, hit_ceiling, grid.version)
+
+
+# ── Fixed-timestep flight ────────────────────────────────────────────────────
+
+class ShotFlight:
+    """
+    A shot in flight, advanced one fixed tick at a time along its ShotPath.
+
+    Between ticks, ``state(alpha)`` interpolates from the previous tick to
+    the current one. The rendered position never runs ahead of the
+    simulation.
+    """
+
+    __slots__ = ("path", "speed", "travelled", "prev_travelled", "ticks", "bounced")
+
+    def __init__(self, path: ShotPath, speed: float = SHOT_SPEED):
+        self.path = path
+        self.speed = speed
+        self.travelled = 0.0
+        self.prev_travelled = 0.0
+        self.ticks = 0
+        self.bounced = False
+
+    @property
+    def landed(self) -> bool:
+        return self.travelled >= self.path.distance
+
+    def retarget(self, path: ShotPath):
+        """Continue along a freshly predicted path (the grid changed mid-flight)."""
+        self.path = path
+        self.travelled = 0.0
+        self.prev_travelled = 0.0
+
+    def step(self) -> bool:
+        """Advance one tick; returns True once the contact point is reached."""
+        self.prev_travelled = self.travelled
+        self.travelled = min(self.travelled + self.speed, self.path.distance)
+        self.ticks += 1
+        if self.path.state_at(self.travelled)[4]:
+            self.bounced = True
+        return self.landed
+
+    def position(self) -> tuple:
+        """Simulated position at the current tick."""
+        x, y, _, _, _ = self.path.state_at(self.travelled)
+        return x, y
+
+    def state(self, alpha: float = 1.0) -> tuple:
+        """``(x, y)`` interpolated between the previous and the current tick."""
+        d = self.prev_travelled + (self.travelled - self.prev_travelled) * alpha
+        x, y, _, _, _ = self.path.state_at(d)
+        return x, y
+
+
+class FixedStepClock:
+    """
+    Accumulator that turns elapsed monotonic time into fixed simulation ticks.
+
+    ``advance()`` returns how many ticks to run this frame. ``alpha`` is the
+    leftover fraction of a tick, used for interpolation. Elapsed time per
+    frame is clamped to ``max_frame`` so a long stall catches up in a
+    bounded number of ticks. ``clock`` can be swapped for a fake in
+    headless runs.
+    """
+
+    def __init__(self, dt: float = TICK_SECONDS, max_frame: float = MAX_FRAME_SECONDS,
+                 clock=None):
+        self.dt = dt
+        self.max_frame = max_frame
+        self.clock = clock or time.monotonic
+        self.accumulator = 0.0
+        self._last = None
+
+    def reset(self):
+        """Start counting from now (new shot, resume after pause)."""
+        self.accumulator = 0.0
+        self._last = self.clock()
+
+    def advance(self) -> int:
+        now = self.clock()
+        if self._last is None:
+            self._last = now
+        elapsed = min(max(now - self._last, 0.0), self.max_frame)
+        self._last = now
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.dt)
+        self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        return self.accumulator / self.dt
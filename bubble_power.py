@@ -4,141 +4,22 @@ Modul untuk mengelola berbagai power-up yang membantu pemain
 """
 
 from PySide6.QtWidgets import QGraphicsEllipseItem, QGraphicsTextItem, QGraphicsRectItem
-from PySide6.QtCore import Qt, QTimer, QPointF, QRectF
+from PySide6.QtCore import Qt, QPointF, QRectF
 from PySide6.QtGui import QColor, QPen, QBrush, QRadialGradient, QFont, QPainterPath
 import random
 import math
 
-class PowerUpType:
-    """Enum-like class untuk tipe power-up"""
-    BOMB = "bomb"           # Meledakkan area 3x3
-    LASER = "laser"         # Tembakan laser vertikal
-    RAINBOW = "rainbow"     # Bubble rainbow (cocok dengan warna apapun)
-    FIREBALL = "fireball"   # Tembakan yang menembus dan meledak
-    FREEZE = "freeze"       # Freeze drop counter untuk 5 tembakan
-    
-class PowerUp:
-    """
-    Base class untuk semua power-up.
-    Setiap power-up memiliki cooldown dan durasi.
-    """
-    def __init__(self, power_type, cooldown=10):
-        self.type = power_type
-        self.cooldown = cooldown  # Berapa tembakan hingga bisa digunakan lagi
-        self.current_cooldown = 0
-        self.active = False
-        self.charges = 0  # Jumlah charges tersedia
-        
-    def can_use(self):
-        """Cek apakah power bisa digunakan"""
-        return self.charges > 0 and self.current_cooldown == 0
-    
-    def use(self):
-        """Gunakan power"""
-        if self.can_use():
-            self.charges -= 1
-            self.current_cooldown = self.cooldown
-            self.active = True
-            return True
-        return False
-    
-    def update_cooldown(self):
-        """Update cooldown setiap tembakan"""
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
-    
-    def add_charge(self, amount=1):
-        """Tambah charge"""
-        self.charges += amount
+# Tipe, charge & cooldown power-up tidak butuh Qt (dipakai juga oleh GameState headless)
+from bubble_state import PowerUpType, PowerUp, PowerUpManager as _PowerUpState
+from bubble_anim import scheduler_for
 
-class PowerUpManager:
+
+class PowerUpManager(_PowerUpState):
     """
     Manager untuk mengelola semua power-up dalam game.
     Handles spawning, activation, dan visual effects.
     """
-    
-    def __init__(self):
-        # Dictionary untuk menyimpan semua power-up yang tersedia
-        self.powers = {
-            PowerUpType.BOMB: PowerUp(PowerUpType.BOMB, cooldown=8),
-            PowerUpType.LASER: PowerUp(PowerUpType.LASER, cooldown=10),
-            PowerUpType.RAINBOW: PowerUp(PowerUpType.RAINBOW, cooldown=6),
-            PowerUpType.FIREBALL: PowerUp(PowerUpType.FIREBALL, cooldown=12),
-            PowerUpType.FREEZE: PowerUp(PowerUpType.FREEZE, cooldown=15),
-        }
-        
-        # Visual indicators untuk power-up
-        self.power_icons = {}
-        
-        # Chance untuk drop power-up setelah match (dalam persen)
-        self.drop_chance = 15  # 15% chance per match 3+
-        
-    def update_all_cooldowns(self):
-        """Update cooldown semua power setiap tembakan"""
-        for power in self.powers.values():
-            power.update_cooldown()
-    
-    def try_drop_powerup(self, match_size):
-        """
-        Coba drop power-up berdasarkan ukuran match.
-        Semakin besar match, semakin besar chance.
-        
-        Args:
-            match_size: Jumlah bubble yang match
-            
-        Returns:
-            PowerUpType atau None
-        """
-        if match_size < 3:
-            return None
-        
-        # Bonus chance untuk match besar
-        adjusted_chance = self.drop_chance + (match_size - 3) * 5
-        adjusted_chance = min(adjusted_chance, 50)  # Max 50%
-        
-        if random.randint(1, 100) <= adjusted_chance:
-            # Random power-up
-            power_type = random.choice(list(PowerUpType.__dict__.values()))
-            if isinstance(power_type, str) and not power_type.startswith('_'):
-                return power_type
-        
-        return None
-    
-    def add_powerup_charge(self, power_type):
-        """Tambah charge untuk power-up tertentu"""
-        if power_type in self.powers:
-            self.powers[power_type].add_charge(1)
-            return True
-        return False
-    
-    def use_power(self, power_type):
-        """Aktifkan power-up"""
-        if power_type in self.powers:
-            return self.powers[power_type].use()
-        return False
-    
-    def get_power_info(self, power_type):
-        """Dapatkan info power (charges, cooldown, dll)"""
-        if power_type in self.powers:
-            power = self.powers[power_type]
-            return {
-                'charges': power.charges,
-                'cooldown': power.current_cooldown,
-                'can_use': power.can_use()
-            }
-        return None
-    
-    def get_power_description(self, power_type):
-        """Dapatkan deskripsi power-up"""
-        descriptions = {
-            PowerUpType.BOMB: "💣 BOMB\nMeledakkan area 3x3\ndi sekitar impact",
-            PowerUpType.LASER: "⚡ LASER\nTembakan laser vertikal\nmenghancurkan 1 kolom",
-            PowerUpType.RAINBOW: "🌈 RAINBOW\nBubble universal\ncocok dengan warna apapun",
-            PowerUpType.FIREBALL: "🔥 FIREBALL\nTembakan penetrasi\nmeledak saat berhenti",
-            PowerUpType.FREEZE: "❄️ FREEZE\nFreeze drop counter\nuntuk 5 tembakan",
-        }
-        return descriptions.get(power_type, "Unknown Power")
-    
+
     def get_power_color(self, power_type):
         """Dapatkan warna khas untuk setiap power"""
         colors = {
@@ -156,7 +37,7 @@ class PowerUpBubble(QGraphicsEllipseItem):
     Bubble khusus yang bisa ditembak dan memberikan power.
     """
     
-    def __init__(self, power_type, x, y, radius=22):
+    def __init__(self, power_type, x, y, radius=22, frames=None):
         super().__init__(-radius, -radius, radius * 2, radius * 2)
         self.power_type = power_type
         self.radius_val = radius
@@ -165,11 +46,10 @@ class PowerUpBubble(QGraphicsEllipseItem):
         self.row = 0
         self.col = 0
         
-        # Animation timer untuk efek berkedip
-        self.blink_timer = QTimer()
+        # Efek berkedip di jam animasi scene
         self.blink_state = 0
-        self.blink_timer.timeout.connect(self.animate_blink)
-        self.blink_timer.start(200)  # Blink setiap 200ms
+        frames = frames if frames is not None else scheduler_for()
+        self.blink_task = frames.add(self.animate_blink, interval_ms=200)  # Blink setiap 200ms
     
     def setup_appearance(self):
         """Setup visual appearance power-up bubble"""
@@ -239,8 +119,12 @@ class PowerUpVisualEffect:
             scene.addItem(line)
             particles.append(line)
             
-            # Hapus setelah delay
-            QTimer.singleShot(300, lambda l=line: scene.removeItem(l) if l.scene() else None)
+        # Hapus setelah delay
+        def remove():
+            for line in particles:
+                if line.scene():
+                    scene.removeItem(line)
+        scheduler_for(scene).after(300, remove)
         
         return particles
     
@@ -256,18 +140,19 @@ class PowerUpVisualEffect:
         laser.setOpacity(0.8)
         scene.addItem(laser)
         
-        # Fade out animation
+        # Fade out animation: mulai setelah 100ms, turun tiap 50ms
         opacity = 0.8
         def fade():
             nonlocal opacity
             opacity -= 0.1
             if opacity > 0:
                 laser.setOpacity(opacity)
-                QTimer.singleShot(50, fade)
-            else:
+                return True
+            if laser.scene():
                 scene.removeItem(laser)
+            return False
         
-        QTimer.singleShot(100, fade)
+        scheduler_for(scene).add(fade, interval_ms=50, delay_ms=50)
         return laser
     
     @staticmethod
@@ -291,11 +176,13 @@ class PowerUpVisualEffect:
                 freeze_overlay.setOpacity(0.6)
             
             if blink_count[0] < 6:
-                QTimer.singleShot(200, blink)
-            else:
+                return True
+            if freeze_overlay.scene():
                 scene.removeItem(freeze_overlay)
+            return False
         
         blink()
+        scheduler_for(scene).add(blink, interval_ms=200)
         return freeze_overlay
 
 # === CONVENIENCE FUNCTIONS ===
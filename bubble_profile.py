@@ -0,0 +1,371 @@
+"""
+bubble_profile.py — Startup profiler for Macan Bubble Shooter
+
+    python macan_bubble_shooter.py --profile-startup [startup_profile.json]
+
+starts the game with a ``StartupProfiler`` installed before the entry
+module's own imports. It records wall time for every first-time import,
+the first construction of the shared singletons (``get_sound_manager()``,
+``get_graphics_manager()``, ...), ``QApplication()``, ``MainWindow()``, each
+background asset decode and the first paint, then writes the report and
+exits.
+
+The report is Chrome trace-event JSON (open it in Perfetto, speedscope or
+chrome://tracing for a flame chart) with a summary under ``otherData``. A
+path ending in ``.folded`` gets collapsed stacks for flamegraph.pl instead.
+
+Budget check — cold starts in fresh processes, median of ``--runs``, exit
+code 1 when a summary metric is over its budget (``STARTUP_BUDGET_MS``)::
+
+    python bubble_profile.py --runs 3 --budget first_paint_ms=1500
+    python bubble_profile.py --offscreen          # CI without a display
+"""
+
+from __future__ import annotations
+
+import argparse
+import builtins
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+ENTRY = Path(__file__).with_name("macan_bubble_shooter.py")
+DEFAULT_REPORT = "startup_profile.json"
+
+# Accessor singleton yang konstruksi pertamanya diukur: modul -> fungsi
+SINGLETONS = {
+    "bubble_fx": "get_sound_manager",
+    "bubble_gfx": "get_graphics_manager",
+    "bubble_score": "get_score_manager",
+    "bubble_achievement": "get_achievement_manager",
+    "bubble_assets": "get_asset_loader",
+}
+
+# Budget cold start (ms sejak profiler mulai) untuk `python bubble_profile.py`
+STARTUP_BUDGET_MS = {
+    "first_paint_ms": 2000,
+}
+
+# Report tetap ditulis kalau first paint / asset tidak datang dalam waktu ini
+PROFILE_TIMEOUT_MS = 30000
+
+# Lane di trace: main thread dan worker AssetLoader
+_MAIN_TID = 1
+_ASSET_TID = 2
+_THREAD_NAMES = {_MAIN_TID: "main", _ASSET_TID: "assets"}
+
+
+class StartupProfiler:
+    """
+    Records startup spans as ``(name, category, start, end, lane)``.
+
+    ``install_import_hook()`` wraps ``builtins.__import__`` so every module
+    imported for the first time on the main thread becomes a span (nested
+    imports nest in time, which is what the flame chart shows). Accessors
+    listed in ``SINGLETONS`` are wrapped as soon as their module finishes
+    importing, so ``from bubble_fx import get_sound_manager`` already binds
+    the timed version.
+    """
+
+    def __init__(self, output=DEFAULT_REPORT):
+        self.output = str(output)
+        self.t0 = time.perf_counter()
+        self.events = []
+        self.marks = {}             # fase -> detik sejak t0
+        self._orig_import = None
+        self._main_thread = threading.get_ident()
+        self._finished = False
+
+    # --- Rekam ---
+
+    def record(self, name, cat, start, end, tid=_MAIN_TID):
+        self.events.append((name, cat, start, end, tid))
+
+    @contextmanager
+    def span(self, name, cat="startup"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, cat, start, time.perf_counter())
+
+    def mark(self, name):
+        self.marks[name] = time.perf_counter() - self.t0
+
+    def end_imports(self):
+        """Dipanggil saat entry module selesai import (awal blok ``__main__``)."""
+        self.mark("imports")
+
+    # --- Import & singleton ---
+
+    def install_import_hook(self):
+        if self._orig_import is None:
+            self._orig_import = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall_import_hook(self):
+        if self._orig_import is not None:
+            builtins.__import__ = self._orig_import
+            self._orig_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        orig = self._orig_import or builtins.__import__
+        if level or name in sys.modules or threading.get_ident() != self._main_thread:
+            return orig(name, globals, locals, fromlist, level)
+        start = time.perf_counter()
+        try:
+            return orig(name, globals, locals, fromlist, level)
+        finally:
+            self.record(f"import {name}", "import", start, time.perf_counter())
+            attr = SINGLETONS.get(name)
+            if attr and name in sys.modules:
+                self._wrap_singleton(sys.modules[name], attr)
+
+    def _wrap_singleton(self, module, attr):
+        orig = getattr(module, attr, None)
+        if orig is None or getattr(orig, "_profiled", False):
+            return
+        profiler = self
+
+        def accessor(*args, **kwargs):
+            if accessor.constructed:
+                return orig(*args, **kwargs)
+            accessor.constructed = True
+            with profiler.span(f"{attr}()", "singleton"):
+                return orig(*args, **kwargs)
+
+        accessor.constructed = False
+        accessor._profiled = True
+        accessor.__doc__ = orig.__doc__
+        setattr(module, attr, accessor)
+
+    # --- First paint & asset ---
+
+    def watch(self, app, window, loader=None):
+        """
+        Tunggu paint pertama ``window`` dan semua asset ``loader``, lalu tulis
+        report dan keluar dari event loop. Panggil sebelum ``app.exec()``.
+        """
+        from PySide6.QtCore import QEvent, QObject, QTimer
+
+        profiler = self
+        self.mark("shown")
+        self._app = app
+        self._loader = loader
+        self._painted = False
+
+        class _PaintWatcher(QObject):
+            def eventFilter(self, obj, event):
+                if (not profiler._painted and event.type() == QEvent.Paint
+                        and obj.isWidgetType() and obj.window() is window):
+                    profiler._painted = True
+                    start = time.perf_counter()
+                    # Timer 0 jalan setelah seluruh frame pertama selesai digambar
+                    QTimer.singleShot(0, lambda: profiler._on_first_paint(start))
+                return False
+
+        self._watcher = _PaintWatcher()
+        app.installEventFilter(self._watcher)
+        if loader is not None:
+            loader.ready.connect(self._on_asset_ready)
+        QTimer.singleShot(PROFILE_TIMEOUT_MS, self.finish)
+
+    def _on_first_paint(self, start):
+        self.record("first paint", "startup", start, time.perf_counter())
+        self.mark("first_paint")
+        self._app.removeEventFilter(self._watcher)
+        self._maybe_finish()
+
+    def _on_asset_ready(self, key):
+        self.mark("assets_ready")
+        self._maybe_finish()
+
+    def _maybe_finish(self):
+        if self._painted and "first_paint" in self.marks and not (
+                self._loader is not None and self._loader.is_pending()):
+            self.finish()
+
+    def finish(self):
+        if self._finished:
+            return
+        self._finished = True
+        self.uninstall_import_hook()
+        loader = getattr(self, "_loader", None)
+        if loader is not None:
+            for key, (start, end) in loader.spans.items():
+                self.record(key, "asset", start, end, _ASSET_TID)
+        path = self.write()
+        summary = self.summary()
+        print(f"⏱ Startup: imports {summary.get('imports_ms')} ms, "
+              f"first paint {summary.get('first_paint_ms')} ms, "
+              f"assets {summary.get('assets_ready_ms')} ms -> {path}")
+        app = getattr(self, "_app", None)
+        if app is not None:
+            app.quit()
+
+    # --- Report ---
+
+    def _nested(self):
+        """Yield ``(stack, event, self_seconds)`` per span, stack = nama-nama induk + diri."""
+        lanes = {}
+        for event in self.events:
+            lanes.setdefault(event[4], []).append(event)
+        for tid, events in lanes.items():
+            events.sort(key=lambda e: (e[2], -e[3]))
+            stack = []          # [event, durasi anak]
+            root = (_THREAD_NAMES.get(tid, str(tid)),)
+
+            def close():
+                event, children = stack.pop()
+                names = root + tuple(e[0] for e, _ in stack) + (event[0],)
+                return names, event, max(0.0, event[3] - event[2] - children)
+
+            for event in events:
+                while stack and stack[-1][0][3] <= event[2]:
+                    yield close()
+                if stack:
+                    stack[-1][1] += event[3] - event[2]
+                stack.append([event, 0.0])
+            while stack:
+                yield close()
+
+    def summary(self) -> dict:
+        def ms(seconds):
+            return round(seconds * 1000, 1)
+
+        result = {f"{name}_ms": ms(t) for name, t in self.marks.items()}
+        for cat, key in (("startup", "phases"), ("singleton", "singletons"), ("asset", "assets")):
+            result[key] = {name: ms(end - start) for name, c, start, end, _ in self.events if c == cat}
+        imports = sorted(((ms(t), names[-1]) for names, event, t in self._nested()
+                          if event[1] == "import"), reverse=True)
+        result["slowest_imports_self_ms"] = [[name, t] for t, name in imports[:10]]
+        return result
+
+    def report(self) -> dict:
+        events = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+                  for tid, name in _THREAD_NAMES.items()]
+        for name, cat, start, end, tid in sorted(self.events, key=lambda e: (e[4], e[2], -e[3])):
+            events.append({
+                "name": name, "cat": cat, "ph": "X", "pid": 1, "tid": tid,
+                "ts": round((start - self.t0) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": self.summary()}
+
+    def write(self, path=None) -> Path:
+        path = Path(path or self.output)
+        if path.suffix == ".folded":
+            folded = {}
+            for names, event, seconds in self._nested():
+                key = ";".join(names)
+                folded[key] = folded.get(key, 0) + int(seconds * 1e6)
+            path.write_text("".join(f"{k} {v}\n" for k, v in folded.items() if v > 0),
+                            encoding="utf-8")
+        else:
+            path.write_text(json.dumps(self.report(), indent=1), encoding="utf-8")
+        return path
+
+
+# --- Singleton & Helpers ---
+_profiler = None
+
+
+def start(argv=None):
+    """Aktifkan profiler kalau argv berisi ``--profile-startup [PATH]``."""
+    global _profiler
+    argv = sys.argv if argv is None else argv
+    if "--profile-startup" not in argv:
+        return None
+    i = argv.index("--profile-startup")
+    output = argv[i + 1] if i + 1 < len(argv) and not argv[i + 1].startswith("-") else DEFAULT_REPORT
+    _profiler = StartupProfiler(output)
+    _profiler.install_import_hook()
+    return _profiler
+
+
+def get_profiler():
+    return _profiler
+
+
+@contextmanager
+def profile_span(name, cat="startup"):
+    """Span di profiler aktif; no-op kalau tidak sedang --profile-startup."""
+    if _profiler is None:
+        yield
+    else:
+        with _profiler.span(name, cat):
+            yield
+
+
+# ============================================================
+# BUDGET CHECK
+# ============================================================
+
+def run_cold_start(entry=ENTRY, env=None, timeout=120) -> dict:
+    """Jalankan ``entry --profile-startup`` di proses baru, return summary-nya."""
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "startup.json"
+        proc = subprocess.run([sys.executable, str(entry), "--profile-startup", str(out)],
+                              capture_output=True, text=True, timeout=timeout, env=env)
+        if not out.exists():
+            raise RuntimeError(f"{entry} exited with {proc.returncode} without a report:\n"
+                               f"{proc.stderr[-2000:]}")
+        return json.loads(out.read_text(encoding="utf-8"))["otherData"]
+
+
+def _parse_budget(text: str):
+    metric, limit = text.split("=")
+    return metric.strip(), float(limit)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="bubble_profile", description="Cold-start budget check (runs the game with --profile-startup).")
+    parser.add_argument("--runs", "-r", type=int, default=3)
+    parser.add_argument("--budget", "-b", type=_parse_budget, action="append", default=[],
+                        metavar="METRIC=MS", help="mis. first_paint_ms=1500 (boleh berulang)")
+    parser.add_argument("--entry", default=str(ENTRY), help="script game (default: macan_bubble_shooter.py)")
+    parser.add_argument("--offscreen", action="store_true", help="QT_QPA_PLATFORM=offscreen (CI tanpa display)")
+    args = parser.parse_args(argv)
+
+    budget = dict(STARTUP_BUDGET_MS)
+    budget.update(args.budget)
+    env = dict(os.environ)
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    summaries = []
+    for i in range(args.runs):
+        summaries.append(run_cold_start(args.entry, env))
+        print(f"\r{i + 1}/{args.runs} runs", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+
+    metrics = sorted({k for s in summaries for k, v in s.items() if isinstance(v, (int, float))})
+    failed = False
+    for metric in metrics + sorted(set(budget) - set(metrics)):
+        values = [s[metric] for s in summaries if metric in s]
+        limit = budget.get(metric)
+        if not values:
+            print(f"{metric:<18} {'missing':>10}   budget {limit:.0f} ms  FAIL")
+            failed = True
+            continue
+        median = statistics.median(values)
+        line = f"{metric:<18} {median:8.1f} ms"
+        if limit is not None:
+            over = median > limit
+            failed |= over
+            line += f"   budget {limit:.0f} ms  {'FAIL' if over else 'ok'}"
+        print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
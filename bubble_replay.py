@@ -0,0 +1,398 @@
+"""
+bubble_replay.py — Replay recording & headless verification
+
+``ReplayRecorder`` collects everything needed to re-run a session on the
+headless ``bubble_state.GameState``:
+
+- ``seed`` + ``start``: GameState.rng (a ``GameRng``) is reseeded and the
+  whole rule state snapshotted when recording begins (new game, loaded save
+  or daily grid alike)
+- player inputs: shot angle (+ shooter color, checked on playback), landing
+  cell/position, swaps, power-ups
+- things decided outside the rules engine: shot timer multiplier & rush bonus
+  (on each landing), score bonuses (timer penalty, achievements, boss kills),
+  boss cell reservations, ceiling drops (they run on a 100 ms QTimer)
+- expected outcomes: every match (size + running score) and drop count
+
+``verify_replay`` replays that stream at full CPU speed and stops at the
+first event whose outcome differs from the recording. ``ReplayPlayer`` in
+bubble_special still does the real-time (16 ms QTimer) playback.
+
+    python bubble_replay.py [replays.json] [--index N]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bubble_state import GameState, GameListener, GameRng
+
+
+REPLAY_VERSION = 3
+
+
+class ReplayEvent:
+    """A single recorded action in a replay."""
+    __slots__ = ("tick", "kind", "data")
+
+    SHOT  = "shot"    # data: {"angle": float, "color": int}
+    SWAP  = "swap"    # data: {}
+    MATCH = "match"   # data: {"size": int, "score": int}
+    DROP  = "drop"    # data: {"count": int}
+    LAND  = "land"    # data: {"cell": [r, c] | None, "x", "y", "bounced", "mult", "rush"}
+    POWER = "power"   # data: {"type": str}
+    BONUS = "bonus"   # data: {"points": int, "why": str}
+    BOSS  = "boss"    # data: {"row": int, "col": int}   (reservasi cell -3)
+    BOSS_HIT = "boss_hit"  # data: {"row": int, "col": int, "killed": bool}
+    CEIL  = "ceil"    # data: {}
+
+    def __init__(self, tick: int, kind: str, data: dict):
+        self.tick = tick
+        self.kind = kind
+        self.data = data
+
+    def to_dict(self) -> dict:
+        return {"t": self.tick, "k": self.kind, "d": self.data}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ReplayEvent":
+        return cls(d["t"], d["k"], d["d"])
+
+
+class ReplayRecorder:
+    """
+    Records every player action during a game session.
+    Attach it to GameScene events; call save() at session end.
+
+    ``start()`` opens a session; the scene calls ``begin(seed, snapshot)``
+    lazily right before the first recorded event so the start state matches
+    whatever board the session actually began with.
+    """
+
+    def __init__(self):
+        self._events : list[ReplayEvent] = []
+        self._tick   : int  = 0
+        self._score  : int  = 0
+        self._level  : int  = 1
+        self._active : bool = False
+        self._seed   : int  = 0
+        self._start  : dict | None = None
+        self._start_ts: str = ""
+
+    def start(self, grid_seed: int = 0):
+        self._events   = []
+        self._tick     = 0
+        self._score    = 0
+        self._level    = 1
+        self._active   = True
+        self._seed     = grid_seed
+        self._start    = None
+        self._start_ts = datetime.now().isoformat(timespec="seconds")
+
+    def begin(self, seed: int, snapshot: dict):
+        """Catat seed rng & state awal (sekali per sesi)."""
+        self._seed  = seed
+        self._start = snapshot
+
+    @property
+    def needs_begin(self) -> bool:
+        return self._active and self._start is None
+
+    def stop(self):
+        self._active = False
+
+    def tick(self):
+        """Call once per game frame (16 ms)."""
+        if self._active:
+            self._tick += 1
+
+    def _add(self, kind: str, data: dict):
+        if self._active:
+            self._events.append(ReplayEvent(self._tick, kind, data))
+
+    def record_shot(self, angle: float, color: int):
+        self._add(ReplayEvent.SHOT, {"angle": angle, "color": color})
+
+    def record_land(self, cell, x: float, y: float, bounced: bool,
+                    mult: float, rush: int):
+        self._add(ReplayEvent.LAND, {"cell": list(cell) if cell else None,
+                                     "x": x, "y": y, "bounced": bounced,
+                                     "mult": mult, "rush": rush})
+
+    def record_swap(self):
+        self._add(ReplayEvent.SWAP, {})
+
+    def record_power(self, power_type: str):
+        self._add(ReplayEvent.POWER, {"type": power_type})
+
+    def record_match(self, size: int, score: int):
+        """``score`` = skor total setelah match ini."""
+        if self._active:
+            self._score = score
+        self._add(ReplayEvent.MATCH, {"size": size, "score": score})
+
+    def record_drop(self, count: int):
+        self._add(ReplayEvent.DROP, {"count": count})
+
+    def record_bonus(self, points: int, why: str):
+        self._add(ReplayEvent.BONUS, {"points": points, "why": why})
+
+    def record_boss(self, row: int, col: int):
+        self._add(ReplayEvent.BOSS, {"row": row, "col": col})
+
+    def record_boss_hit(self, row: int, col: int, killed: bool):
+        self._add(ReplayEvent.BOSS_HIT, {"row": row, "col": col, "killed": killed})
+
+    def record_ceiling(self):
+        self._add(ReplayEvent.CEIL, {})
+
+    def set_level(self, level: int):
+        self._level = level
+
+    def set_final_score(self, score: int):
+        self._score = score
+
+    def to_dict(self) -> dict:
+        return {
+            "version":    REPLAY_VERSION,
+            "timestamp":  self._start_ts,
+            "score":      self._score,
+            "level":      self._level,
+            "seed":       self._seed,
+            "start":      self._start,
+            "events":     [e.to_dict() for e in self._events],
+        }
+
+
+# ============================================================
+# HEADLESS VERIFIER
+# ============================================================
+
+class Divergence(Exception):
+    """Replay tidak cocok dengan hasil simulasi."""
+
+    def __init__(self, index: int, tick: int, kind: str, expected, actual):
+        super().__init__(f"event {index} (tick {tick}, {kind}): "
+                         f"expected {expected!r}, got {actual!r}")
+        self.index = index
+        self.tick = tick
+        self.kind = kind
+        self.expected = expected
+        self.actual = actual
+
+
+class ReplayCheck:
+    """Hasil ``verify_replay``."""
+    __slots__ = ("ok", "events", "shots", "score", "level", "divergence",
+                 "seconds", "reason")
+
+    def __init__(self):
+        self.ok = False
+        self.events = 0
+        self.shots = 0
+        self.score = 0
+        self.level = 1
+        self.divergence = None   # Divergence pertama, atau None
+        self.seconds = 0.0
+        self.reason = ""
+
+    def __repr__(self):
+        if self.ok:
+            return (f"<ReplayCheck ok: {self.shots} shots, score {self.score}, "
+                    f"level {self.level}, {self.seconds * 1000:.0f} ms>")
+        return f"<ReplayCheck FAILED: {self.reason}>"
+
+
+class _Verifier(GameListener):
+    """
+    Jalankan event replay berurutan. Event yang di game terjadi *di dalam*
+    GameState.land (match, drop, bonus achievement, reservasi boss) dikonsumsi
+    oleh hook listener di titik yang sama, supaya urutan skor & grid identik.
+    """
+
+    # Event yang bisa muncul di tengah resolusi satu tembakan
+    _INLINE = (ReplayEvent.BONUS,)
+
+    def __init__(self, data: dict):
+        self.events = [ReplayEvent.from_dict(d) for d in data.get("events", [])]
+        self.cursor = 0
+        self.state = GameState(rng=GameRng(), listener=self)
+        self.state.restore(data["start"])
+        self.state.rng.seed(data["seed"])
+        self.shots = 0
+
+    # --- helpers ---
+
+    def _peek(self):
+        return self.events[self.cursor] if self.cursor < len(self.events) else None
+
+    def _fail(self, kind, expected, actual):
+        ev = self._peek()
+        tick = ev.tick if ev else (self.events[-1].tick if self.events else 0)
+        raise Divergence(self.cursor, tick, kind, expected, actual)
+
+    def _bonuses(self):
+        while True:
+            ev = self._peek()
+            if ev is None or ev.kind not in self._INLINE:
+                return
+            self.state.score._add_score(ev.data["points"])
+            self.cursor += 1
+
+    def _expect(self, kind, expected_data):
+        """Event berikutnya harus ``kind`` dengan data yang sama."""
+        self._bonuses()
+        ev = self._peek()
+        if ev is None or ev.kind != kind:
+            self._fail(kind, ev.kind if ev else "end of replay", {kind: expected_data})
+        for key, value in expected_data.items():
+            if ev.data.get(key) != value:
+                self._fail(kind, ev.data, expected_data)
+        self.cursor += 1
+
+    # --- GameListener: event di dalam land() ---
+
+    def state_matched(self, matched, x, y):
+        self._bonuses()   # Reward achievement (on_pop dll) tercatat sebelum MATCH
+        self._expect(ReplayEvent.MATCH, {"size": len(matched),
+                                         "score": self.state.score.score})
+        ev = self._peek()
+        if ev is not None and ev.kind == ReplayEvent.BOSS:
+            row, col = ev.data["row"], ev.data["col"]
+            if self.state.grid.in_bounds(row, col):
+                self.state.grid.set(row, col, -3)
+            self.cursor += 1
+
+    def state_floating_removed(self, count):
+        if count > 0:
+            self._expect(ReplayEvent.DROP, {"count": count})
+        self._bonuses()
+
+    def state_neighbors_dropped(self, count):
+        self._expect(ReplayEvent.DROP, {"count": count})
+        self._bonuses()
+
+    def state_power_effect(self, power_type, row, col, destroyed):
+        self._bonuses()
+
+    def state_level_up(self, level):
+        self._bonuses()
+
+    # --- main loop ---
+
+    def run(self):
+        state = self.state
+        path = None
+        grid_version = None
+        while self.cursor < len(self.events):
+            ev = self.events[self.cursor]
+            kind, d = ev.kind, ev.data
+            if kind == ReplayEvent.SHOT:
+                if state.current_color != d["color"]:
+                    self._fail("color", d["color"], state.current_color)
+                self.cursor += 1
+                path = state.fire(d["angle"])
+                grid_version = state.grid.version
+                self.shots += 1
+            elif kind == ReplayEvent.LAND:
+                cell = tuple(d["cell"]) if d["cell"] else None
+                # Lintasan ulang harus mendarat di cell yang sama, kecuali grid
+                # berubah di tengah terbang (ceiling / boss) dan game re-target
+                if path is not None and state.grid.version == grid_version and path.cell != cell:
+                    self._fail("landing", cell, path.cell)
+                self.cursor += 1
+                if state.land(cell, d["x"], d["y"], d["mult"], d["bounced"], d["rush"]) is None:
+                    self._fail("landing", cell, "grid full")
+                path = None
+            elif kind == ReplayEvent.SWAP:
+                self.cursor += 1
+                state.swap_colors()
+            elif kind == ReplayEvent.POWER:
+                if not state.activate_power(d["type"]):
+                    self._fail("power", d["type"], "not available")
+                self.cursor += 1
+            elif kind == ReplayEvent.CEIL:
+                self.cursor += 1
+                state.add_ceiling_row()
+            elif kind == ReplayEvent.BOSS_HIT:
+                self.cursor += 1
+                row, col = d["row"], d["col"]
+                if d["killed"] and state.grid.in_bounds(row, col) and state.grid.get(row, col) == -3:
+                    state.grid.set(row, col, None)
+                path = None
+            elif kind == ReplayEvent.BONUS:
+                self._bonuses()
+            else:
+                # MATCH / DROP / BOSS yang tidak dikonsumsi hook = simulasi
+                # tidak menghasilkan kejadian itu
+                self._fail(kind, d, "no such event in simulation")
+
+
+def verify_replay(data: dict) -> ReplayCheck:
+    """
+    Re-simulate a saved replay headlessly. ``ok`` when every recorded match,
+    drop and shooter color reproduces and the final score/level equal the
+    recorded ``score``/``level`` (``set_final_score`` / ``set_level``).
+    """
+    check = ReplayCheck()
+    check.events = len(data.get("events", []))
+    if data.get("version", 1) < 3 or data.get("start") is None:
+        check.reason = "replay has no GameRng seed/start state (recorded before v3)"
+        return check
+
+    started = time.perf_counter()
+    verifier = _Verifier(data)
+    try:
+        verifier.run()
+    except Divergence as div:
+        check.divergence = div
+        check.reason = str(div)
+    check.seconds = time.perf_counter() - started
+    check.shots = verifier.shots
+    check.score = verifier.state.score.score
+    check.level = verifier.state.level
+    if check.divergence is None:
+        expected = (data.get("score", 0), data.get("level", 1))
+        if (check.score, check.level) != expected:
+            last_tick = verifier.events[-1].tick if verifier.events else 0
+            check.divergence = Divergence(len(verifier.events), last_tick, "final",
+                                          expected, (check.score, check.level))
+            check.reason = str(check.divergence)
+        else:
+            check.ok = True
+    return check
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="bubble_replay",
+                                     description="Verify saved replays headlessly.")
+    parser.add_argument("path", nargs="?",
+                        default=str(Path.home() / "AppData" / "Local" / "MacanBubbleShooter6"
+                                    / "saves" / "replays.json"))
+    parser.add_argument("--index", "-i", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.path) as f:
+        replays = json.load(f)
+    if isinstance(replays, dict):
+        replays = [replays]
+    indices = [args.index] if args.index is not None else range(len(replays))
+
+    failed = 0
+    for i in indices:
+        check = verify_replay(replays[i])
+        status = "OK  " if check.ok else "FAIL"
+        print(f"[{status}] #{i} {replays[i].get('timestamp', '')}  score {check.score} "
+              f"level {check.level}  {check.shots} shots  {check.seconds * 1000:.0f} ms"
+              + ("" if check.ok else f"\n       {check.reason}"))
+        failed += not check.ok
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
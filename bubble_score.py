@@ -8,7 +8,7 @@ Modul ini mengelola:
 - Streak tracking
 """
 
-from PySide6.QtCore import QObject, Signal, QTimer
+from PySide6.QtCore import QObject, Signal
 from PySide6.QtWidgets import QGraphicsTextItem
 from PySide6.QtGui import QColor, QFont
 import json
@@ -16,36 +16,15 @@ import math
 import random
 from pathlib import Path
 
+from bubble_anim import tweens_for, OUT_QUAD
 
-# ============================================================
-# KONFIGURASI SCORING
-# ============================================================
 
-# Poin dasar per bubble
-BASE_BUBBLE_SCORE   = 10
-# Bonus per extra bubble di atas 3
-EXTRA_BUBBLE_BONUS  = 15
-# Bonus drop (bubble melayang jatuh)
-DROP_SCORE_PER      = 20
-# Bonus per level
-LEVEL_MULTIPLIER    = 5
-
-# Combo system
-COMBO_DECAY_SHOTS   = 2    # Combo reset setelah N tembakan tanpa match
-MAX_COMBO           = 10   # Combo maksimum
-
-# Streak system
-STREAK_BONUS_TABLE = {
-    3:  50,
-    5:  150,
-    7:  300,
-    10: 750,
-    15: 2000,
-}
-
-# Perfect shot bonus (tembak tepat sasaran, tidak memantul)
-PERFECT_SHOT_BONUS = 25
-# Speed bonus (dari shot timer multiplier)
+# Konfigurasi & kalkulasi scoring ada di bubble_state (tanpa Qt); di-export ulang di sini
+from bubble_state import (
+    ScoreState, BASE_BUBBLE_SCORE, EXTRA_BUBBLE_BONUS, DROP_SCORE_PER,
+    LEVEL_MULTIPLIER, COMBO_DECAY_SHOTS, MAX_COMBO, STREAK_BONUS_TABLE,
+    PERFECT_SHOT_BONUS,
+)
 
 
 # ============================================================
@@ -70,13 +49,14 @@ class ScoreEvent:
 # SCORE MANAGER — Otak scoring
 # ============================================================
 
-class ScoreManager(QObject):
+class ScoreManager(QObject, ScoreState):
     """
     Mengelola semua aspek scoring:
-    - Kalkulasi poin
+    - Kalkulasi poin (ScoreState)
     - Combo tracking
     - Streak tracking
     - High score & leaderboard
+    Hook ScoreState diteruskan sebagai Qt signal.
     """
 
     score_updated    = Signal(object)       # FIX: object to avoid 32-bit int overflow
@@ -85,206 +65,53 @@ class ScoreManager(QObject):
     score_event      = Signal(object)       # ScoreEvent untuk popup
     highscore_beaten = Signal(object)       # FIX: object to avoid 32-bit int overflow
 
+    # Warna popup per jenis event
+    _EVENT_COLORS = {
+        'drop':  (100, 200, 255),
+        'power': (255, 80, 200),
+    }
+
     def __init__(self, save_dir: Path):
         super().__init__()
         self.save_dir = save_dir
         self.save_dir.mkdir(parents=True, exist_ok=True)
 
-        # State scoring
-        self._score = 0
-        self._high_score = 0
-        self._combo = 0
-        self._combo_no_match_count = 0
-        self._streak = 0          # Berapa tembakan berturut-turut menghasilkan match
-        self._total_shots = 0
-        self._total_pops  = 0
-        self._total_drops = 0
-        self._best_combo  = 0
-        self._level = 1
-
         # Load high score
         self._load_highscore()
 
-    # --- PUBLIC API ---
-
-    def reset(self):
-        self._score = 0
-        self._combo = 0
-        self._combo_no_match_count = 0
-        self._streak = 0
-        self._total_shots = 0
-        self._total_pops = 0
-        self._total_drops = 0
-        self._best_combo = 0
-        self.score_updated.emit(0)
-        self.combo_updated.emit(0)
-
-    def set_level(self, level: int):
-        self._level = level
-
-    def on_shot_fired(self):
-        """Dipanggil setiap kali bola ditembak"""
-        self._total_shots += 1
-        self._combo_no_match_count += 1
-        if self._combo_no_match_count >= COMBO_DECAY_SHOTS:
-            self._reset_combo()
-
-    def on_match(self, match_size: int, time_multiplier: float = 1.0,
-                  was_bounced: bool = False, x: float = 0, y: float = 0,
-                  rush_bonus: int = 0):
-        """
-        Dipanggil saat terjadi match.
-
-        Args:
-            match_size: Jumlah bubble yang cocok
-            time_multiplier: Multiplier dari shot timer
-            was_bounced: Apakah tembakan memantul (kurangi bonus)
-            x, y: Posisi event untuk popup
-            rush_bonus: Bonus dari rush mode
-        """
-        self._combo_no_match_count = 0
-        self._combo = min(self._combo + 1, MAX_COMBO)
-        self._streak += 1
-        self._total_pops += match_size
-
-        if self._combo > self._best_combo:
-            self._best_combo = self._combo
-
-        # Hitung skor dasar
-        base = BASE_BUBBLE_SCORE * match_size
-        base += EXTRA_BUBBLE_BONUS * max(0, match_size - 3)
-        base += self._level * LEVEL_MULTIPLIER
-        base += rush_bonus
-
-        if not was_bounced:
-            base += PERFECT_SHOT_BONUS
-
-        # Combo multiplier
-        combo_mult = 1.0 + (self._combo - 1) * 0.3  # +0.3x per combo
-        combo_mult = min(combo_mult, 4.0)
-
-        total_mult = round(time_multiplier * combo_mult, 1)
-        final = int(base * total_mult)
-
-        # Streak bonus
-        streak_bonus = STREAK_BONUS_TABLE.get(self._streak, 0)
-        final += streak_bonus
-
-        # Tentukan warna popup
-        if total_mult >= 3.0:
-            color = QColor(255, 50, 50)
-        elif total_mult >= 2.0:
-            color = QColor(255, 165, 0)
-        elif total_mult >= 1.5:
-            color = QColor(255, 220, 50)
-        else:
-            color = QColor(180, 255, 180)
-
-        label = self._build_label(match_size, total_mult, streak_bonus)
+    # --- ScoreState hooks ---
 
-        event = ScoreEvent(base, total_mult, 1, label, x, y, color)
-        event.total = final
+    def _notify_score(self, score: int):
+        self.score_updated.emit(score)
 
-        self._add_score(final)
-        self.combo_updated.emit(self._combo)
-        self.streak_updated.emit(self._streak)
-        self.score_event.emit(event)
+    def _notify_combo(self, combo: int):
+        self.combo_updated.emit(combo)
 
-        self.combo_updated.emit(self._combo)
+    def _notify_streak(self, streak: int):
+        self.streak_updated.emit(streak)
 
-    def on_drops(self, count: int, x: float = 0, y: float = 0):
-        """Poin untuk bubble yang jatuh"""
-        if count <= 0:
-            return
-        total = count * DROP_SCORE_PER
-        self._total_drops += count
-
-        event = ScoreEvent(total, 1.0, 1, f"DROP x{count}", x, y, QColor(100, 200, 255))
-        self._add_score(total)
-        self.score_event.emit(event)
-
-    def on_powerup_effect(self, destroyed: int, bonus_per: int, x: float = 0, y: float = 0, label: str = "POWER!"):
-        """Poin dari efek power-up"""
-        total = destroyed * bonus_per
-        event = ScoreEvent(total, 1.0, 1, label, x, y, QColor(255, 80, 200))
-        self._add_score(total)
+    def _notify_event(self, kind, base, mult, label, x, y, total):
+        rgb = self._EVENT_COLORS.get(kind)
+        if rgb is not None:
+            color = QColor(*rgb)
+        else:
+            # Tentukan warna popup
+            if mult >= 3.0:
+                color = QColor(255, 50, 50)
+            elif mult >= 2.0:
+                color = QColor(255, 165, 0)
+            elif mult >= 1.5:
+                color = QColor(255, 220, 50)
+            else:
+                color = QColor(180, 255, 180)
+        event = ScoreEvent(base, mult, 1, label, x, y, color)
+        event.total = total
         self.score_event.emit(event)
 
-    def _reset_combo(self):
-        if self._combo > 0:
-            self._combo = 0
-            self._streak = 0
-            self.combo_updated.emit(0)
-
-    def _build_label(self, match_size, mult, streak_bonus):
-        parts = []
-        if match_size >= 9:
-            parts.append("ULTRA!")
-        elif match_size >= 6:
-            parts.append("SUPER!")
-        elif match_size >= 3:
-            parts.append("NICE!")
-        if self._combo >= 5:
-            parts.append(f"COMBO x{self._combo}!")
-        elif self._combo >= 3:
-            parts.append(f"x{self._combo}")
-        if streak_bonus > 0:
-            parts.append(f"+STREAK")
-        if mult >= 2.5:
-            parts.append(f"⚡{mult}x")
-        return " ".join(parts) if parts else "GOOD"
-
-    def _add_score(self, amount: int):
-        self._score += amount
-        if self._score > self._high_score:
-            was_beaten = self._high_score > 0
-            self._high_score = self._score
-            if was_beaten:
-                self.highscore_beaten.emit(self._high_score)
-            self._save_highscore()
-        self.score_updated.emit(self._score)
-
-    # --- PROPERTIES ---
-
-    @property
-    def score(self): return self._score
-
-    @score.setter
-    def score(self, val):
-        self._score = val
-        self.score_updated.emit(val)
-
-    @property
-    def high_score(self): return self._high_score
-
-    @high_score.setter
-    def high_score(self, val):
-        self._high_score = val
-
-    @property
-    def combo(self): return self._combo
-
-    @property
-    def streak(self): return self._streak
-
-    @property
-    def total_shots(self): return self._total_shots
-
-    @property
-    def total_pops(self): return self._total_pops
-
-    @property
-    def best_combo(self): return self._best_combo
-
-    def get_stats(self):
-        return {
-            'score': self._score,
-            'high_score': self._high_score,
-            'total_shots': self._total_shots,
-            'total_pops': self._total_pops,
-            'total_drops': self._total_drops,
-            'best_combo': self._best_combo,
-        }
+    def _notify_high_score(self, was_beaten: bool):
+        if was_beaten:
+            self.highscore_beaten.emit(self._high_score)
+        self._save_highscore()
 
     # --- SAVE / LOAD ---
 
@@ -319,6 +146,9 @@ class ScoreManager(QObject):
 _active_popups: list = []
 _MAX_ACTIVE_POPUPS = 3          # Maksimal popup tampil bersamaan
 _POPUP_OFFSET_STEP = 28         # Geser vertikal tiap popup agar tidak tepat tumpuk
+_POPUP_MS = 800                 # Lama popup (dulu 50 frame x 16ms)
+_POPUP_RISE = 47                # Naik total (px), melambat di akhir
+_POPUP_FADE_START = 0.4         # Fade mulai dari 40% animasi, bukan langsung
 
 
 class ScorePopup:
@@ -363,43 +193,22 @@ class ScorePopup:
             scene.addItem(sub_text)
             self._items.append(sub_text)
 
-        # Animasi: naik + fade, selesai dalam ~50 frame (~800ms)
-        self._frame = 0
-        self._max_frame = 50
-        self._vy = -1.8          # kecepatan naik (pixel per frame)
-        self._timer = QTimer()
-        self._timer.setInterval(16)  # ~60fps
-        self._timer.timeout.connect(self._animate)
-        self._timer.start()
-
-    def _animate(self):
-        if self._dead:
-            return
-        self._frame += 1
-        # Fade mulai dari 40% animasi, bukan langsung
-        fade_start = 0.4
-        progress = self._frame / self._max_frame
-        if progress > fade_start:
-            opacity = max(0.0, 1.0 - (progress - fade_start) / (1.0 - fade_start))
-        else:
-            opacity = 1.0
-
+        # Animasi: naik + fade lewat tween scene, selesai dalam ~800ms
+        self._tweens = tweens_for(scene)
+        fade_delay = _POPUP_MS * _POPUP_FADE_START
         for item in self._items:
-            item.setY(item.y() + self._vy)
-            item.setOpacity(opacity)
-            # Perlambat naik seiring waktu
-        self._vy *= 0.97
-
-        if self._frame >= self._max_frame:
-            self._kill()
+            self._tweens.move(item, item.x(), item.y() - _POPUP_RISE, _POPUP_MS, OUT_QUAD)
+            self._tweens.fade(item, 0.0, _POPUP_MS - fade_delay, delay_ms=fade_delay)
+        self._tweens.fade(main_text, 0.0, _POPUP_MS - fade_delay, delay_ms=fade_delay,
+                          on_done=self._kill)
 
     def _kill(self):
         """Hapus popup dari scene dan dari pool global."""
         if self._dead:
             return
         self._dead = True
-        self._timer.stop()
         for item in self._items:
+            self._tweens.cancel(item)
             try:
                 if item.scene():
                     self.scene.removeItem(item)
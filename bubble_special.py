@@ -9,7 +9,6 @@ from __future__ import annotations
 import json
 import math
 import random
-from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -20,6 +19,8 @@ from PySide6.QtWidgets import (QGraphicsEllipseItem, QGraphicsTextItem,
                                 QGraphicsRectItem, QGraphicsLineItem,
                                 QGraphicsScene)
 
+from bubble_anim import scheduler_for
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # 1. BOSS BUBBLE
@@ -41,7 +42,7 @@ class BossBubble(QObject, QGraphicsEllipseItem):
     destroyed = Signal(object)   # emits self when HP reaches 0
 
     def __init__(self, color_index: int, x: float, y: float,
-                 hp: int = BOSS_MIN_HP, radius: int = 30):
+                 hp: int = BOSS_MIN_HP, radius: int = 30, frames=None):
         QObject.__init__(self)
         QGraphicsEllipseItem.__init__(self, -radius, -radius, radius * 2, radius * 2)
 
@@ -71,11 +72,11 @@ class BossBubble(QObject, QGraphicsEllipseItem):
         self._ring.setPen(QPen(QColor(255, 215, 0, 180), 3))
         self._ring.setZValue(-1)
 
+        # Pulse & flash jalan di jam animasi scene (GameScene.frames)
+        self._frames = frames if frames is not None else scheduler_for()
         self._pulse_frame = 0
-        self._pulse_timer = QTimer()
-        self._pulse_timer.setInterval(50)
-        self._pulse_timer.timeout.connect(self._pulse)
-        self._pulse_timer.start()
+        self._pulse_task = self._frames.add(self._pulse, interval_ms=50)
+        self._flash_task = None
 
     # ── Appearance ────────────────────────────────────────────────────────────
 
@@ -126,34 +127,34 @@ class BossBubble(QObject, QGraphicsEllipseItem):
 
         # Flash white on hit
         self.setPen(QPen(QColor(255, 255, 255), 4))
-        QTimer.singleShot(120, lambda: self.setPen(QPen(QColor(255, 215, 0), 3)))
+        if self._flash_task is not None:
+            self._flash_task.cancel()
+        self._flash_task = self._frames.after(
+            120, lambda: self.setPen(QPen(QColor(255, 215, 0), 3)))
 
         if self.current_hp <= 0:
-            self._pulse_timer.stop()
+            self.cleanup()
             self.destroyed.emit(self)
             return False
         return True
 
     def cleanup(self):
-        self._pulse_timer.stop()
+        self._pulse_task.cancel()
+        if self._flash_task is not None:
+            self._flash_task.cancel()
 
 
 # ── Boss spawn helper ─────────────────────────────────────────────────────────
 
-def should_spawn_boss(level: int, match_size: int) -> bool:
-    """
-    Probabilistic boss spawn: becomes more common at higher levels.
-    Only triggered after a match of 5+ bubbles.
-    """
-    if match_size < 5:
-        return False
-    base_chance = 5 + level * 2     # 7 % at lv1 → 25 % at lv10
-    return random.randint(1, 100) <= min(base_chance, 30)
+# Peluang spawn ada di bubble_state (tanpa Qt) supaya simulator headless
+# (bubble_sim) bisa memakai & men-tuning odds yang sama.
+from bubble_state import should_spawn_boss
 
 
-def create_boss_bubble(color_index: int, x: float, y: float, level: int) -> BossBubble:
+def create_boss_bubble(color_index: int, x: float, y: float, level: int,
+                       frames=None) -> BossBubble:
     hp = min(BOSS_MIN_HP + level // 2, BOSS_MAX_HP)
-    return BossBubble(color_index, x, y, hp=hp)
+    return BossBubble(color_index, x, y, hp=hp, frames=frames)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -266,98 +267,9 @@ def apply_colorblind_to_bubble(bubble_item, color_index: int):
 # ══════════════════════════════════════════════════════════════════════════════
 
 MAX_REPLAYS = 5        # Keep only the top N replays by score
-REPLAY_VERSION = 1
-
-
-class ReplayEvent:
-    """A single recorded action in a replay."""
-    __slots__ = ("tick", "kind", "data")
-
-    SHOT  = "shot"    # data: {"angle": float, "color": int}
-    SWAP  = "swap"    # data: {}
-    MATCH = "match"   # data: {"size": int, "score": int}
-    DROP  = "drop"    # data: {"count": int}
-
-    def __init__(self, tick: int, kind: str, data: dict):
-        self.tick = tick
-        self.kind = kind
-        self.data = data
-
-    def to_dict(self) -> dict:
-        return {"t": self.tick, "k": self.kind, "d": self.data}
 
-    @classmethod
-    def from_dict(cls, d: dict) -> "ReplayEvent":
-        return cls(d["t"], d["k"], d["d"])
-
-
-class ReplayRecorder:
-    """
-    Records every player action during a game session.
-    Attach it to GameScene events; call save() at session end.
-    """
-
-    def __init__(self):
-        self._events : list[ReplayEvent] = []
-        self._tick   : int  = 0
-        self._score  : int  = 0
-        self._level  : int  = 1
-        self._active : bool = False
-        self._seed   : int  = 0
-        self._start_ts: str = ""
-
-    def start(self, grid_seed: int = 0):
-        self._events   = []
-        self._tick     = 0
-        self._score    = 0
-        self._level    = 1
-        self._active   = True
-        self._seed     = grid_seed
-        self._start_ts = datetime.now().isoformat(timespec="seconds")
-
-    def stop(self):
-        self._active = False
-
-    def tick(self):
-        """Call once per game frame (16 ms)."""
-        if self._active:
-            self._tick += 1
-
-    def record_shot(self, angle: float, color: int):
-        if self._active:
-            self._events.append(ReplayEvent(self._tick, ReplayEvent.SHOT,
-                                            {"angle": round(angle, 2), "color": color}))
-
-    def record_swap(self):
-        if self._active:
-            self._events.append(ReplayEvent(self._tick, ReplayEvent.SWAP, {}))
-
-    def record_match(self, size: int, score: int):
-        if self._active:
-            self._score += score
-            self._events.append(ReplayEvent(self._tick, ReplayEvent.MATCH,
-                                            {"size": size, "score": score}))
-
-    def record_drop(self, count: int):
-        if self._active:
-            self._events.append(ReplayEvent(self._tick, ReplayEvent.DROP,
-                                            {"count": count}))
-
-    def set_level(self, level: int):
-        self._level = level
-
-    def set_final_score(self, score: int):
-        self._score = score
-
-    def to_dict(self) -> dict:
-        return {
-            "version":    REPLAY_VERSION,
-            "timestamp":  self._start_ts,
-            "score":      self._score,
-            "level":      self._level,
-            "seed":       self._seed,
-            "events":     [e.to_dict() for e in self._events],
-        }
+# Event & recorder tidak butuh Qt: ada di bubble_replay, bersama verifier headless
+from bubble_replay import REPLAY_VERSION, ReplayEvent, ReplayRecorder
 
 
 class ReplayPlayer:
@@ -0,0 +1,958 @@
+"""
+bubble_state.py — Headless game rules for Macan Bubble Shooter
+
+Everything that decides the outcome of a shot, with no PySide6 dependency:
+
+- Scoring formula, combo & streak (``ScoreState``; ``bubble_score.ScoreManager``
+  is the same class plus Qt signals, popups and high-score persistence)
+- Power-up charges & cooldowns (``PowerUpManager``; re-exported by ``bubble_power``)
+- ``GameState``: grid, shooter colors, drop counter, level, score, powers,
+  with a ``step(action)`` API covering shoot → attach → match → floating drop
+  → ceiling row
+- ``GameRng``: seeded per-subsystem random streams (grid, reload, ceiling,
+  power-up drops, boss spawns, particles)
+
+``GameScene`` owns a ``GameState`` and renders it. It passes itself as the
+state's listener, so every rule decision (cell removed, match, level up,
+ceiling row, ...) comes back as a hook call that the scene turns into items,
+particles, sounds and achievements. Headless callers (balance tools,
+replay checks) use the default no-op ``GameListener``.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+
+from bubble_grid import BubbleGrid
+from bubble_physics import predict_shot
+
+
+# ============================================================
+# KONFIGURASI SCORING
+# ============================================================
+
+# Poin dasar per bubble
+BASE_BUBBLE_SCORE   = 10
+# Bonus per extra bubble di atas 3
+EXTRA_BUBBLE_BONUS  = 15
+# Bonus drop (bubble melayang jatuh)
+DROP_SCORE_PER      = 20
+# Bonus per level
+LEVEL_MULTIPLIER    = 5
+
+# Combo system
+COMBO_DECAY_SHOTS   = 2    # Combo reset setelah N tembakan tanpa match
+MAX_COMBO           = 10   # Combo maksimum
+
+# Streak system
+STREAK_BONUS_TABLE = {
+    3:  50,
+    5:  150,
+    7:  300,
+    10: 750,
+    15: 2000,
+}
+
+# Perfect shot bonus (tembak tepat sasaran, tidak memantul)
+PERFECT_SHOT_BONUS = 25
+
+# Boss spawn: cuma setelah match >= BOSS_MIN_MATCH, chance naik per level
+BOSS_MIN_MATCH      = 5
+BOSS_BASE_CHANCE    = 5    # %
+BOSS_LEVEL_CHANCE   = 2    # % per level
+BOSS_MAX_CHANCE     = 30   # %
+
+
+# ============================================================
+# RNG — satu stream per subsistem
+# ============================================================
+
+class GameRng:
+    """
+    Seeded random streams, one ``random.Random`` per subsystem.
+
+    Every stream is derived from the game seed plus its name, so one seed
+    fully determines a game, and extra draws in one subsystem (more particles,
+    a boss roll) never shift the colors or drops of another. ``seed(n)``
+    reseeds all streams in place; objects that hold a stream (``BubbleGrid``)
+    keep the same instance.
+    """
+
+    STREAMS = ("grid", "reload", "ceiling", "powerup", "boss", "particles")
+
+    def __init__(self, seed: int = None):
+        for name in self.STREAMS:
+            setattr(self, name, random.Random())
+        self.seed(seed)
+
+    def seed(self, seed: int = None):
+        """Seed ulang semua stream; ``None`` = seed baru dari modul random."""
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed_value = seed
+        for name in self.STREAMS:
+            getattr(self, name).seed(f"{seed}:{name}")
+
+    def __repr__(self):
+        return f"GameRng({self.seed_value})"
+
+
+# ============================================================
+# SCORE STATE — Kalkulasi skor tanpa Qt
+# ============================================================
+
+class ScoreState:
+    """
+    Score, combo, streak and counters, plus the scoring formula.
+
+    Subclasses observe changes by overriding the ``_notify_*`` hooks
+    (``ScoreManager`` turns them into Qt signals and popups).
+    """
+
+    def __init__(self):
+        self._score = 0
+        self._high_score = 0
+        self._combo = 0
+        self._combo_no_match_count = 0
+        self._streak = 0          # Berapa tembakan berturut-turut menghasilkan match
+        self._total_shots = 0
+        self._total_pops  = 0
+        self._total_drops = 0
+        self._best_combo  = 0
+        self._level = 1
+        self.streak_bonus_table = STREAK_BONUS_TABLE   # Bisa diganti untuk balancing
+
+    # --- Hooks (no-op di headless) ---
+
+    def _notify_score(self, score: int):
+        pass
+
+    def _notify_combo(self, combo: int):
+        pass
+
+    def _notify_streak(self, streak: int):
+        pass
+
+    def _notify_event(self, kind: str, base: int, mult: float, label: str,
+                      x: float, y: float, total: int):
+        """kind: 'match' | 'drop' | 'power'"""
+        pass
+
+    def _notify_high_score(self, was_beaten: bool):
+        pass
+
+    # --- PUBLIC API ---
+
+    def reset(self):
+        self._score = 0
+        self._combo = 0
+        self._combo_no_match_count = 0
+        self._streak = 0
+        self._total_shots = 0
+        self._total_pops = 0
+        self._total_drops = 0
+        self._best_combo = 0
+        self._notify_score(0)
+        self._notify_combo(0)
+
+    def set_level(self, level: int):
+        self._level = level
+
+    def on_shot_fired(self):
+        """Dipanggil setiap kali bola ditembak"""
+        self._total_shots += 1
+        self._combo_no_match_count += 1
+        if self._combo_no_match_count >= COMBO_DECAY_SHOTS:
+            self._reset_combo()
+
+    def on_match(self, match_size: int, time_multiplier: float = 1.0,
+                  was_bounced: bool = False, x: float = 0, y: float = 0,
+                  rush_bonus: int = 0):
+        """
+        Dipanggil saat terjadi match.
+
+        Args:
+            match_size: Jumlah bubble yang cocok
+            time_multiplier: Multiplier dari shot timer
+            was_bounced: Apakah tembakan memantul (kurangi bonus)
+            x, y: Posisi event untuk popup
+            rush_bonus: Bonus dari rush mode
+        """
+        self._combo_no_match_count = 0
+        self._combo = min(self._combo + 1, MAX_COMBO)
+        self._streak += 1
+        self._total_pops += match_size
+
+        if self._combo > self._best_combo:
+            self._best_combo = self._combo
+
+        # Hitung skor dasar
+        base = BASE_BUBBLE_SCORE * match_size
+        base += EXTRA_BUBBLE_BONUS * max(0, match_size - 3)
+        base += self._level * LEVEL_MULTIPLIER
+        base += rush_bonus
+
+        if not was_bounced:
+            base += PERFECT_SHOT_BONUS
+
+        # Combo multiplier
+        combo_mult = 1.0 + (self._combo - 1) * 0.3  # +0.3x per combo
+        combo_mult = min(combo_mult, 4.0)
+
+        total_mult = round(time_multiplier * combo_mult, 1)
+        final = int(base * total_mult)
+
+        # Streak bonus
+        streak_bonus = self.streak_bonus_table.get(self._streak, 0)
+        final += streak_bonus
+
+        label = self._build_label(match_size, total_mult, streak_bonus)
+
+        self._add_score(final)
+        self._notify_combo(self._combo)
+        self._notify_streak(self._streak)
+        self._notify_event('match', base, total_mult, label, x, y, final)
+
+        self._notify_combo(self._combo)
+
+    def on_drops(self, count: int, x: float = 0, y: float = 0):
+        """Poin untuk bubble yang jatuh"""
+        if count <= 0:
+            return
+        total = count * DROP_SCORE_PER
+        self._total_drops += count
+
+        self._add_score(total)
+        self._notify_event('drop', total, 1.0, f"DROP x{count}", x, y, total)
+
+    def on_powerup_effect(self, destroyed: int, bonus_per: int, x: float = 0, y: float = 0, label: str = "POWER!"):
+        """Poin dari efek power-up"""
+        total = destroyed * bonus_per
+        self._add_score(total)
+        self._notify_event('power', total, 1.0, label, x, y, total)
+
+    def _reset_combo(self):
+        if self._combo > 0:
+            self._combo = 0
+            self._streak = 0
+            self._notify_combo(0)
+
+    def _build_label(self, match_size, mult, streak_bonus):
+        parts = []
+        if match_size >= 9:
+            parts.append("ULTRA!")
+        elif match_size >= 6:
+            parts.append("SUPER!")
+        elif match_size >= 3:
+            parts.append("NICE!")
+        if self._combo >= 5:
+            parts.append(f"COMBO x{self._combo}!")
+        elif self._combo >= 3:
+            parts.append(f"x{self._combo}")
+        if streak_bonus > 0:
+            parts.append(f"+STREAK")
+        if mult >= 2.5:
+            parts.append(f"⚡{mult}x")
+        return " ".join(parts) if parts else "GOOD"
+
+    def _add_score(self, amount: int):
+        self._score += amount
+        if self._score > self._high_score:
+            was_beaten = self._high_score > 0
+            self._high_score = self._score
+            self._notify_high_score(was_beaten)
+        self._notify_score(self._score)
+
+    # --- PROPERTIES ---
+
+    @property
+    def score(self): return self._score
+
+    @score.setter
+    def score(self, val):
+        self._score = val
+        self._notify_score(val)
+
+    @property
+    def high_score(self): return self._high_score
+
+    @high_score.setter
+    def high_score(self, val):
+        self._high_score = val
+
+    @property
+    def combo(self): return self._combo
+
+    @property
+    def streak(self): return self._streak
+
+    @property
+    def total_shots(self): return self._total_shots
+
+    @property
+    def total_pops(self): return self._total_pops
+
+    @property
+    def total_drops(self): return self._total_drops
+
+    @property
+    def best_combo(self): return self._best_combo
+
+    def snapshot(self) -> dict:
+        """State skor yang memengaruhi aturan (tanpa high score), JSON-friendly."""
+        return {
+            'score': self._score,
+            'combo': self._combo,
+            'combo_no_match': self._combo_no_match_count,
+            'streak': self._streak,
+            'shots': self._total_shots,
+            'pops': self._total_pops,
+            'drops': self._total_drops,
+            'best_combo': self._best_combo,
+            'level': self._level,
+        }
+
+    def restore(self, data: dict):
+        self._score = data['score']
+        self._combo = data['combo']
+        self._combo_no_match_count = data['combo_no_match']
+        self._streak = data['streak']
+        self._total_shots = data['shots']
+        self._total_pops = data['pops']
+        self._total_drops = data['drops']
+        self._best_combo = data['best_combo']
+        self._level = data['level']
+
+    def get_stats(self):
+        return {
+            'score': self._score,
+            'high_score': self._high_score,
+            'total_shots': self._total_shots,
+            'total_pops': self._total_pops,
+            'total_drops': self._total_drops,
+            'best_combo': self._best_combo,
+        }
+
+
+# ============================================================
+# POWER-UP CHARGES — dipakai GameState & bubble_power
+# ============================================================
+
+class PowerUpType:
+    """Enum-like class untuk tipe power-up"""
+    BOMB = "bomb"           # Meledakkan area 3x3
+    LASER = "laser"         # Tembakan laser vertikal
+    RAINBOW = "rainbow"     # Bubble rainbow (cocok dengan warna apapun)
+    FIREBALL = "fireball"   # Tembakan yang menembus dan meledak
+    FREEZE = "freeze"       # Freeze drop counter untuk 5 tembakan
+
+class PowerUp:
+    """
+    Base class untuk semua power-up.
+    Setiap power-up memiliki cooldown dan durasi.
+    """
+    def __init__(self, power_type, cooldown=10):
+        self.type = power_type
+        self.cooldown = cooldown  # Berapa tembakan hingga bisa digunakan lagi
+        self.current_cooldown = 0
+        self.active = False
+        self.charges = 0  # Jumlah charges tersedia
+
+    def can_use(self):
+        """Cek apakah power bisa digunakan"""
+        return self.charges > 0 and self.current_cooldown == 0
+
+    def use(self):
+        """Gunakan power"""
+        if self.can_use():
+            self.charges -= 1
+            self.current_cooldown = self.cooldown
+            self.active = True
+            return True
+        return False
+
+    def update_cooldown(self):
+        """Update cooldown setiap tembakan"""
+        if self.current_cooldown > 0:
+            self.current_cooldown -= 1
+
+    def add_charge(self, amount=1):
+        """Tambah charge"""
+        self.charges += amount
+
+class PowerUpManager:
+    """
+    Charge, cooldown & drop chance semua power-up dalam game.
+    Versi dengan warna/visual: bubble_power.PowerUpManager.
+    """
+
+    def __init__(self):
+        # Dictionary untuk menyimpan semua power-up yang tersedia
+        self.powers = {
+            PowerUpType.BOMB: PowerUp(PowerUpType.BOMB, cooldown=8),
+            PowerUpType.LASER: PowerUp(PowerUpType.LASER, cooldown=10),
+            PowerUpType.RAINBOW: PowerUp(PowerUpType.RAINBOW, cooldown=6),
+            PowerUpType.FIREBALL: PowerUp(PowerUpType.FIREBALL, cooldown=12),
+            PowerUpType.FREEZE: PowerUp(PowerUpType.FREEZE, cooldown=15),
+        }
+
+        # Visual indicators untuk power-up
+        self.power_icons = {}
+
+        # Chance untuk drop power-up setelah match (dalam persen)
+        self.drop_chance = 15  # 15% chance per match 3+
+
+    def update_all_cooldowns(self):
+        """Update cooldown semua power setiap tembakan"""
+        for power in self.powers.values():
+            power.update_cooldown()
+
+    def try_drop_powerup(self, match_size, rng=None):
+        """
+        Coba drop power-up berdasarkan ukuran match.
+        Semakin besar match, semakin besar chance.
+
+        Args:
+            match_size: Jumlah bubble yang match
+            rng: Sumber random (default: modul random global)
+
+        Returns:
+            PowerUpType atau None
+        """
+        if match_size < 3:
+            return None
+        rng = rng or random
+
+        # Bonus chance untuk match besar
+        adjusted_chance = self.drop_chance + (match_size - 3) * 5
+        adjusted_chance = min(adjusted_chance, 50)  # Max 50%
+
+        if rng.randint(1, 100) <= adjusted_chance:
+            # Random power-up
+            power_type = rng.choice(list(PowerUpType.__dict__.values()))
+            if isinstance(power_type, str) and not power_type.startswith('_'):
+                return power_type
+
+        return None
+
+    def add_powerup_charge(self, power_type):
+        """Tambah charge untuk power-up tertentu"""
+        if power_type in self.powers:
+            self.powers[power_type].add_charge(1)
+            return True
+        return False
+
+    def use_power(self, power_type):
+        """Aktifkan power-up"""
+        if power_type in self.powers:
+            return self.powers[power_type].use()
+        return False
+
+    def get_power_info(self, power_type):
+        """Dapatkan info power (charges, cooldown, dll)"""
+        if power_type in self.powers:
+            power = self.powers[power_type]
+            return {
+                'charges': power.charges,
+                'cooldown': power.current_cooldown,
+                'can_use': power.can_use()
+            }
+        return None
+
+    def snapshot(self) -> dict:
+        """{type: [charges, cooldown]} untuk replay / save."""
+        return {t: [p.charges, p.current_cooldown] for t, p in self.powers.items()}
+
+    def restore(self, data: dict):
+        for t, (charges, cooldown) in data.items():
+            if t in self.powers:
+                self.powers[t].charges = charges
+                self.powers[t].current_cooldown = cooldown
+
+    def get_power_description(self, power_type):
+        """Dapatkan deskripsi power-up"""
+        descriptions = {
+            PowerUpType.BOMB: "💣 BOMB\nMeledakkan area 3x3\ndi sekitar impact",
+            PowerUpType.LASER: "⚡ LASER\nTembakan laser vertikal\nmenghancurkan 1 kolom",
+            PowerUpType.RAINBOW: "🌈 RAINBOW\nBubble universal\ncocok dengan warna apapun",
+            PowerUpType.FIREBALL: "🔥 FIREBALL\nTembakan penetrasi\nmeledak saat berhenti",
+            PowerUpType.FREEZE: "❄️ FREEZE\nFreeze drop counter\nuntuk 5 tembakan",
+        }
+        return descriptions.get(power_type, "Unknown Power")
+
+
+# ============================================================
+# BOSS SPAWN
+# ============================================================
+
+def should_spawn_boss(level: int, match_size: int, rng=None,
+                      max_chance: int = BOSS_MAX_CHANCE) -> bool:
+    """
+    Probabilistic boss spawn: becomes more common at higher levels.
+    Only triggered after a match of 5+ bubbles.
+    """
+    if match_size < BOSS_MIN_MATCH:
+        return False
+    base_chance = BOSS_BASE_CHANCE + level * BOSS_LEVEL_CHANCE     # 7 % at lv1 → 25 % at lv10
+    return (rng or random).randint(1, 100) <= min(base_chance, max_chance)
+
+
+# ============================================================
+# GAME STATE — Aturan main tanpa Qt
+# ============================================================
+
+# Area & bonus per power-up efek: (radius cell, bonus per bubble, label)
+_POWER_EFFECTS = {
+    PowerUpType.BOMB:     (1, 15, "💣 BOMB!"),
+    PowerUpType.LASER:    (None, 20, "⚡ LASER!"),
+    PowerUpType.FIREBALL: (2, 25, "🔥 FIREBALL!"),
+}
+
+
+def arena_geometry(rows: int, cols: int, radius: float, padding: int = 10) -> tuple:
+    """(scene_width, scene_height, grid_offset_x) — layout arena GameScene (16:9, grid di tengah)."""
+    grid_width = int(cols * radius * 2 + radius * 2 + padding * 2)
+    scene_height = int(rows * radius * 1.732 + radius) + 220
+    scene_width = int(scene_height * (16 / 9))
+    return scene_width, scene_height, (scene_width - grid_width) // 2
+
+
+class GameListener:
+    """
+    Hooks GameState calls while it resolves a shot, in rule order.
+    All no-ops here; GameScene implements them to drive the visuals.
+    """
+
+    def state_attached(self, row: int, col: int, color: int): pass
+    def state_recolored(self, row: int, col: int, color: int): pass
+    def state_cells_removed(self, cells: list): pass                    # sekali per kelompok cell yang hilang
+    def state_powerup_gained(self, power_type: str): pass
+    def state_matched(self, matched: set, x: float, y: float): pass     # setelah skor, sebelum cell dikosongkan
+    def state_no_match(self): pass
+    def state_power_effect(self, power_type: str, row: int, col: int, destroyed: int): pass
+    def state_floating_removed(self, count: int): pass                  # dipanggil juga kalau count == 0
+    def state_neighbors_dropped(self, count: int): pass
+    def state_powers_changed(self): pass
+    def state_drop_counter(self, shots_until_drop: int): pass
+    def state_ceiling_row(self, new_row: list): pass
+    def state_level_up(self, level: int): pass
+
+
+class Shoot:
+    """Action: fire at ``angle`` degrees (90 = straight up)."""
+    __slots__ = ("angle", "time_multiplier", "rush_bonus")
+
+    def __init__(self, angle: float, time_multiplier: float = 1.0, rush_bonus: int = 0):
+        self.angle = angle
+        self.time_multiplier = time_multiplier
+        self.rush_bonus = rush_bonus
+
+
+class Swap:
+    """Action: swap current and next shooter color."""
+    __slots__ = ()
+
+
+class UsePower:
+    """Action: activate a power-up charge for the next shot."""
+    __slots__ = ("power_type",)
+
+    def __init__(self, power_type: str):
+        self.power_type = power_type
+
+
+class ShotResult:
+    """What one landed shot did to the board."""
+    __slots__ = ("cell", "color", "matched", "dropped", "destroyed",
+                 "powerup", "ceiling_due", "game_over", "score_delta")
+
+    def __init__(self):
+        self.cell = None
+        self.color = None
+        self.matched = 0       # Bubble yang ikut match (0 kalau < 3)
+        self.dropped = 0       # Bubble melayang yang jatuh
+        self.destroyed = 0     # Bubble yang hancur kena power-up
+        self.powerup = None    # PowerUpType yang didapat dari match
+        self.ceiling_due = False
+        self.game_over = False
+        self.score_delta = 0
+
+
+class GameState:
+    """
+    Complete rule state of one game: grid, shooter colors, drop counter,
+    freeze, level, score and power charges.
+
+    ``step(action)`` plays a whole turn headlessly. GameScene instead splits
+    a shot into ``fire`` (when the bubble leaves the shooter) and ``land``
+    (when the animated flight reaches the predicted contact), and calls
+    ``add_ceiling_row`` after its short delay.
+    """
+
+    def __init__(self, rows: int = 14, cols: int = 20, radius: float = 22,
+                 num_colors: int = 6, shots_per_drop: int = 7,
+                 score: ScoreState = None, powers: PowerUpManager = None,
+                 rng: GameRng = None, listener: GameListener = None, engine=None,
+                 grid_offset_x: float = None, shooter_pos: tuple = None,
+                 scene_height: float = None):
+        self.rng = rng if rng is not None else GameRng()
+        self.num_colors = num_colors
+        self.shots_per_drop = shots_per_drop
+
+        # Geometri arena: default sama persis dengan layout GameScene
+        scene_w, scene_h, offset_x = arena_geometry(rows, cols, radius)
+        self.scene_height = scene_h if scene_height is None else scene_height
+        if grid_offset_x is None:
+            grid_offset_x = offset_x
+        if shooter_pos is None:
+            shooter_pos = (scene_w / 2, scene_h - 130)
+        self.shooter_x, self.shooter_y = shooter_pos
+
+        self.grid = BubbleGrid(rows, cols, radius, num_colors, engine=engine, rng=self.rng.grid)
+        self.grid.grid_offset_x = grid_offset_x
+        self.current_color = self.rng.reload.randint(0, num_colors - 1)
+        self.next_color = self.rng.reload.randint(0, num_colors - 1)
+        self.shot_color = None
+        self.shots_until_drop = shots_per_drop
+        self.freeze_shots_remaining = 0
+        self.level = 1
+        self.level_threshold = 1000
+        self.active_power = None
+        self.score = score if score is not None else ScoreState()
+        self.powers = powers if powers is not None else PowerUpManager()
+        self.listener = listener or GameListener()
+        self.over = False
+
+    # --- Setup ---
+
+    def reset(self):
+        """Papan baru untuk game baru (skor ikut di-reset)."""
+        self.grid.initialize_grid()
+        self.shots_until_drop = self.shots_per_drop
+        self.level = 1
+        self.over = False
+        self.freeze_shots_remaining = 0
+        self.active_power = None
+        self.current_color = self.rng.reload.randint(0, self.num_colors - 1)
+        self.next_color = self.rng.reload.randint(0, self.num_colors - 1)
+        self.score.reset()
+        self.score.set_level(1)
+
+    def snapshot(self) -> dict:
+        """Seluruh state aturan (tanpa rng) sebagai dict JSON-friendly."""
+        return {
+            'grid': self.grid.grid,
+            'current_color': self.current_color,
+            'next_color': self.next_color,
+            'shots_until_drop': self.shots_until_drop,
+            'freeze_shots_remaining': self.freeze_shots_remaining,
+            'level': self.level,
+            'active_power': self.active_power,
+            'score': self.score.snapshot(),
+            'powers': self.powers.snapshot(),
+        }
+
+    def restore(self, data: dict):
+        self.grid.grid = data['grid']
+        self.current_color = data['current_color']
+        self.next_color = data['next_color']
+        self.shots_until_drop = data['shots_until_drop']
+        self.freeze_shots_remaining = data['freeze_shots_remaining']
+        self.level = data['level']
+        self.active_power = data['active_power']
+        self.score.restore(data['score'])
+        self.powers.restore(data['powers'])
+        self.over = False
+
+    def reload(self):
+        self.current_color = self.next_color
+        self.next_color = self.rng.reload.randint(0, self.num_colors - 1)
+
+    def swap_colors(self):
+        self.current_color, self.next_color = self.next_color, self.current_color
+
+    # --- Geometri ---
+
+    @property
+    def wall_bounds(self) -> tuple:
+        """Batas pantul kiri/kanan dalam area grid (simetris)."""
+        grid = self.grid
+        wall_left  = grid.grid_offset_x + grid.radius
+        wall_right = grid.grid_offset_x + (grid.cols * grid.radius * 2 + grid.radius * 2) - grid.radius
+        return wall_left, wall_right
+
+    def launch_point(self, angle: float, start_dist: float = 40) -> tuple:
+        """Posisi awal & arah bubble yang ditembak dengan sudut ``angle``."""
+        rad = math.radians(angle)
+        return (self.shooter_x + math.cos(rad) * start_dist,
+                self.shooter_y - math.sin(rad) * start_dist,
+                math.cos(rad), -math.sin(rad))
+
+    def predict(self, x: float, y: float, dir_x: float, dir_y: float):
+        wall_left, wall_right = self.wall_bounds
+        return predict_shot(self.grid, x, y, dir_x, dir_y, wall_left, wall_right)
+
+    def _popup_x(self) -> float:
+        grid = self.grid
+        return grid.grid_offset_x + (grid.cols * grid.radius * 2) / 2
+
+    # --- Turn phases ---
+
+    def fire(self, angle: float):
+        """Bubble lepas dari shooter: hitung skor tembakan, reload, prediksi lintasan."""
+        self.score.on_shot_fired()
+        self.shot_color = self.current_color
+        x, y, dx, dy = self.launch_point(angle)
+        self.reload()
+        return self.predict(x, y, dx, dy)
+
+    def land(self, cell, x: float, y: float, time_multiplier: float = 1.0,
+             was_bounced: bool = False, rush_bonus: int = 0):
+        """
+        Tempel bubble di ``cell`` (atau cell kosong terdekat dari (x, y)) lalu
+        jalankan semua aturan: rainbow, power-up, match, bubble jatuh,
+        cooldown, drop counter dan cek game over. Return ShotResult, atau None
+        kalau grid penuh.
+        """
+        grid = self.grid
+        listener = self.listener
+        if cell is None or grid.get(*cell) is not None:
+            cell = grid.nearest_empty_cell(x, y)
+        if cell is None:
+            return None
+
+        result = ShotResult()
+        score_before = self.score.score
+        best_row, best_col = cell
+        grid.set(best_row, best_col, self.shot_color)
+        listener.state_attached(best_row, best_col, self.shot_color)
+
+        if grid.get(best_row, best_col) == -1:
+            color_counts = {}
+            for nr, nc in grid.get_neighbors(best_row, best_col):
+                neighbor_color = grid.get(nr, nc)
+                if neighbor_color is not None and neighbor_color != -1:
+                    color_counts[neighbor_color] = color_counts.get(neighbor_color, 0) + 1
+
+            if color_counts:
+                most_common_color = max(color_counts, key=color_counts.get)
+                grid.set(best_row, best_col, most_common_color)
+                listener.state_recolored(best_row, best_col, most_common_color)
+
+        if self.active_power in _POWER_EFFECTS:
+            power_type, self.active_power = self.active_power, None
+            result.destroyed = self.apply_power_effect(power_type, best_row, best_col)
+        else:
+            self.check_matches(best_row, best_col, time_multiplier, was_bounced,
+                               rush_bonus, result)
+
+        self.powers.update_all_cooldowns()
+        listener.state_powers_changed()
+
+        if self.freeze_shots_remaining > 0:
+            self.freeze_shots_remaining -= 1
+        else:
+            self.shots_until_drop -= 1
+            listener.state_drop_counter(self.shots_until_drop)
+
+            if self.shots_until_drop <= 0:
+                result.ceiling_due = True
+                self.shots_until_drop = self.shots_per_drop
+                listener.state_drop_counter(self.shots_until_drop)
+
+        result.cell = (best_row, best_col)
+        result.color = grid.get(best_row, best_col)
+        result.game_over = self.is_game_over()
+        result.score_delta = self.score.score - score_before
+        return result
+
+    # --- Rules ---
+
+    def check_matches(self, row, col, time_multiplier=1.0, was_bounced=False,
+                      rush_bonus=0, result: ShotResult = None) -> bool:
+        grid = self.grid
+        matched = set(grid.find_matching(row, col))
+
+        if len(matched) >= 3:
+            power_type = self.powers.try_drop_powerup(len(matched), self.rng.powerup)
+            # try_drop_powerup bisa memilih atribut kelas (__module__ dll) —
+            # cuma tipe yang benar-benar ada di manager yang dihitung
+            if power_type and self.powers.add_powerup_charge(power_type):
+                self.listener.state_powerup_gained(power_type)
+            else:
+                power_type = None
+
+            mx, my = grid.get_position(row, col)
+            self.score.on_match(
+                match_size=len(matched),
+                time_multiplier=time_multiplier,
+                was_bounced=was_bounced,
+                x=mx, y=my,
+                rush_bonus=rush_bonus,
+            )
+            self.listener.state_matched(matched, mx, my)
+
+            for r, c in matched:
+                grid.set(r, c, None)
+            self.listener.state_cells_removed(list(matched))
+
+            dropped = self.remove_floating_bubbles()
+            self.check_level_up()
+            if result is not None:
+                result.matched = len(matched)
+                result.powerup = power_type
+                result.dropped = dropped
+            return True
+
+        self.listener.state_no_match()
+        dropped = self.check_and_drop_neighbors(row, col)
+        if result is not None:
+            result.dropped = dropped
+        return False
+
+    def apply_power_effect(self, power_type, center_row, center_col) -> int:
+        """Bomb (3x3), laser (satu kolom) atau fireball (5x5). Return jumlah bubble hancur."""
+        grid = self.grid
+        reach, bonus, label = _POWER_EFFECTS[power_type]
+        destroyed = []
+        if reach is None:
+            for row in range(grid.rows):
+                if center_col < grid.cols and grid.get(row, center_col) is not None:
+                    destroyed.append((row, center_col))
+                    grid.set(row, center_col, None)
+        else:
+            for dr in range(-reach, reach + 1):
+                for dc in range(-reach, reach + 1):
+                    r, c = center_row + dr, center_col + dc
+                    if grid.in_bounds(r, c):
+                        if grid.get(r, c) is not None:
+                            destroyed.append((r, c))
+                            grid.set(r, c, None)
+        if destroyed:
+            self.listener.state_cells_removed(destroyed)
+
+        self.score.on_powerup_effect(len(destroyed), bonus, self._popup_x(),
+                                     self.scene_height * 0.4, label)
+        self.listener.state_power_effect(power_type, center_row, center_col, len(destroyed))
+        self.remove_floating_bubbles()
+        return len(destroyed)
+
+    def remove_floating_bubbles(self) -> int:
+        grid = self.grid
+        # Incremental: cuma komponen di sekitar cell yang baru berubah yang dicek
+        floating_positions = grid.pop_floating()
+
+        for row, col in floating_positions:
+            grid.set(row, col, None)
+        if floating_positions:
+            self.listener.state_cells_removed(list(floating_positions))
+
+        dropped_count = len(floating_positions)
+        if dropped_count > 0:
+            # Popup di tengah horizontal arena, sepertiga atas scene
+            self.score.on_drops(dropped_count, self._popup_x(), self.scene_height * 0.35)
+        self.listener.state_floating_removed(dropped_count)
+        return dropped_count
+
+    def check_and_drop_neighbors(self, impact_row, impact_col) -> int:
+        """Flood-fill konektivitas ke langit-langit dihitung SEKALI di luar
+        loop neighbor; cluster tetangga yang melayang ikut jatuh."""
+        grid = self.grid
+        neighbors = grid.get_neighbors(impact_row, impact_col)
+        total_dropped = 0
+        last_x, last_y = grid.get_position(impact_row, impact_col)
+
+        floating = set(grid.pop_floating())
+        removed = []
+
+        for nr, nc in neighbors:
+            if grid.get(nr, nc) is not None and (nr, nc) in floating:
+                to_drop = set(grid.find_connected_cluster(nr, nc))
+
+                for dr, dc in to_drop:
+                    if grid.get(dr, dc) is not None:
+                        last_x, last_y = grid.get_position(dr, dc)
+                        grid.set(dr, dc, None)
+                        removed.append((dr, dc))
+                        total_dropped += 1
+
+        if removed:
+            self.listener.state_cells_removed(removed)
+
+        # Satu popup drop di akhir, bukan per-bubble
+        if total_dropped > 0:
+            self.score.on_drops(total_dropped, last_x, last_y)
+            self.listener.state_neighbors_dropped(total_dropped)
+        return total_dropped
+
+    def check_level_up(self):
+        if self.score.score >= self.level_threshold * self.level:
+            self.level += 1
+            self.score.set_level(self.level)
+            self.listener.state_level_up(self.level)
+
+    def add_ceiling_row(self) -> bool:
+        """Turunkan langit-langit satu baris. False = baris terbawah sudah terisi (game over)."""
+        grid = self.grid
+        if grid.row_has_bubbles(grid.rows - 1):
+            self.over = True
+            return False
+
+        new_row = [self.rng.ceiling.randint(0, self.num_colors - 1) for _ in range(grid.cols)]
+        grid.push_row(new_row)
+        self.listener.state_ceiling_row(new_row)
+        return True
+
+    def activate_power(self, power_type) -> bool:
+        if not self.powers.use_power(power_type):
+            return False
+
+        self.active_power = power_type
+        if power_type == PowerUpType.FREEZE:
+            # Efeknya langsung jalan, gak nunggu tembakan
+            self.freeze_shots_remaining = 5
+            self.active_power = None
+        elif power_type == PowerUpType.RAINBOW:
+            self.current_color = -1
+            self.active_power = None
+        return True
+
+    def is_game_over(self) -> bool:
+        """Ada bubble (bukan reservasi boss) yang sudah melewati batas di atas shooter."""
+        limit_y = self.shooter_y - 50
+        grid = self.grid
+        for row, col, value in grid.iter_filled():
+            if value != -3 and grid.get_position(row, col)[1] > limit_y:
+                return True
+        return False
+
+    # --- Headless turn ---
+
+    def step(self, action) -> ShotResult:
+        """
+        Play one action to completion. ``Shoot`` flies straight to the
+        predicted contact, lands, and drops the ceiling right away when the
+        counter runs out. ``Swap`` / ``UsePower`` return None.
+        """
+        if self.over:
+            return None
+        if isinstance(action, Swap):
+            self.swap_colors()
+            return None
+        if isinstance(action, UsePower):
+            self.activate_power(action.power_type)
+            return None
+
+        path = self.fire(action.angle)
+        cx, cy = path.contact
+        result = self.land(path.cell, cx, cy, action.time_multiplier,
+                           len(path.points) > 2, action.rush_bonus)
+        if result is None:
+            self.over = True
+            return None
+        if result.game_over:
+            self.over = True
+        elif result.ceiling_due and not self.add_ceiling_row():
+            result.game_over = True
+        return result
@@ -13,6 +13,8 @@ from PySide6.QtWidgets import QGraphicsRectItem, QGraphicsTextItem
 from PySide6.QtGui import QColor, QBrush, QPen, QLinearGradient, QFont
 from PySide6.QtCore import Qt, QRectF
 
+from bubble_anim import scheduler_for
+
 
 # ============================================================
 # KONFIGURASI TIMER
@@ -42,16 +44,35 @@ class ShotTimer(QObject):
     time_up = Signal()            # Waktu habis → penalti
     multiplier_changed = Signal(float)  # Multiplier berubah
 
-    def __init__(self, time_limit=SHOT_TIME_LIMIT):
+    def __init__(self, time_limit=SHOT_TIME_LIMIT, frames=None):
         super().__init__()
         self.time_limit = time_limit
         self.time_remaining = time_limit
         self.running = False
         self.rush_mode = False
 
-        self._timer = QTimer()
-        self._timer.setInterval(TICK_INTERVAL_MS)
-        self._timer.timeout.connect(self._on_tick)
+        # Tick 100ms diambil dari jam animasi scene, bukan QTimer sendiri
+        self.frames = frames
+        self._task = None
+
+    def attach(self, frames):
+        """Pindah ke scheduler ``frames`` (GameScene.frames)."""
+        was_ticking = self._task is not None
+        self._stop_ticking()
+        self.frames = frames
+        if was_ticking:
+            self._start_ticking()
+
+    def _start_ticking(self):
+        self._stop_ticking()
+        # FrameScheduler punya __len__: scheduler kosong itu falsy, jadi cek None
+        frames = self.frames if self.frames is not None else scheduler_for()
+        self._task = frames.add(self._on_tick, interval_ms=TICK_INTERVAL_MS)
+
+    def _stop_ticking(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
 
     def start(self, rush_mode=False):
         """Mulai timer tembakan"""
@@ -59,12 +80,12 @@ class ShotTimer(QObject):
         self.time_limit = RUSH_TIME_LIMIT if rush_mode else SHOT_TIME_LIMIT
         self.time_remaining = self.time_limit
         self.running = True
-        self._timer.start()
+        self._start_ticking()
         self.tick.emit(self.time_remaining)
 
     def stop(self):
         """Hentikan timer (setelah tembakan)"""
-        self._timer.stop()
+        self._stop_ticking()
         self.running = False
 
     def reset(self):
@@ -73,17 +94,17 @@ class ShotTimer(QObject):
         self.time_remaining = self.time_limit
 
     def pause(self):
-        self._timer.stop()
+        self._stop_ticking()
 
     def resume(self):
         if self.running:
-            self._timer.start()
+            self._start_ticking()
 
     def _on_tick(self):
         self.time_remaining -= TICK_INTERVAL_MS / 1000.0
         if self.time_remaining <= 0:
             self.time_remaining = 0
-            self._timer.stop()
+            self._stop_ticking()
             self.running = False
             self.time_up.emit()
         self.tick.emit(self.time_remaining)
@@ -191,6 +212,7 @@ class CountdownFlash:
         self.cx = scene_width / 2
         self.cy = scene_height / 2
         self._items = []
+        self._clear_task = None
 
     def flash(self, text: str, color: QColor = QColor(255, 80, 80)):
         """Tampilkan teks flash sesaat"""
@@ -211,8 +233,10 @@ class CountdownFlash:
         self.scene.addItem(label)
         self._items.append(label)
 
-        # Auto-hapus setelah 600ms
-        QTimer.singleShot(600, self._clear)
+        # Auto-hapus setelah 600ms (flash sebelumnya tidak boleh ikut menghapus)
+        if self._clear_task is not None:
+            self._clear_task.cancel()
+        self._clear_task = scheduler_for(self.scene).after(600, self._clear)
 
     def _clear(self):
         for item in self._items:
@@ -372,6 +396,12 @@ def get_game_timer() -> GameTimer:
 def reset_all_timers():
     """Reset semua timer ke kondisi awal (dipanggil saat new game)"""
     global _shot_timer, _rush_manager, _game_timer
+    # Task tick timer lama dipegang scene.frames — harus dibatalkan, kalau tidak
+    # timer lama tetap jalan dan time_up-nya menembak ke game baru
+    if _shot_timer is not None:
+        _shot_timer.stop()
+    if _game_timer is not None:
+        _game_timer.stop()
     _shot_timer = ShotTimer()
     _rush_manager = RushModeManager()
     _game_timer = GameTimer()
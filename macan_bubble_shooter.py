@@ -1,4 +1,8 @@
 import sys
+# --profile-startup: profiler dipasang sebelum import lain supaya waktu import ikut terukur
+if __name__ == "__main__" and "--profile-startup" in sys.argv:
+    import bubble_profile
+    bubble_profile.start(sys.argv)
 import os
 import math
 import random
@@ -7,18 +11,19 @@ import base64
 from pathlib import Path
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QPushButton, 
                                QLabel, QVBoxLayout, QHBoxLayout, QGraphicsView, 
-                               QGraphicsScene, QGraphicsEllipseItem, QGraphicsPolygonItem,
+                               QGraphicsScene, QGraphicsEllipseItem, QGraphicsPixmapItem, QGraphicsPolygonItem,
                                QGraphicsRectItem, QDialog, QGraphicsDropShadowEffect, QStackedWidget, QCheckBox, QFrame, QGridLayout, QGraphicsTextItem, QGraphicsLineItem, QGraphicsPathItem)
 from PySide6.QtCore import (Qt, QTimer, QPointF, QRectF, QPropertyAnimation, 
                             Signal, QObject, QEasingCurve, QVariantAnimation)
 from PySide6.QtGui import (QColor, QPen, QBrush, QLinearGradient, QRadialGradient, 
                           QPainter, QPolygonF, QFont, QPainterPath, QIcon, QPalette, QPixmap)
-from bubble_fx import get_sound_manager, play_shoot, play_burst, play_clear, play_combo, start_bgm
-from PySide6.QtMultimedia import QMediaPlayer
+from bubble_fx import (get_sound_manager, play_shoot, play_burst, play_clear, play_combo,
+                       pump_sfx, start_bgm)
 from bubble_power import (get_power_manager, PowerUpType, PowerUpBubble, 
-                          PowerUpVisualEffect, try_spawn_powerup, 
-                          add_powerup, use_powerup, get_all_powers_info)
-from bubble_gfx import get_bubble_pixmap, get_launcher_pixmap, get_background_pixmap, has_custom_graphics, get_custom_cursor
+                          PowerUpVisualEffect, get_all_powers_info)
+from bubble_particles import ParticleSystem
+from bubble_gfx import get_bubble_pixmap, get_launcher_pixmap, get_background_pixmap, has_custom_graphics, get_custom_cursor, BubbleSpriteAtlas, get_graphics_manager
+from bubble_assets import get_asset_loader
 
 # === MODUL BARU ===
 from bubble_timer import (
@@ -56,11 +61,22 @@ except ImportError:
     _rust_engine = None
     RUST_ENGINE_AVAILABLE = False
 
+# Grid disimpan flat (array('b') + tabel neighbor) di bubble_grid.BubbleGrid;
+# flood-fill jalan langsung di storage itu, atau didelegasikan ke Rust kalau ada.
+from bubble_grid import BubbleGrid
+from bubble_physics import ShotFlight, FixedStepClock
+from bubble_anim import FrameScheduler, TweenSet, OUT_BOUNCE
+from bubble_perf import FrameProfiler, FrameStatsOverlay, log_path_from
+# Aturan main (grid, warna shooter, drop counter, level, skor, power) di
+# bubble_state.GameState tanpa Qt; GameScene tinggal view + efek di atasnya.
+from bubble_state import GameState, GameListener, GameRng
+
 # --- Game Configuration ---
 BUBBLE_RADIUS = 22
 ROWS = 14
 COLS = 20  # FIXED: Tambah kolom agar memenuhi layar (1200px)
 SHOTS_PER_DROP = 7  # CONFIG: Langit-langit turun setiap 7 tembakan (kena/tidak)
+CEILING_DROP_MS = 500  # Durasi animasi bubble turun satu baris (OutBounce)
 
 # Warna Palet Premium
 BUBBLE_PALETTE = [
@@ -72,124 +88,152 @@ BUBBLE_PALETTE = [
     {"base": QColor(100, 210, 255), "light": QColor(180, 240, 255), "dark": QColor(0, 100, 140)}    # Diamond Cyan
 ]
 
-class Particle(QGraphicsEllipseItem):
-    def __init__(self, x, y, color, scene):
-        size = random.uniform(4, 9)
-        super().__init__(-size/2, -size/2, size, size)
-        self.setPos(x, y)
-        self.setBrush(QBrush(color))
-        self.setPen(Qt.NoPen)
-        
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(2, 8)
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
-        
-        self.life = 40
-        self.max_life = 40
-        self.scene_ref = scene
-        scene.addItem(self)
-        
-    def update_particle(self):
-        self.life -= 1
-        if self.life <= 0:
-            self.scene_ref.removeItem(self)
-            return False
-        
-        self.setPos(self.x() + self.vx, self.y() + self.vy)
-        self.vx *= 0.95
-        self.vy *= 0.95
-        self.vy += 0.3
-        
-        opacity = self.life / self.max_life
-        self.setOpacity(opacity)
-        self.setScale(self.scale() * 0.95)
-        return True
+# Sprite bubble (per warna, radius, color-blind) dirender sekali lalu dipakai semua Bubble
+BUBBLE_ATLAS = BubbleSpriteAtlas(BUBBLE_PALETTE)
+
+class Bubble(QGraphicsPixmapItem):
+    """Bubble grid/terbang/preview: pixmap dari BUBBLE_ATLAS, tanpa gradient per item."""
+
+    # Enum di-cache: lookup atribut enum PySide6 per bubble lebih mahal dari setter-nya
+    _SHAPE = QGraphicsPixmapItem.BoundingRectShape
+    _SMOOTH = Qt.SmoothTransformation
 
-class Bubble(QObject, QGraphicsEllipseItem):
     def __init__(self, color_index, x, y, is_preview=False):
-        QObject.__init__(self)
+        super().__init__()
         radius = BUBBLE_RADIUS if not is_preview else BUBBLE_RADIUS * 0.8
-        QGraphicsEllipseItem.__init__(self, -radius, -radius, radius * 2, radius * 2)
-        
+
         self.color_index = color_index
         self.radius_val = radius
+        self.setShapeMode(self._SHAPE)
+        self.setTransformationMode(self._SMOOTH)   # tetap halus saat view di-scale
+        self.setOffset(BUBBLE_ATLAS.offset(radius), BUBBLE_ATLAS.offset(radius))
         self.setPos(x, y)
         self.setup_appearance()
         self.row = 0
         self.col = 0
         self.setTransformOriginPoint(0, 0)
-        self.anim = None
         
     def setup_appearance(self):
-        if self.color_index == -1:
-            gradient = QRadialGradient(-self.radius_val * 0.3, -self.radius_val * 0.3, self.radius_val * 1.5)
-            gradient.setColorAt(0, QColor(255, 255, 255))
-            gradient.setColorAt(0.2, QColor(255, 0, 0))
-            gradient.setColorAt(0.4, QColor(255, 255, 0))
-            gradient.setColorAt(0.6, QColor(0, 255, 0))
-            gradient.setColorAt(0.8, QColor(0, 0, 255))
-            gradient.setColorAt(1, QColor(255, 0, 255))
-            self.setBrush(QBrush(gradient))
-            self.setPen(QPen(QColor(255, 255, 255), 3))
-            rainbow_text = QGraphicsTextItem("🌈", self)
-            rainbow_text.setDefaultTextColor(Qt.white)
-            font = QFont("Segoe UI Emoji", int(self.radius_val * 0.8), QFont.Bold)
-            rainbow_text.setFont(font)
-            text_rect = rainbow_text.boundingRect()
-            rainbow_text.setPos(-text_rect.width()/2, -text_rect.height()/2)
-            return
-
+        """Ambil sprite sesuai warna & mode color-blind (dipanggil lagi saat berubah)."""
         if self.color_index >= len(BUBBLE_PALETTE):
             self.color_index = 0
+        self.setPixmap(BUBBLE_ATLAS.sprite(self.color_index, self.radius_val, is_colorblind_mode()))
 
-        palette = BUBBLE_PALETTE[self.color_index]
-
-        # Color-blind mode: swap to high-contrast color
-        if is_colorblind_mode():
-            from bubble_special import get_cb_color
-            cb_col = get_cb_color(self.color_index)
-            cb_light = cb_col.lighter(140)
-            cb_dark  = cb_col.darker(140)
-            gradient = QRadialGradient(-self.radius_val * 0.3, -self.radius_val * 0.3, self.radius_val * 1.5)
-            gradient.setColorAt(0, cb_light)
-            gradient.setColorAt(0.3, cb_col)
-            gradient.setColorAt(1, cb_dark)
-            self.setBrush(QBrush(gradient))
-            self.setPen(QPen(cb_dark.darker(150), 1.5))
-            # Overlay symbol
-            from bubble_special import get_cb_symbol
-            sym = get_cb_symbol(self.color_index)
-            sym_label = QGraphicsTextItem(sym, self)
-            sym_font  = QFont("Segoe UI", int(self.radius_val * 0.55), QFont.Bold)
-            sym_label.setFont(sym_font)
-            sym_label.setDefaultTextColor(QColor(255, 255, 255))
-            bw = sym_label.boundingRect().width()
-            bh = sym_label.boundingRect().height()
-            sym_label.setPos(-bw / 2, -bh / 2)
-        else:
-            gradient = QRadialGradient(-self.radius_val * 0.3, -self.radius_val * 0.3, self.radius_val * 1.5)
-            gradient.setColorAt(0, palette["light"])
-            gradient.setColorAt(0.3, palette["base"])
-            gradient.setColorAt(1, palette["dark"])
-            self.setBrush(QBrush(gradient))
-            self.setPen(QPen(palette["dark"].darker(150), 1.5))
+    def reset(self, color_index, x, y):
+        """Siapkan bubble daur ulang dari BubblePool seperti bubble baru."""
+        if color_index != self.color_index:
+            self.color_index = color_index
+        self.setup_appearance()   # mode color-blind bisa berubah selama di pool
+        self.setPos(x, y)
+        self.setZValue(0)
+        self.row = 0
+        self.col = 0
 
     def move_to_grid_pos(self, x, y):
-        if self.anim:
-            self.anim.stop()
-            
-        self.anim = QVariantAnimation()
-        self.anim.setStartValue(self.pos())
-        self.anim.setEndValue(QPointF(x, y))
-        self.anim.setDuration(500)
-        self.anim.setEasingCurve(QEasingCurve.OutBounce)
-        self.anim.valueChanged.connect(self.setPos)
-        self.anim.start()
+        # Satu baris di GameScene.tweens (bukan QVariantAnimation per bubble)
+        tweens = getattr(self.scene(), 'tweens', None)
+        if tweens is None:
+            self.setPos(x, y)
+            return
+        tweens.move(self, x, y, CEILING_DROP_MS, OUT_BOUNCE)
+
+
+class BubblePool:
+    """
+    Recycles ``Bubble`` items for one scene. Released bubbles stay in the
+    scene, hidden, and ``acquire`` hands them out again, so popping,
+    attaching and ceiling drops never add or remove scene items once the
+    pool is warm. ``stats()`` is read by the profiling overlay.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.free = []
+        self.live = 0
+        self.peak_live = 0
+        self.created = 0
+        self.reused = 0
+
+    def reserve(self, count):
+        """Buat bubble cadangan (tersembunyi) sampai ada ``count`` item di pool."""
+        while self.live + len(self.free) < count:
+            bubble = Bubble(0, 0, 0)
+            bubble.setVisible(False)
+            self.scene.addItem(bubble)
+            self.free.append(bubble)
+            self.created += 1
+
+    def acquire(self, color_index, x, y):
+        if self.free:
+            bubble = self.free.pop()
+            bubble.reset(color_index, x, y)
+            bubble.setVisible(True)
+            self.reused += 1
+        else:
+            bubble = Bubble(color_index, x, y)
+            self.scene.addItem(bubble)
+            self.created += 1
+        self.live += 1
+        if self.live > self.peak_live:
+            self.peak_live = self.live
+        return bubble
+
+    def release(self, bubble):
+        self.scene.tweens.cancel(bubble)
+        bubble.setVisible(False)
+        self.free.append(bubble)
+        self.live -= 1
+
+    def stats(self) -> dict:
+        return {
+            "live": self.live,
+            "free": len(self.free),
+            "peak_live": self.peak_live,
+            "created": self.created,
+            "reused": self.reused,
+        }
+
+
+class RemovalBatch:
+    """
+    Everything popped while one shot resolves (match, floating drop, bomb,
+    laser, fireball), applied in one ``flush``: items go back to the pool,
+    at most ``MAX_BURSTS`` particle bursts spread over the removed cells,
+    and each sound effect plays once however many hooks asked for it.
+    """
+
+    MAX_BURSTS = 12
 
-class Shooter(QGraphicsPolygonItem):
     def __init__(self):
+        self.removed = []   # (bubble, x, y, color_index)
+        self.sounds = {}    # fungsi play_* -> None (dict: urutan pertama dipertahankan)
+
+    def add(self, bubble):
+        self.removed.append((bubble, bubble.x(), bubble.y(), bubble.color_index))
+
+    def sound(self, play):
+        self.sounds[play] = None
+
+    def flush(self, scene):
+        removed = self.removed
+        if removed:
+            self.sounds[play_burst] = None
+            pool = scene.bubble_pool
+            for bubble, _, _, _ in removed:
+                pool.release(bubble)
+            # Burst tersebar rata di antara cell yang hilang, maksimal MAX_BURSTS
+            step = -(-len(removed) // self.MAX_BURSTS)
+            for _, x, y, color_index in removed[::step]:
+                scene.create_explosion(x, y, BUBBLE_PALETTE[color_index]["base"])
+        for play in self.sounds:
+            play()
+        self.removed = []
+        self.sounds = {}
+
+class Shooter(QGraphicsPolygonItem):
+    def __init__(self, state):
         super().__init__()
+        self.state = state  # Warna current/next disimpan di GameState
         self.angle = 90
         self.create_paw_shape()
         
@@ -198,9 +242,19 @@ class Shooter(QGraphicsPolygonItem):
         self.loaded_bubble_item.setPos(0, -10)
         self.loaded_bubble_item.setPen(Qt.NoPen)
         
-        self.current_color = random.randint(0, len(BUBBLE_PALETTE) - 1)
-        self.next_color = random.randint(0, len(BUBBLE_PALETTE) - 1)
         self.update_loaded_bubble_visual()
+
+    @property
+    def current_color(self): return self.state.current_color
+
+    @current_color.setter
+    def current_color(self, val): self.state.current_color = val
+
+    @property
+    def next_color(self): return self.state.next_color
+
+    @next_color.setter
+    def next_color(self, val): self.state.next_color = val
         
     def create_paw_shape(self):
         poly = QPolygonF([
@@ -248,57 +302,13 @@ class Shooter(QGraphicsPolygonItem):
         self.loaded_bubble_item.setBrush(QBrush(gradient))
 
     def reload(self):
-        self.current_color = self.next_color
-        self.next_color = random.randint(0, len(BUBBLE_PALETTE) - 1)
+        self.state.reload()
         self.update_loaded_bubble_visual()
 
     def swap_colors(self):
-        self.current_color, self.next_color = self.next_color, self.current_color
+        self.state.swap_colors()
         self.update_loaded_bubble_visual()
 
-class BubbleGrid:
-    def __init__(self):
-        self.grid = []
-        self.grid_offset_x = 0  # Offset horizontal agar grid di tengah scene lebar
-        self.initialize_grid()
-        
-    def initialize_grid(self):
-        self.grid = []
-        initial_rows = 5
-        for row in range(ROWS):
-            row_bubbles = []
-            for col in range(COLS):
-                if row < initial_rows:
-                    is_indented = (row % 2 == 1)
-                    if is_indented and col == COLS - 1:
-                        row_bubbles.append(None)
-                    else:
-                        color = random.randint(0, len(BUBBLE_PALETTE) - 1)
-                        row_bubbles.append(color)
-                else:
-                    row_bubbles.append(None)
-            self.grid.append(row_bubbles)
-            
-    def get_position(self, row, col):
-        offset = BUBBLE_RADIUS if row % 2 == 1 else 0
-        x = col * BUBBLE_RADIUS * 2 + BUBBLE_RADIUS + offset + self.grid_offset_x
-        y = row * BUBBLE_RADIUS * 1.732 + BUBBLE_RADIUS
-        return x, y
-        
-    def get_neighbors(self, row, col):
-        neighbors = []
-        if row % 2 == 0:
-             directions = [(-1, -1), (-1, 0), (0, -1), (0, 1), (1, -1), (1, 0)]
-        else:
-            directions = [(-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0), (1, 1)]
-            
-        for dr, dc in directions:
-            nr, nc = row + dr, col + dc
-            if 0 <= nr < len(self.grid) and 0 <= nc < len(self.grid[nr]):
-                if self.grid[nr][nc] is not None:
-                    neighbors.append((nr, nc))
-        return neighbors
-
 class DangerZoneOverlay:
     """
     Visual danger zone that appears when bubbles get too close to the shooter.
@@ -361,11 +371,9 @@ class DangerZoneOverlay:
         self._label.setVisible(False)
         scene.addItem(self._label)
 
-        # Pulse animation state
+        # Pulse animation state (di jam animasi scene, ~25fps)
         self._pulse_frame = 0
-        self._pulse_timer = QTimer()
-        self._pulse_timer.setInterval(40)   # ~25fps pulse
-        self._pulse_timer.timeout.connect(self._pulse)
+        self._pulse_task = None
 
         self._current_level = 0
 
@@ -397,7 +405,7 @@ class DangerZoneOverlay:
             self._overlay.setVisible(False)
             self._edge_bar.setVisible(False)
             self._label.setVisible(False)
-            self._pulse_timer.stop()
+            self._stop_pulse()
 
         elif level == 1:
             # Warning — yellow/amber line only
@@ -408,7 +416,7 @@ class DangerZoneOverlay:
             self._overlay.setVisible(False)
             self._edge_bar.setVisible(False)
             self._label.setVisible(False)
-            self._pulse_timer.start()
+            self._start_pulse()
 
         elif level == 2:
             # Danger — orange line + faint overlay
@@ -420,7 +428,7 @@ class DangerZoneOverlay:
             self._overlay.setVisible(True)
             self._edge_bar.setVisible(False)
             self._label.setVisible(False)
-            self._pulse_timer.start()
+            self._start_pulse()
 
         elif level == 3:
             # Critical — red pulsing line + overlay + edge bar + text
@@ -432,7 +440,16 @@ class DangerZoneOverlay:
             self._overlay.setVisible(True)
             self._edge_bar.setVisible(True)
             self._label.setVisible(True)
-            self._pulse_timer.start()
+            self._start_pulse()
+
+    def _start_pulse(self):
+        if self._pulse_task is None:
+            self._pulse_task = self.scene.frames.add(self._pulse, interval_ms=40)
+
+    def _stop_pulse(self):
+        if self._pulse_task is not None:
+            self._pulse_task.cancel()
+            self._pulse_task = None
 
     def _pulse(self):
         """Animate pulsing opacity on all danger elements."""
@@ -462,7 +479,7 @@ class DangerZoneOverlay:
 
     def remove(self):
         """Clean up all items from scene."""
-        self._pulse_timer.stop()
+        self._stop_pulse()
         for item in [self._line, self._overlay, self._edge_bar, self._label]:
             try:
                 if item.scene():
@@ -471,7 +488,7 @@ class DangerZoneOverlay:
                 pass
 
 
-class GameScene(QGraphicsScene):
+class GameScene(QGraphicsScene, GameListener):
     score_changed = Signal(object)       # FIX: use object to avoid 32-bit int overflow
     high_score_changed = Signal(object)  # FIX: use object to avoid 32-bit int overflow
     drop_counter_changed = Signal(int)
@@ -508,34 +525,54 @@ class GameScene(QGraphicsScene):
         
         self.score = 0
         self.high_score = 0
-        self.level = 1
-        self.level_threshold = 1000
+
+        # State game (grid, warna shooter, drop counter, level, power) —
+        # semua aturan jalan di sini, scene cuma menerima hook GameListener.
+        # Dibuat sebelum setup_background karena tint background butuh level.
+        self.state = GameState(ROWS, COLS, BUBBLE_RADIUS, len(BUBBLE_PALETTE),
+                               SHOTS_PER_DROP, powers=get_power_manager(),
+                               rng=GameRng(),
+                               listener=self, engine=_rust_engine,
+                               grid_offset_x=self.grid_offset_x,
+                               shooter_pos=(self.scene_width / 2, self.scene_height - 130),
+                               scene_height=self.scene_height)
+        self.grid = self.state.grid
 
         self.setup_background()
         
-        self.grid = BubbleGrid()
-        self.grid.grid_offset_x = self.grid_offset_x  # Sinkronkan offset ke grid
-        self.bubbles = []
-        self.shooter = Shooter()
-        self.shooter.setPos(self.scene_width / 2, self.scene_height - 130)
+        # Index (row, col) -> Bubble, flat seperti BubbleGrid.cells (row * cols + col);
+        # disinkronkan di attach, remove dan ceiling drop, jadi lookup cell O(1)
+        self.cell_bubbles = [None] * (self.grid.rows * self.grid.cols)
+        # Semua Bubble grid + flying dari pool; cadangan satu grid penuh + bubble terbang
+        self.bubble_pool = BubblePool(self)
+        self.bubble_pool.reserve(ROWS * COLS + 1)
+        self._removal = None   # RemovalBatch yang terbuka selama GameState.land
+        self.shooter = Shooter(self.state)
+        self.shooter.setPos(self.state.shooter_x, self.state.shooter_y)
         self.addItem(self.shooter)
         
         self.flying_bubble = None
-        self.particles = []
-        
-        self.shots_until_drop = SHOTS_PER_DROP 
+        # Semua partikel (ledakan + trail meteor) digambar oleh satu item pool
+        self.particles = ParticleSystem(self.sceneRect(), rng=self.state.rng.particles)
+        self.particles.setZValue(1)
+        self.addItem(self.particles)
         
         self.shooting = False
         
+        # Jam animasi bersama: popup, toast, pulse, flash, shot timer — di-tick
+        # sekali per frame dari update_game, jadi ikut berhenti saat game loop stop
+        self.frames = FrameScheduler()
+        self.tweens = TweenSet(self.frames)   # ceiling drop, popup, toast
+        self.frame_prof = None   # FrameProfiler saat F3 / --frame-log aktif (bubble_perf)
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_game)
         self.timer.start(16)
+        self.shot_clock = FixedStepClock()  # Jam fisika bubble terbang (fixed timestep)
+        self._shot_flight = None
         
         self.create_bubbles_visuals()    
 
-        self.power_manager = get_power_manager()
-        self.active_power = None
-        self.freeze_shots_remaining = 0
+        self.power_manager = self.state.powers
         
         # === AIM LINE (Garis Aim) — OPTIMIZED: single QGraphicsPathItem ===
         self.aim_line_item = None
@@ -546,6 +583,7 @@ class GameScene(QGraphicsScene):
 
         # Score Manager
         self.score_mgr = get_score_manager(self._save_dir)
+        self.state.score = self.score_mgr
         self.score_mgr.score_updated.connect(self._on_score_updated)
         self.score_mgr.combo_updated.connect(self.combo_changed.emit)
         self.score_mgr.score_event.connect(self._on_score_event)
@@ -553,6 +591,7 @@ class GameScene(QGraphicsScene):
 
         # Shot Timer
         self.shot_timer = get_shot_timer()
+        self.shot_timer.attach(self.frames)
         self.shot_timer.tick.connect(self.timer_tick.emit)
         self.shot_timer.tick.connect(self._update_timer_bar)
         self.shot_timer.multiplier_changed.connect(self.multiplier_changed.emit)
@@ -609,46 +648,56 @@ class GameScene(QGraphicsScene):
         self.shot_timer.start(rush_mode=False)
         self.game_timer.start()
     
+    # --- State game didelegasikan ke GameState ---
+
+    @property
+    def level(self): return self.state.level
+
+    @level.setter
+    def level(self, val): self.state.level = val
+
+    @property
+    def level_threshold(self): return self.state.level_threshold
+
+    @property
+    def shots_until_drop(self): return self.state.shots_until_drop
+
+    @shots_until_drop.setter
+    def shots_until_drop(self, val): self.state.shots_until_drop = val
+
+    @property
+    def freeze_shots_remaining(self): return self.state.freeze_shots_remaining
+
+    @property
+    def active_power(self): return self.state.active_power
+
     def setup_background(self):
         # 1. Hapus background lama jika ada (untuk reset)
         if hasattr(self, 'bg_item') and self.bg_item:
             self.removeItem(self.bg_item)
             self.bg_item = None
 
-        # 2. Tentukan Path Gambar Wallpaper
-        bg_path = Path(__file__).parent / "ui" / "bubble_scn.webp"
-        final_pixmap = None
+        # 2. Placeholder (Layar Hitam) dulu; wallpaper menyusul dari worker thread
+        placeholder = QPixmap(self.scene_width, self.scene_height)
+        placeholder.fill(Qt.black)
+        self.bg_item = self.addPixmap(placeholder)
+        self.bg_item.setZValue(-100) # Layer paling belakang
+        self.bg_item.setPos(0, 0)
 
-        # 3. Coba Load Gambar Wallpaper
+        # 3. Decode + scale Gambar Wallpaper di background (bubble_assets)
+        # Scale agar memenuhi seluruh Scene (1200x800), IgnoreAspectRatio (stretch)
+        bg_path = Path(__file__).parent / "ui" / "bubble_scn.webp"
         if bg_path.exists():
-            original_pixmap = QPixmap(str(bg_path))
-            if not original_pixmap.isNull():
-                # Scale gambar agar memenuhi seluruh Scene (1200x800)
-                # Menggunakan IgnoreAspectRatio agar gambar ditarik penuh (stretch)
-                final_pixmap = original_pixmap.scaled(
-                    self.scene_width, 
-                    self.scene_height,
-                    Qt.IgnoreAspectRatio, 
-                    Qt.SmoothTransformation
-                )
-
-        # 4. Fallback: Jika gambar tidak ada, pakai Generator Nebula (lama)
-        if not final_pixmap:
-            final_pixmap = get_background_pixmap(self.scene_width, self.scene_height)
-
-        # 5. Tambahkan ke Scene
-        if final_pixmap:
-            self.bg_item = self.addPixmap(final_pixmap)
-            self.bg_item.setZValue(-100) # Layer paling belakang
-            self.bg_item.setPos(0, 0)
+            get_asset_loader().load(
+                f"scene_bg:{self.scene_width}x{self.scene_height}",
+                path=bg_path,
+                size=(self.scene_width, self.scene_height),
+                callback=self._on_background_loaded,
+            )
         else:
-            # Fallback terakhir (Layar Hitam) jika semua gagal
-            self.bg_item = QGraphicsRectItem(0, 0, self.scene_width, self.scene_height)
-            self.bg_item.setBrush(QBrush(Qt.black))
-            self.bg_item.setZValue(-100)
-            self.addItem(self.bg_item)
+            self._on_background_loaded(None)
 
-        # 6. Overlay Layer (Tetap dipertahankan untuk efek Level Tint)        
+        # 4. Overlay Layer (Tetap dipertahankan untuk efek Level Tint)        
         if hasattr(self, 'bg_overlay') and self.bg_overlay:
             self.removeItem(self.bg_overlay)
             
@@ -659,6 +708,22 @@ class GameScene(QGraphicsScene):
         
         # Terapkan warna awal
         self.update_background_color()
+
+    def _on_background_loaded(self, pixmap):
+        """Callback asset loader: pasang wallpaper, atau fallback ke Generator Nebula (lama)."""
+        if pixmap is not None:
+            self.bg_item.setPixmap(pixmap)
+            return
+        # Graphics manager me-load/generate asetnya di worker; tunggu "gfx:background"
+        get_graphics_manager()
+        get_asset_loader().load("gfx:background", callback=self._on_nebula_loaded)
+
+    def _on_nebula_loaded(self, pixmap):
+        # Nebula juga gagal: tetap placeholder hitam
+        if pixmap is not None:
+            self.bg_item.setPixmap(pixmap.scaled(
+                self.scene_width, self.scene_height,
+                Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
     
     def update_background_color(self):
         # Format: (R, G, B, Alpha) 
@@ -680,20 +745,29 @@ class GameScene(QGraphicsScene):
         self.bg_overlay.setPen(Qt.NoPen)
         self.bg_overlay.setBrush(QBrush(tint_color))
             
+    @property
+    def bubbles(self) -> list:
+        """Semua Bubble di grid (urutan row-major)."""
+        return [b for b in self.cell_bubbles if b is not None]
+
+    def bubble_at(self, row, col):
+        return self.cell_bubbles[row * self.grid.cols + col]
+
+    def _place_bubble(self, bubble, row, col):
+        bubble.row = row
+        bubble.col = col
+        self.cell_bubbles[row * self.grid.cols + col] = bubble
+
     def create_bubbles_visuals(self):
-        for bubble in self.bubbles:
-            self.removeItem(bubble)
-        self.bubbles.clear()
+        cells = self.cell_bubbles
+        for i, bubble in enumerate(cells):
+            if bubble is not None:
+                self.bubble_pool.release(bubble)
+                cells[i] = None
         
-        for row in range(len(self.grid.grid)):
-            for col in range(len(self.grid.grid[row])):
-                if self.grid.grid[row][col] is not None:
-                    x, y = self.grid.get_position(row, col)
-                    bubble = Bubble(self.grid.grid[row][col], x, y)
-                    bubble.row = row
-                    bubble.col = col
-                    self.bubbles.append(bubble)
-                    self.addItem(bubble)
+        for row, col, color in self.grid.iter_filled():
+            x, y = self.grid.get_position(row, col)
+            self._place_bubble(self.bubble_pool.acquire(color, x, y), row, col)
 
     def shoot_bubble(self, angle):
         if self.shooting or self.flying_bubble:
@@ -705,12 +779,19 @@ class GameScene(QGraphicsScene):
         self._last_shot_bounced = False
         self.shot_timer.stop()
 
-        # Update achievement tracking
-        self.score_mgr.on_shot_fired()
-        self.ach_mgr.on_shots(self.score_mgr.total_shots, self._no_miss_streak)
+        # Lintasan dihitung sekali di sini (sama persis dengan aim guide);
+        # update_game tinggal menjalankan bubble sepanjang lintasan ini,
+        # SHOT_SPEED px per tick fisika. fire() juga menghitung tembakan
+        # di skor dan me-reload warna shooter.
+        color = self.shooter.current_color
+        recorder = self._replay()
+        path = self.state.fire(angle)
 
         # === REPLAY: record shot ===
-        self.recorder.record_shot(angle, self.shooter.current_color)
+        recorder.record_shot(angle, color)
+
+        # Update achievement tracking
+        self.ach_mgr.on_shots(self.score_mgr.total_shots, self._no_miss_streak)
 
         # === DAILY: count shots ===
         if self.daily_mode:
@@ -718,21 +799,15 @@ class GameScene(QGraphicsScene):
             get_daily_manager().on_shot_fired()
             
         self.shooting = True
-        color = self.shooter.current_color
-        
-        rad = math.radians(angle)
-        start_dist = 40
-        start_x = self.shooter.x() + math.cos(rad) * start_dist
-        start_y = self.shooter.y() - math.sin(rad) * start_dist
         
-        self.flying_bubble = Bubble(color, start_x, start_y)
-        self.addItem(self.flying_bubble)
+        start_x, start_y = path.points[0]
+        self.flying_bubble = self.bubble_pool.acquire(color, start_x, start_y)
+        self.flying_bubble.setZValue(2)  # Di atas trail partikel
         
-        speed = 20
-        self.bubble_vx = math.cos(rad) * speed
-        self.bubble_vy = -math.sin(rad) * speed
+        self._shot_flight = ShotFlight(path)
+        self.shot_clock.reset()
         
-        self.shooter.reload()
+        self.shooter.update_loaded_bubble_visual()
         self.next_bubble_changed.emit(self.shooter.next_color)
         
         # Hapus aim line saat menembak
@@ -740,176 +815,151 @@ class GameScene(QGraphicsScene):
 
     def swap_shooter_bubble(self):
         if not self.shooting and not self.flying_bubble:
+            self._replay().record_swap()
             self.shooter.swap_colors()
             self.next_bubble_changed.emit(self.shooter.next_color)
         
+    def _replay(self):
+        """Recorder replay; sesi yang belum punya state awal dimulai di sini:
+        rng GameState di-seed ulang dan state aturan di-snapshot, supaya
+        bubble_replay.verify_replay bisa mengulang sesi tanpa GUI."""
+        recorder = self.recorder
+        if recorder.needs_begin:
+            seed = random.getrandbits(32)
+            self.state.rng.seed(seed)
+            recorder.begin(seed, self.state.snapshot())
+        return recorder
+
     def update_game(self):
-        # 1. Update semua partikel yang ada (hapus jika sudah mati)
-        self.particles = [p for p in self.particles if p.update_particle()]
+        fp = self.frame_prof
+        if fp is not None:
+            fp.begin_frame()
+            fp.enter("anim")
+        self.recorder.tick()
+        self.frames.tick()
+
+        # 1. Update semua partikel yang ada (yang mati keluar dari pool)
+        if fp is not None:
+            fp.leave()
+            fp.enter("particles")
+        self.particles.step()
         
         # 2. Logika Bubble Terbang
         if self.flying_bubble:
             # === START: EFEK METEOR (TRAIL) — OPTIMIZED ===
-            # Spawn tiap 2 frame (bukan tiap frame) agar jumlah item scene
-            # tidak menumpuk terlalu banyak saat bubble melayang lama.
+            # Spawn tiap 2 frame (bukan tiap frame) agar trail tidak
+            # memenuhi pool partikel saat bubble melayang lama.
             self._trail_frame_counter = getattr(self, '_trail_frame_counter', 0) + 1
             if self._trail_frame_counter % 2 == 0:
                 trail_color = QColor(255, 255, 255, 150)
-
-                p = Particle(self.flying_bubble.x(), self.flying_bubble.y(), trail_color, self)
-
-                p.setZValue(self.flying_bubble.zValue() - 1)  # Render di belakang bubble
-                p.setScale(0.5)        # Ukuran lebih kecil dari ledakan biasa
-                p.life = 10            # Umur sangat pendek (cepat hilang)
-                p.max_life = 10
-
-                # Gerakan acak sangat kecil agar terlihat seperti asap buangan
-                p.vx = random.uniform(-1.5, 1.5)
-                p.vy = random.uniform(-1.5, 1.5)
-
-                self.particles.append(p)
+                fx_rng = self.state.rng.particles
+                # Gerakan acak sangat kecil agar terlihat seperti asap buangan;
+                # skala 0.5 & umur 10 frame: lebih kecil dan cepat hilang.
+                # Pool di bawah flying bubble (z 1 < 2), jadi trail di belakangnya.
+                self.particles.spawn(self.flying_bubble.x(), self.flying_bubble.y(),
+                                     fx_rng.uniform(-1.5, 1.5), fx_rng.uniform(-1.5, 1.5),
+                                     trail_color, fx_rng.uniform(4, 9),
+                                     life=10, scale=0.5)
             # === END: EFEK METEOR ===
-
-            # 3. Hitung posisi baru
-            new_x = self.flying_bubble.x() + self.bubble_vx
-            new_y = self.flying_bubble.y() + self.bubble_vy
-            
-            # 4. Pantulan Dinding (Wall Bounce) - dalam area grid, bukan seluruh scene
-            wall_left  = self.grid_offset_x + BUBBLE_RADIUS
-            wall_right = self.grid_offset_x + (COLS * BUBBLE_RADIUS * 2 + BUBBLE_RADIUS * 2) - BUBBLE_RADIUS
-            if new_x <= wall_left:
-                overflow = wall_left - new_x
-                new_x = wall_left + overflow
-                self.bubble_vx = abs(self.bubble_vx)
-                self._last_shot_bounced = True   # Track pantulan
-            elif new_x >= wall_right:
-                overflow = new_x - wall_right
-                new_x = wall_right - overflow
-                self.bubble_vx = -abs(self.bubble_vx)
-                self._last_shot_bounced = True   # Track pantulan
-                
+            if fp is not None:
+                fp.leave()
+                fp.enter("flight")
+
+            # 3. Fisika fixed-timestep: jumlah tick dari jam monotonic, bukan
+            #    dari jumlah frame — frame lambat gak bikin bubble melambat.
+            for _ in range(self.shot_clock.advance()):
+                if self._step_shot():
+                    break
+            else:
+                # 4. Render: interpolasi antara tick sebelumnya dan sekarang
+                self.flying_bubble.setPos(*self._shot_flight.state(self.shot_clock.alpha))
+        if fp is not None:
+            fp.leave()
+            fp.enter("audio")
+
+        # 5. Tanpa device audio (NullSink) SFX frame ini dicampur di sini
+        pump_sfx()
+        if fp is not None:
+            fp.leave()
+
+    def _step_shot(self):
+        """Satu tick fisika bubble terbang. Return True kalau tembakan selesai
+        (nempel di grid / kena boss)."""
+        flight = self._shot_flight
+
+        # Grid berubah saat bubble terbang (mis. ceiling turun)?
+        # Prediksi ulang dari posisi & arah sekarang.
+        if flight.path.grid_version != self.grid.version:
+            x, y, ux, uy, _ = flight.path.state_at(flight.travelled)
+            flight.retarget(self._predict_shot(x, y, ux, uy))
+
+        # Maju sepanjang lintasan (pantulan dinding sudah ada di lintasan)
+        landed = flight.step()
+        if flight.bounced:
+            self._last_shot_bounced = True   # Track pantulan
+        new_x, new_y = flight.position()
+
+        # Sampai titik kontak (bubble lain / langit-langit) -> tempel
+        # di cell yang sudah diprediksi
+        if landed:
             self.flying_bubble.setPos(new_x, new_y)
-            
-            # 5. Cek Tabrakan dengan Langit-langit (Ceiling)
-            if new_y - BUBBLE_RADIUS < 0:
-                self.attach_bubble()
-                return
-
-            # 6. Cek Tabrakan dengan Bubble Lain
-            for bubble in self.bubbles:
-                # Optimasi: Cek selisih Y dulu biar cepat
-                if abs(bubble.y() - new_y) < BUBBLE_RADIUS * 2.5:
-                    dx = new_x - bubble.x()
-                    dy = new_y - bubble.y()
-                    dist_sq = dx*dx + dy*dy
-                    # Jarak toleransi tabrakan (1.8 * radius)
-                    if dist_sq < (BUBBLE_RADIUS * 1.8) ** 2:
-                        self.attach_bubble()
-                        return
-
-            # 6b. Cek Tabrakan dengan Boss Bubbles
-            for boss in self.boss_bubbles[:]:
-                boss_r = boss.radius_val + BUBBLE_RADIUS
-                dx = new_x - boss.x()
-                dy = new_y - boss.y()
-                if dx*dx + dy*dy < boss_r * boss_r:
-                    # Hit boss
-                    still_alive = boss.take_hit()
-                    if not still_alive:
-                        self._on_boss_destroyed(boss)
-                    # Flying bubble is consumed
-                    self.removeItem(self.flying_bubble)
-                    self.flying_bubble = None
-                    self.shooting = False
-                    self.shot_timer.start(rush_mode=self.rush_mgr.rush_active)
-                    return
-                
-    def attach_bubble(self):
+            self.attach_bubble(flight.path.cell)
+            return True
+
+        # Cek Tabrakan dengan Boss Bubbles
+        for boss in self.boss_bubbles[:]:
+            boss_r = boss.radius_val + BUBBLE_RADIUS
+            dx = new_x - boss.x()
+            dy = new_y - boss.y()
+            if dx*dx + dy*dy < boss_r * boss_r:
+                # Hit boss
+                still_alive = boss.take_hit()
+                if not still_alive:
+                    self._on_boss_destroyed(boss)
+                self._replay().record_boss_hit(getattr(boss, 'row', -1),
+                                               getattr(boss, 'col', -1), not still_alive)
+                # Flying bubble is consumed
+                self.bubble_pool.release(self.flying_bubble)
+                self.flying_bubble = None
+                self.shooting = False
+                self.shot_timer.start(rush_mode=self.rush_mgr.rush_active)
+                return True
+        return False
+
+    def attach_bubble(self, cell=None):
         if not self.flying_bubble:
             return
-            
-        min_dist = float('inf')
-        best_row, best_col = 0, 0
-        curr_x = self.flying_bubble.x()
-        curr_y = self.flying_bubble.y()
-        
-        for row in range(len(self.grid.grid)):
-            for col in range(len(self.grid.grid[row])):
-                if self.grid.grid[row][col] is None:
-                    gx, gy = self.grid.get_position(row, col)
-                    dx = curr_x - gx
-                    dy = curr_y - gy
-                    dist = dx*dx + dy*dy
-                    if dist < min_dist:
-                        min_dist = dist
-                        best_row, best_col = row, col
-        
-        if self.grid.grid[best_row][best_col] is not None:
-             return 
 
-        self.grid.grid[best_row][best_col] = self.flying_bubble.color_index
-        self.removeItem(self.flying_bubble)
-        
-        x, y = self.grid.get_position(best_row, best_col)
-        new_bubble = Bubble(self.flying_bubble.color_index, x, y)
-        new_bubble.row = best_row
-        new_bubble.col = best_col
-        self.bubbles.append(new_bubble)
-        self.addItem(new_bubble)
-        
-        self.flying_bubble = None
+        # Semua aturan (match, power, bubble jatuh, drop counter) di GameState;
+        # visual & efek datang balik lewat hook state_*.
+        x, y = self.flying_bubble.x(), self.flying_bubble.y()
+        mult = getattr(self, '_current_shot_multiplier', 1.0)
+        bounced = getattr(self, '_last_shot_bounced', False)
+        rush_bonus = self.rush_mgr.get_score_bonus()
+        self._replay().record_land(cell, x, y, bounced, mult, rush_bonus)
+        # Semua cell yang hilang di tembakan ini dikumpulkan lalu diterapkan sekali
+        self._removal = RemovalBatch()
+        fp = self.frame_prof
+        if fp is not None:
+            fp.enter("attach")
+        try:
+            result = self.state.land(cell, x, y, time_multiplier=mult,
+                                     was_bounced=bounced, rush_bonus=rush_bonus)
+        finally:
+            batch, self._removal = self._removal, None
+            if fp is not None:
+                fp.leave()
+                fp.enter("removal")
+            batch.flush(self)
+            if fp is not None:
+                fp.leave()
+        if result is None:
+            return
 
-        if self.grid.grid[best_row][best_col] == -1:
-            neighbors = self.grid.get_neighbors(best_row, best_col)
-            color_counts = {}
-            
-            for nr, nc in neighbors:
-                neighbor_color = self.grid.grid[nr][nc]
-                if neighbor_color is not None and neighbor_color != -1:
-                    color_counts[neighbor_color] = color_counts.get(neighbor_color, 0) + 1
-            
-            if color_counts:
-                most_common_color = max(color_counts, key=color_counts.get)
-                self.grid.grid[best_row][best_col] = most_common_color
-                
-                for bubble in self.bubbles:
-                    if bubble.row == best_row and bubble.col == best_col:
-                        bubble.color_index = most_common_color
-                        bubble.setup_appearance()
-                        break
-
-        if self.active_power == PowerUpType.BOMB:
-            self.apply_bomb_effect(best_row, best_col)
-            self.active_power = None
-        
-        elif self.active_power == PowerUpType.LASER:
-            self.apply_laser_effect(best_col)
-            self.active_power = None
-        
-        elif self.active_power == PowerUpType.FIREBALL:
-            self.apply_fireball_effect(best_row, best_col)
-            self.active_power = None
-    
-        else:
-            match_found = self.check_matches(best_row, best_col)
-            if not match_found:
-                self.check_and_drop_neighbors(best_row, best_col)
-    
-        self.power_manager.update_all_cooldowns()
-        self.power_updated.emit()
-    
-        if self.freeze_shots_remaining > 0:
-            self.freeze_shots_remaining -= 1
-        else:
-            self.shots_until_drop -= 1
-            self.drop_counter_changed.emit(self.shots_until_drop)
-            
-            if self.shots_until_drop <= 0:
-                QTimer.singleShot(100, self.add_ceiling_row)
-                self.shots_until_drop = SHOTS_PER_DROP
-                self.drop_counter_changed.emit(self.shots_until_drop)       
+        if result.ceiling_due:
+            QTimer.singleShot(100, self.add_ceiling_row)
 
-        if self.check_game_over_condition():
+        if result.game_over:
             self.game_over.emit()
 
         self.shooting = False
@@ -919,75 +969,66 @@ class GameScene(QGraphicsScene):
         self.shot_timer.start(rush_mode=rush_mode)
 
         # === Evaluasi rush mode ===
-        self.rush_mgr.evaluate(self.bubbles, self.scene_height, self.shooter.y())
+        bubbles = self.bubbles
+        self.rush_mgr.evaluate(bubbles, self.scene_height, self.shooter.y())
 
         # === Update Danger Zone visual ===
-        self._danger_zone.update_danger(self.bubbles)
+        self._danger_zone.update_danger(bubbles)
         # Sync HUD danger label with DangerZone level
         self.danger_level_changed.emit(self._danger_zone._current_level)
 
-    def apply_bomb_effect(self, center_row, center_col):
-        destroyed = []
-        for dr in range(-1, 2):
-            for dc in range(-1, 2):
-                r, c = center_row + dr, center_col + dc
-                if 0 <= r < len(self.grid.grid) and 0 <= c < len(self.grid.grid[r]):
-                    if self.grid.grid[r][c] is not None:
-                        destroyed.append((r, c))
-                        self.grid.grid[r][c] = None
-                        self.remove_bubble_visual(r, c)
-
-        x, y = self.grid.get_position(center_row, center_col)
-        PowerUpVisualEffect.create_explosion_effect(self, x, y, BUBBLE_RADIUS * 3, QColor(255, 69, 0))
-        popup_x = self.grid_offset_x + (COLS * BUBBLE_RADIUS * 2) / 2
-        popup_y = self.scene_height * 0.4
-        self.score_mgr.on_powerup_effect(len(destroyed), 15, popup_x, popup_y, "💣 BOMB!")
-        self.ach_mgr.on_power_used('bomb')
-        play_burst()
-        self.remove_floating_bubbles()
-
-    def apply_laser_effect(self, col):
-        destroyed = []
-        for row in range(len(self.grid.grid)):
-            if col < len(self.grid.grid[row]) and self.grid.grid[row][col] is not None:
-                destroyed.append((row, col))
-                self.grid.grid[row][col] = None
-                self.remove_bubble_visual(row, col)
-
-        x, _ = self.grid.get_position(0, col)
-        PowerUpVisualEffect.create_laser_effect(self, x, 0, self.scene_height - 200, QColor(0, 255, 255))
-        popup_x = self.grid_offset_x + (COLS * BUBBLE_RADIUS * 2) / 2
-        popup_y = self.scene_height * 0.4
-        self.score_mgr.on_powerup_effect(len(destroyed), 20, popup_x, popup_y, "⚡ LASER!")
-        self.ach_mgr.on_power_used('laser')
-        play_clear()
-        self.remove_floating_bubbles()
-
-    def apply_fireball_effect(self, center_row, center_col):
-        destroyed = []
-        for dr in range(-2, 3):
-            for dc in range(-2, 3):
-                r, c = center_row + dr, center_col + dc
-                if 0 <= r < len(self.grid.grid) and 0 <= c < len(self.grid.grid[r]):
-                    if self.grid.grid[r][c] is not None:
-                        destroyed.append((r, c))
-                        self.grid.grid[r][c] = None
-                        self.remove_bubble_visual(r, c)
-
-        x, y = self.grid.get_position(center_row, center_col)
-        PowerUpVisualEffect.create_explosion_effect(self, x, y, BUBBLE_RADIUS * 5, QColor(255, 140, 0))
-        popup_x = self.grid_offset_x + (COLS * BUBBLE_RADIUS * 2) / 2
-        popup_y = self.scene_height * 0.4
-        self.score_mgr.on_powerup_effect(len(destroyed), 25, popup_x, popup_y, "🔥 FIREBALL!")
-        self.ach_mgr.on_power_used('fireball')
-        play_combo()
-        self.remove_floating_bubbles()
+    # --- GameListener hooks: GameState -> visual ---
+
+    def state_attached(self, row, col, color):
+        # Flying bubble langsung jadi bubble grid (tanpa item baru)
+        x, y = self.grid.get_position(row, col)
+        new_bubble = self.flying_bubble
+        new_bubble.reset(color, x, y)
+        self._place_bubble(new_bubble, row, col)
+        
+        self.flying_bubble = None
+
+    def state_recolored(self, row, col, color):
+        bubble = self.bubble_at(row, col)
+        if bubble is not None:
+            bubble.color_index = color
+            bubble.setup_appearance()
+
+    def state_cells_removed(self, cells):
+        self.remove_bubble_visuals(cells)
+
+    def state_powerup_gained(self, power_type):
+        self.power_collected.emit(power_type)
+
+    def state_power_effect(self, power_type, row, col, destroyed):
+        if power_type == PowerUpType.BOMB:
+            x, y = self.grid.get_position(row, col)
+            PowerUpVisualEffect.create_explosion_effect(self, x, y, BUBBLE_RADIUS * 3, QColor(255, 69, 0))
+            self.ach_mgr.on_power_used('bomb')
+            self._play(play_burst)
+        elif power_type == PowerUpType.LASER:
+            x, _ = self.grid.get_position(0, col)
+            PowerUpVisualEffect.create_laser_effect(self, x, 0, self.scene_height - 200, QColor(0, 255, 255))
+            self.ach_mgr.on_power_used('laser')
+            self._play(play_clear)
+        elif power_type == PowerUpType.FIREBALL:
+            x, y = self.grid.get_position(row, col)
+            PowerUpVisualEffect.create_explosion_effect(self, x, y, BUBBLE_RADIUS * 5, QColor(255, 140, 0))
+            self.ach_mgr.on_power_used('fireball')
+            self._play(play_combo)
+
+    def state_powers_changed(self):
+        self.power_updated.emit()
+
+    def state_drop_counter(self, shots_until_drop):
+        self.drop_counter_changed.emit(shots_until_drop)
 
     def add_score(self, points):
         """Legacy helper — tambah skor via score_mgr agar konsisten."""
         # Pakai ScoreManager sebagai single source of truth
         if points > 0:
             evt = ScoreEvent(points, 1.0, 1, "", 0, 0, QColor(180, 255, 180))
+            self._replay().record_bonus(points, "legacy")
             self.score_mgr._add_score(points)
         # Sync score lama agar backward-compatible
         self.score = self.score_mgr.score
@@ -1010,7 +1051,12 @@ class GameScene(QGraphicsScene):
 
     def _on_score_event(self, event):
         """Tampilkan popup skor di scene."""
+        fp = self.frame_prof
+        if fp is not None:
+            fp.enter("dispatch")
         spawn_score_popup(self, event)
+        if fp is not None:
+            fp.leave()
 
     def _update_timer_bar(self, remaining: float):
         """Update visual timer bar."""
@@ -1028,6 +1074,7 @@ class GameScene(QGraphicsScene):
         """Penalti saat waktu tembak habis."""
         # Kurangi score sebagai penalti kecil
         penalty = 50
+        self._replay().record_bonus(-penalty, "slow")
         self.score_mgr._add_score(-penalty)
         self.countdown_flash.flash("SLOW!", QColor(255, 60, 60))
 
@@ -1051,11 +1098,17 @@ class GameScene(QGraphicsScene):
 
     def _on_achievement_unlocked(self, ach_def):
         """Show toast dan emit signal ke MainWindow."""
+        fp = self.frame_prof
+        if fp is not None:
+            fp.enter("dispatch")
         show_achievement_toast(self, ach_def, self.scene_width)
         # Tambah reward score
         if ach_def.reward_score > 0:
+            self._replay().record_bonus(ach_def.reward_score, "achievement")
             self.score_mgr._add_score(ach_def.reward_score)
         self.achievement_earned.emit(ach_def)
+        if fp is not None:
+            fp.leave()
 
     def _on_boss_destroyed(self, boss):
         """Called when a boss bubble's HP reaches 0."""
@@ -1063,6 +1116,7 @@ class GameScene(QGraphicsScene):
         bonus = 200 + boss.max_hp * 50
         popup_x = boss.x()
         popup_y = boss.y()
+        self._replay().record_bonus(bonus, "boss")
         self.score_mgr.on_powerup_effect(1, bonus, popup_x, popup_y, "👑 BOSS!")
         play_combo()
         self.create_explosion(boss.x(), boss.y(), QColor(255, 215, 0))
@@ -1073,48 +1127,40 @@ class GameScene(QGraphicsScene):
             self.boss_bubbles.remove(boss)
         # Bersihkan slot grid yang direservasi boss ini (kalau ada)
         r, c = getattr(boss, 'row', -1), getattr(boss, 'col', -1)
-        if 0 <= r < len(self.grid.grid) and 0 <= c < len(self.grid.grid[r]):
-            if self.grid.grid[r][c] == -3:
-                self.grid.grid[r][c] = None
+        if self.grid.in_bounds(r, c):
+            if self.grid.get(r, c) == -3:
+                self.grid.set(r, c, None)
 
     def _find_nearest_empty_cell(self, x: float, y: float):
         """Cari cell grid kosong terdekat dari koordinat (x, y). Dipakai untuk
         mereservasi slot boss bubble agar tidak overlap dengan bubble biasa."""
-        min_dist = float('inf')
-        best_row, best_col = None, None
-        for row in range(len(self.grid.grid)):
-            for col in range(len(self.grid.grid[row])):
-                if self.grid.grid[row][col] is None:
-                    gx, gy = self.grid.get_position(row, col)
-                    dx = x - gx
-                    dy = y - gy
-                    dist = dx * dx + dy * dy
-                    if dist < min_dist:
-                        min_dist = dist
-                        best_row, best_col = row, col
-        return best_row, best_col
+        cell = self.grid.nearest_empty_cell(x, y)
+        return cell if cell is not None else (None, None)
 
     def try_spawn_boss_after_match(self, match_size: int, x: float, y: float):
         """Possibly spawn a boss bubble near the match site after a big match.
         FIXED: boss sekarang mereservasi slot di grid (sentinel -3) supaya
         bubble baru tidak bisa menempati/overlap posisi yang sama, dan
         cleanup-nya bisa membersihkan grid dengan benar saat boss mati."""
-        if should_spawn_boss(self.level, match_size):
-            color = random.randint(0, len(BUBBLE_PALETTE) - 1)
-            spawn_x = x + random.randint(-40, 40)
+        boss_rng = self.state.rng.boss
+        if should_spawn_boss(self.level, match_size, boss_rng):
+            color = boss_rng.randint(0, len(BUBBLE_PALETTE) - 1)
+            spawn_x = x + boss_rng.randint(-40, 40)
             spawn_y = max(BUBBLE_RADIUS * 2, y - BUBBLE_RADIUS * 3)
 
             row, col = self._find_nearest_empty_cell(spawn_x, spawn_y)
 
             if row is not None:
                 gx, gy = self.grid.get_position(row, col)
-                boss = create_boss_bubble(color, gx, gy, self.level)
+                boss = create_boss_bubble(color, gx, gy, self.level, frames=self.frames)
                 boss.row = row
                 boss.col = col
-                self.grid.grid[row][col] = -3  # reservasi slot: boss sentinel
+                self.grid.set(row, col, -3)  # reservasi slot: boss sentinel
+                self.recorder.record_boss(row, col)
             else:
                 # Fallback: tidak ada slot kosong, tetap spawn mengambang saja
-                boss = create_boss_bubble(color, spawn_x, spawn_y, self.level)
+                boss = create_boss_bubble(color, spawn_x, spawn_y, self.level,
+                                          frames=self.frames)
                 boss.row = -1
                 boss.col = -1
 
@@ -1122,310 +1168,164 @@ class GameScene(QGraphicsScene):
             self.addItem(boss)
             self.boss_bubbles.append(boss)
 
-    def check_matches(self, row, col):
-        color = self.grid.grid[row][col]
-        matched = self._find_matching_set(row, col, color)
-
-        if len(matched) >= 3:
-            play_clear()
-            if len(matched) >= 6:
-                play_combo()
-
-            power_type = try_spawn_powerup(len(matched))
-            if power_type:
-                add_powerup(power_type)
-                self.power_collected.emit(power_type)
-
-            # === Scoring via ScoreManager (baru) ===
-            mx, my = self.grid.get_position(row, col)
-            mult = getattr(self, '_current_shot_multiplier', 1.0)
-            bounced = getattr(self, '_last_shot_bounced', False)
-            rush_bonus = self.rush_mgr.get_score_bonus()
-
-            self.score_mgr.on_match(
-                match_size=len(matched),
-                time_multiplier=mult,
-                was_bounced=bounced,
-                x=mx, y=my,
-                rush_bonus=rush_bonus,
-            )
-
-            # Achievement tracking
-            self._no_miss_streak += 1
-            if mult >= 2.8:
-                self._speed_shot_streak += 1
-                self.ach_mgr.on_speed_shot(self._speed_shot_streak, mult)
-            else:
-                self._speed_shot_streak = 0
-
-            self.ach_mgr.on_pop(self.score_mgr.total_pops, len(matched))
-            self.ach_mgr.on_combo(self.score_mgr.combo)
-            self.ach_mgr.on_streak(self.score_mgr.streak)
-            self.ach_mgr.on_score(self.score_mgr.score)
+    def state_matched(self, matched, mx, my):
+        """Match >= 3: skor sudah dihitung GameState, cell belum dikosongkan."""
+        fp = self.frame_prof
+        if fp is not None:
+            fp.enter("dispatch")
+        self._play(play_clear)
+        if len(matched) >= 6:
+            self._play(play_combo)
+
+        # Achievement tracking
+        mult = getattr(self, '_current_shot_multiplier', 1.0)
+        self._no_miss_streak += 1
+        if mult >= 2.8:
+            self._speed_shot_streak += 1
+            self.ach_mgr.on_speed_shot(self._speed_shot_streak, mult)
+        else:
+            self._speed_shot_streak = 0
 
-            # === REPLAY: record match ===
-            self.recorder.record_match(len(matched), self.score_mgr.score)
+        self.ach_mgr.on_pop(self.score_mgr.total_pops, len(matched))
+        self.ach_mgr.on_combo(self.score_mgr.combo)
+        self.ach_mgr.on_streak(self.score_mgr.streak)
+        self.ach_mgr.on_score(self.score_mgr.score)
 
-            # === DAILY: record points ===
-            if self.daily_mode:
-                get_daily_manager().on_match(self.score_mgr.score)
+        # === REPLAY: record match ===
+        self.recorder.record_match(len(matched), self.score_mgr.score)
 
-            # === BOSS SPAWN: chance after big matches ===
-            self.try_spawn_boss_after_match(len(matched), mx, my)
+        # === DAILY: record points ===
+        if self.daily_mode:
+            get_daily_manager().on_match(self.score_mgr.score)
 
-            for r, c in matched:
-                self.grid.grid[r][c] = None
-                self.remove_bubble_visual(r, c)
-
-            self.remove_floating_bubbles()
-            self.check_level_up()
-            return True
+        # === BOSS SPAWN: chance after big matches ===
+        self.try_spawn_boss_after_match(len(matched), mx, my)
+        if fp is not None:
+            fp.leave()
 
+    def state_no_match(self):
         # No match — reset no-miss streak
         self._no_miss_streak = 0
-        return False
 
     def remove_bubble_visual(self, r, c):
-        for bubble in self.bubbles[:]:
-            if bubble.row == r and bubble.col == c:
-                color = BUBBLE_PALETTE[bubble.color_index]["base"]
-                self.create_explosion(bubble.x(), bubble.y(), color)
-                play_burst()
-                self.bubbles.remove(bubble)
-                self.removeItem(bubble)
-                break
+        self.remove_bubble_visuals(((r, c),))
+
+    def remove_bubble_visuals(self, cells):
+        """Keluarkan item sekumpulan cell dari index; efek & pool lewat RemovalBatch
+        (batch tembakan yang sedang terbuka, atau batch sendiri yang langsung di-flush)."""
+        batch = self._removal or RemovalBatch()
+        index = self.cell_bubbles
+        cols = self.grid.cols
+        for r, c in cells:
+            i = r * cols + c
+            bubble = index[i]
+            if bubble is not None:
+                index[i] = None
+                batch.add(bubble)
+        if batch is not self._removal:
+            batch.flush(self)
+
+    def _play(self, play):
+        """Sound effect; selama tembakan di-resolve, digabung di RemovalBatch."""
+        if self._removal is not None:
+            self._removal.sound(play)
+        else:
+            play()
 
     def add_ceiling_row(self):
-        if any(c is not None for c in self.grid.grid[ROWS-1]):
+        self._replay().record_ceiling()
+        if not self.state.add_ceiling_row():
             self.game_over.emit()
-            return
-
-        self.grid.grid.pop() 
-        new_row = []
-        for col in range(COLS):
-            if col < COLS: 
-                new_row.append(random.randint(0, len(BUBBLE_PALETTE) - 1))
-            else:
-                new_row.append(None)
-        self.grid.grid.insert(0, new_row)
 
-        for bubble in self.bubbles:
-            bubble.row += 1
-            new_x, new_y = self.grid.get_position(bubble.row, bubble.col)
-            bubble.move_to_grid_pos(new_x, new_y)
+    def state_ceiling_row(self, new_row):
+        index = self.cell_bubbles
+        cols = self.grid.cols
+        # Baris terbawah mestinya kosong (GameState.add_ceiling_row sudah cek);
+        # item yang tersisa di sana dikembalikan ke pool, bukan ikut bergeser
+        for bubble in index[-cols:]:
+            if bubble is not None:
+                self.bubble_pool.release(bubble)
+        index[cols:] = index[:-cols]
+        index[:cols] = [None] * cols
+
+        for bubble in index[cols:]:
+            if bubble is not None:
+                bubble.row += 1
+                new_x, new_y = self.grid.get_position(bubble.row, bubble.col)
+                bubble.move_to_grid_pos(new_x, new_y)
             
         for col in range(len(new_row)):
             if new_row[col] is not None:
                 x, y = self.grid.get_position(0, col)
-                bubble = Bubble(new_row[col], x, y)
-                bubble.row = 0
-                bubble.col = col
-                bubble.setPos(x, y - BUBBLE_RADIUS*2)
+                bubble = self.bubble_pool.acquire(new_row[col], x, y - BUBBLE_RADIUS*2)
+                self._place_bubble(bubble, 0, col)
                 bubble.move_to_grid_pos(x, y)
-                self.bubbles.append(bubble)
-                self.addItem(bubble)
-
-    def check_level_up(self):
-        if self.score_mgr.score >= self.level_threshold * self.level:
-            self.level += 1
-            self.score_mgr.set_level(self.level)
-            self.level_changed.emit(self.level)
-            self.ach_mgr.on_level(self.level)
-            self.update_background_color()
-
-    def find_matching(self, row, col, color, matched):
-        """Rekursif Python (fallback). Dipakai kalau bubble_engine (Rust) gak tersedia.
-        Untuk jalur normal, lihat check_matches() yang manggil _find_matching_set()."""
-        if (row, col) in matched: 
-            return
-        
-        cell_color = self.grid.grid[row][col]
-        
-        if cell_color is None:
-            return
-        
-        if cell_color == color or cell_color == -1 or color == -1:
-            matched.add((row, col))
-            
-            search_color = color if color != -1 else cell_color
-            for nr, nc in self.grid.get_neighbors(row, col):
-                self.find_matching(nr, nc, search_color, matched)
-
-    def _find_matching_set(self, row, col, color):
-        """Cari semua bubble yang match warnanya dari (row,col). Pakai Rust
-        (BFS, gak ada limit recursion) kalau ada, else fallback ke rekursif Python."""
-        if RUST_ENGINE_AVAILABLE:
-            return set(_rust_engine.find_matching(self.grid.grid, row, col))
-        matched = set()
-        self.find_matching(row, col, color, matched)
-        return matched
-
-    def _find_connected_cluster_set(self, row, col):
-        """Cari cluster bubble terisi yang terhubung dari (row,col), gak peduli
-        warna. Pakai Rust kalau ada, else fallback ke rekursif Python."""
-        if RUST_ENGINE_AVAILABLE:
-            return set(_rust_engine.find_connected_cluster(self.grid.grid, row, col))
-        cluster = set()
-        self.find_connected_cluster(row, col, cluster)
-        return cluster
-
-    def remove_floating_bubbles(self):
-        if RUST_ENGINE_AVAILABLE:
-            floating_positions = set(_rust_engine.find_floating_bubbles(self.grid.grid))
-            dropped_count = 0
-            popup_x = self.grid_offset_x + (COLS * BUBBLE_RADIUS * 2) / 2
-            popup_y = self.scene_height * 0.35
-
-            for row, col in floating_positions:
-                self.grid.grid[row][col] = None
-                self.remove_bubble_visual(row, col)
-                dropped_count += 1
-
-            if dropped_count > 0:
-                self.score_mgr.on_drops(dropped_count, popup_x, popup_y)
-                self.ach_mgr.on_drop(self.score_mgr._total_drops)
-
-            if dropped_count >= 3:
-                play_combo()
-                self._chain_count += 1
-                self.ach_mgr.on_chain_reaction(self._chain_count)
-            else:
-                self._chain_count = 0
-
-            self.score_changed.emit(self.score_mgr.score)
-            return
 
-        connected = set()
-        for col in range(len(self.grid.grid[0])):
-            if self.grid.grid[0][col] is not None:
-                self.find_connected(0, col, connected)
-
-        dropped_count = 0
-        # Posisi popup di tengah horizontal arena, sepertiga atas scene
-        popup_x = self.grid_offset_x + (COLS * BUBBLE_RADIUS * 2) / 2
-        popup_y = self.scene_height * 0.35
-
-        for row in range(len(self.grid.grid)):
-            for col in range(len(self.grid.grid[row])):
-                if self.grid.grid[row][col] is not None and (row, col) not in connected:
-                    self.grid.grid[row][col] = None
-                    self.remove_bubble_visual(row, col)
-                    dropped_count += 1
+    def state_level_up(self, level):
+        self.level_changed.emit(level)
+        self.ach_mgr.on_level(level)
+        self.update_background_color()
 
+    def state_floating_removed(self, dropped_count):
+        fp = self.frame_prof
+        if fp is not None:
+            fp.enter("dispatch")
         if dropped_count > 0:
-            self.score_mgr.on_drops(dropped_count, popup_x, popup_y)
+            self.recorder.record_drop(dropped_count)
             self.ach_mgr.on_drop(self.score_mgr._total_drops)
 
         if dropped_count >= 3:
-            play_combo()
+            self._play(play_combo)
             self._chain_count += 1
             self.ach_mgr.on_chain_reaction(self._chain_count)
         else:
             self._chain_count = 0
 
         self.score_changed.emit(self.score_mgr.score)
+        if fp is not None:
+            fp.leave()
     
-    def check_and_drop_neighbors(self, impact_row, impact_col):
-        """OPTIMIZED: flood-fill konektivitas ke langit-langit dihitung SEKALI
-        di luar loop neighbor, bukan diulang tiap neighbor (bisa sampai 6x
-        flood-fill full-grid sebelumnya)."""
-        neighbors = self.grid.get_neighbors(impact_row, impact_col)
-        total_dropped = 0
-        last_x, last_y = self.grid.get_position(impact_row, impact_col)
-
-        if RUST_ENGINE_AVAILABLE:
-            floating = set(_rust_engine.find_floating_bubbles(self.grid.grid))
-            not_connected = lambda pos: pos in floating
-        else:
-            connected = set()
-            for col in range(len(self.grid.grid[0])):
-                if self.grid.grid[0][col] is not None:
-                    self.find_connected(0, col, connected)
-            not_connected = lambda pos: pos not in connected
-
-        for nr, nc in neighbors:
-            if self.grid.grid[nr][nc] is not None and not_connected((nr, nc)):
-                to_drop = self._find_connected_cluster_set(nr, nc)
-
-                for dr, dc in to_drop:
-                    if self.grid.grid[dr][dc] is not None:
-                        gx, gy = self.grid.get_position(dr, dc)
-                        last_x, last_y = gx, gy
-                        self.grid.grid[dr][dc] = None
-                        self.remove_bubble_visual(dr, dc)
-                        total_dropped += 1
-
-        # Satu popup drop di akhir, bukan per-bubble
-        if total_dropped > 0:
-            self.score_mgr.on_drops(total_dropped, last_x, last_y)
-            self.ach_mgr.on_drop(self.score_mgr._total_drops)
-            if total_dropped >= 3:
-                play_combo()
-            self.score_changed.emit(self.score_mgr.score)
+    def state_neighbors_dropped(self, total_dropped):
+        self.recorder.record_drop(total_dropped)
+        self.ach_mgr.on_drop(self.score_mgr._total_drops)
+        if total_dropped >= 3:
+            self._play(play_combo)
+        self.score_changed.emit(self.score_mgr.score)
     
-    def find_connected_cluster(self, row, col, cluster):
-        if (row, col) in cluster:
-            return
-        if self.grid.grid[row][col] is None:
-            return
-        
-        cluster.add((row, col))
-        
-        for nr, nc in self.grid.get_neighbors(row, col):
-            self.find_connected_cluster(nr, nc, cluster)
-                    
-    def find_connected(self, row, col, connected):
-        if (row, col) in connected: return
-        if self.grid.grid[row][col] is None: return
-        connected.add((row, col))
-        for nr, nc in self.grid.get_neighbors(row, col):
-            self.find_connected(nr, nc, connected)
-            
     def create_explosion(self, x, y, color):
-        for _ in range(8): 
-            particle = Particle(x, y, color, self)
-            self.particles.append(particle)
+        self.particles.burst(x, y, color, 8)
 
     def activate_power(self, power_type):
-        if not use_powerup(power_type):
+        recorder = self._replay()
+        if not self.state.activate_power(power_type):
             return False
 
-        self.active_power = power_type
+        recorder.record_power(power_type)
         self.power_used.emit(power_type)
 
         if power_type == PowerUpType.FREEZE:
-            self.freeze_shots_remaining = 5
             PowerUpVisualEffect.create_freeze_effect(self, self.sceneRect())
             self.ach_mgr.on_power_used('freeze')
             play_combo()
 
         elif power_type == PowerUpType.RAINBOW:
-            self.shooter.current_color = -1
             self.shooter.update_loaded_bubble_visual()
-            self.active_power = None
             self.ach_mgr.on_power_used('rainbow')
             play_combo()
 
         return True
             
     def check_game_over_condition(self):
-        limit_y = self.shooter.y() - 50
-        for bubble in self.bubbles:
-            if bubble.y() > limit_y:
-                return True
-        return False
+        return self.state.is_game_over()
         
     def reset_game(self):
-        self.grid.initialize_grid()
-        self.grid.grid_offset_x = self.grid_offset_x
+        self.state.reset()   # Grid baru, drop counter, level, warna shooter, skor
         self.create_bubbles_visuals()
         self.score = 0
-        self.shots_until_drop = SHOTS_PER_DROP
-        self.level = 1
         self.shooting = False
+        if self.flying_bubble:
+            self.bubble_pool.release(self.flying_bubble)
         self.flying_bubble = None
-        self.shooter.current_color = random.randint(0, len(BUBBLE_PALETTE) - 1)
-        self.shooter.next_color = random.randint(0, len(BUBBLE_PALETTE) - 1)
         self.shooter.update_loaded_bubble_visual()
         self.next_bubble_changed.emit(self.shooter.next_color)
         self.score_changed.emit(self.score)
@@ -1435,10 +1335,10 @@ class GameScene(QGraphicsScene):
         self.clear_aim_line()
 
         # === Reset semua sistem baru ===
-        self.score_mgr.reset()
         reset_all_timers()
         # Re-bind setelah reset singleton
         self.shot_timer = get_shot_timer()
+        self.shot_timer.attach(self.frames)
         self.shot_timer.tick.connect(self.timer_tick.emit)
         self.shot_timer.tick.connect(self._update_timer_bar)
         self.shot_timer.multiplier_changed.connect(self.multiplier_changed.emit)
@@ -1482,59 +1382,24 @@ class GameScene(QGraphicsScene):
     def update_aim_line(self, angle):
         """Update garis aim dengan pantulan - presisi di kedua dinding
         OPTIMIZED: pakai satu QGraphicsPathItem yang di-reuse, bukan puluhan
-        QGraphicsLineItem yang di-add/remove tiap kali mouse gerak."""
+        QGraphicsLineItem yang di-add/remove tiap kali mouse gerak.
+        Lintasan dihitung analitik (bubble_physics.predict_shot), sama dengan
+        yang dipakai shoot_bubble, jadi bubble mendarat persis di ujung garis."""
         if self.shooting or self.flying_bubble:
             self.clear_aim_line()
             return
+        fp = self.frame_prof
+        if fp is not None:
+            fp.enter("aim")
         
         rad = math.radians(angle)
         start_dist = 40
         start_x = self.shooter.x() + math.cos(rad) * start_dist
         start_y = self.shooter.y() - math.sin(rad) * start_dist
         
-        dx = math.cos(rad)
-        dy = -math.sin(rad)
-        
         max_distance = 1200
-        step = 8  # Langkah lebih besar untuk performa lebih baik
-        
-        points = [(start_x, start_y)]
-        current_x, current_y = start_x, start_y
-        current_dx, current_dy = dx, dy
-        
-        for _ in range(int(max_distance / step)):
-            next_x = current_x + current_dx * step
-            next_y = current_y + current_dy * step
-            
-            # Bounce dalam batas grid (simetris kiri-kanan)
-            wall_left  = self.grid_offset_x + BUBBLE_RADIUS
-            wall_right = self.grid_offset_x + (COLS * BUBBLE_RADIUS * 2 + BUBBLE_RADIUS * 2) - BUBBLE_RADIUS
-            if next_x <= wall_left:
-                overflow = wall_left - next_x
-                next_x = wall_left + overflow
-                current_dx = abs(current_dx)
-            elif next_x >= wall_right:
-                overflow = next_x - wall_right
-                next_x = wall_right - overflow
-                current_dx = -abs(current_dx)
-            
-            if next_y - BUBBLE_RADIUS <= 0:
-                points.append((next_x, BUBBLE_RADIUS))
-                break
-            
-            hit_bubble = False
-            for bubble in self.bubbles:
-                dist_sq = (next_x - bubble.x())**2 + (next_y - bubble.y())**2
-                if dist_sq < (BUBBLE_RADIUS * 2) ** 2:
-                    points.append((next_x, next_y))
-                    hit_bubble = True
-                    break
-            
-            if hit_bubble:
-                break
-            
-            points.append((next_x, next_y))
-            current_x, current_y = next_x, next_y
+        shot_path = self._predict_shot(start_x, start_y, math.cos(rad), -math.sin(rad))
+        points = shot_path.truncated(max_distance)
         
         if len(points) >= 2:
             path = QPainterPath()
@@ -1552,7 +1417,13 @@ class GameScene(QGraphicsScene):
             self.aim_line_item.setVisible(True)
         else:
             self.clear_aim_line()
+        if fp is not None:
+            fp.leave()
     
+    def _predict_shot(self, x, y, dir_x, dir_y):
+        """Lintasan tembakan dari (x, y) dalam batas dinding grid (simetris kiri-kanan)."""
+        return self.state.predict(x, y, dir_x, dir_y)
+
     def clear_aim_line(self):
         """Sembunyikan garis aim (item tetap ada di scene, tinggal di-reuse)"""
         if self.aim_line_item is not None:
@@ -1567,10 +1438,11 @@ class GameView(QGraphicsView):
         self.bg_pixmap = None
         
         if bg_path.exists():
-            # Load gambar
-            original_pix = QPixmap(str(bg_path))
+            # Load gambar di worker thread (satu decode, dipakai bareng WelcomeScreen)
             # Opsional: Bisa di-darken sedikit biar bubble terlihat jelas
-            self.bg_pixmap = original_pix
+            self.bg_pixmap = get_asset_loader().load(
+                "ui_bg", path=bg_path,
+                callback=lambda pixmap: setattr(self, 'bg_pixmap', pixmap))
         # ----------------------------
         
         # === FIX FULLSCREEN ===
@@ -1645,17 +1517,27 @@ class GameView(QGraphicsView):
 
     def keyPressEvent(self, event):
         key = event.key()
-        if key in (Qt.Key_Escape, Qt.Key_P):
-            # Find MainWindow ancestor and toggle pause
+        if key in (Qt.Key_Escape, Qt.Key_P, Qt.Key_F3):
+            # Find MainWindow ancestor and toggle pause / frame stats overlay
+            action = 'toggle_frame_stats' if key == Qt.Key_F3 else 'toggle_pause'
             p = self.parent()
             while p:
-                if hasattr(p, 'toggle_pause'):
-                    p.toggle_pause()
+                if hasattr(p, action):
+                    getattr(p, action)()
                     break
                 p = p.parent() if hasattr(p, 'parent') else None
         else:
             super().keyPressEvent(event)
 
+    def paintEvent(self, event):
+        fp = self.scene_ref.frame_prof if self.scene_ref else None
+        if fp is None:
+            super().paintEvent(event)
+            return
+        fp.enter("paint")
+        super().paintEvent(event)
+        fp.leave()
+
 class WelcomeScreen(QWidget):
     def __init__(self, start_callback, load_callback, quit_callback,
                  music_callback, sfx_callback,
@@ -1665,10 +1547,12 @@ class WelcomeScreen(QWidget):
                  colorblind_on=False, continue_daily_callback=None):
         super().__init__()
 
+        # Wallpaper di-decode di worker thread; sampai siap, paintEvent pakai gradient
         bg_path = Path(__file__).parent / "ui" / "bubble_bgn.webp"
         self.bg_pixmap = None
         if bg_path.exists():
-            self.bg_pixmap = QPixmap(str(bg_path))
+            self.bg_pixmap = get_asset_loader().load(
+                "ui_bg", path=bg_path, callback=self._on_bg_loaded)
 
         self.initial_music_on    = music_on
         self.initial_sfx_on      = sfx_on
@@ -1686,6 +1570,10 @@ class WelcomeScreen(QWidget):
                       music_callback, sfx_callback)
         self.setAttribute(Qt.WA_StyledBackground, True)
 
+    def _on_bg_loaded(self, pixmap):
+        self.bg_pixmap = pixmap
+        self.update()
+
     def paintEvent(self, event):
         painter = QPainter(self)
         if self.bg_pixmap:
@@ -2123,7 +2011,7 @@ class MainWindow(QMainWindow):
         self.load_settings_variables()
         self.sync_ui_with_settings()
         if self.music_enabled:
-            if self.sound_manager.bgm_player.playbackState() != QMediaPlayer.PlayingState:
+            if not self.sound_manager.is_bgm_playing():
                 self.sound_manager.resume_bgm()
         else:
             self.sound_manager.pause_bgm()
@@ -2841,6 +2729,9 @@ class MainWindow(QMainWindow):
                     self.scene.update_background_color()
                     self.update_high_score(hs)
 
+                    # Sesi replay baru, mulai dari state hasil load
+                    self.scene.recorder.start()
+
                     print("✅ Game Loaded Successfully!")
 
             except Exception as e:
@@ -2932,6 +2823,7 @@ class MainWindow(QMainWindow):
             return
         if self.scene.timer.isActive():
             self.scene.timer.stop()
+            self.scene.frames.pause()       # Semua animasi scene ikut beku
             self.scene.shot_timer.pause()
             self.scene.game_timer.pause()
             self.sound_manager.pause_bgm()
@@ -2940,6 +2832,8 @@ class MainWindow(QMainWindow):
                 self.menu_btn.setText("▶ RESUME  (P)")
         else:
             self.scene.timer.start()
+            self.scene.shot_clock.reset()   # Waktu selama pause gak dihitung ke fisika
+            self.scene.frames.resume()
             self.scene.shot_timer.resume()
             self.scene.game_timer.resume()
             if self.music_enabled:
@@ -2947,6 +2841,43 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'menu_btn'):
                 self.menu_btn.setText("🏠 MENU")
 
+    # --- Frame-time instrumentation (bubble_perf) ---
+
+    def _frame_profiler(self):
+        """Profiler scene; dibuat saat pertama dibutuhkan."""
+        if self.scene.frame_prof is None:
+            self.scene.frame_prof = FrameProfiler()
+        return self.scene.frame_prof
+
+    def _frame_stats_extra(self) -> str:
+        pool = self.scene.bubble_pool.stats()
+        return (f"pool live {pool['live']} free {pool['free']} peak {pool['peak_live']}\n"
+                f"particles {len(self.scene.particles)}  tweens {len(self.scene.tweens)}"
+                f"  tasks {len(self.scene.frames)}")
+
+    def toggle_frame_stats(self):
+        """F3: tampilkan/sembunyikan overlay frame time. Profiler hanya jalan saat
+        overlay tampil atau --frame-log aktif."""
+        overlay = getattr(self, 'frame_overlay', None)
+        if overlay is not None and overlay.isVisible():
+            overlay.hide()
+            if self.scene.frame_prof is not None and not self.scene.frame_prof.log_path:
+                self.scene.frame_prof = None
+            return
+        profiler = self._frame_profiler()
+        if overlay is None or overlay.profiler is not profiler:
+            if overlay is not None:
+                overlay.deleteLater()
+            overlay = self.frame_overlay = FrameStatsOverlay(
+                self.game_container, profiler, extra=self._frame_stats_extra)
+        overlay.move(8, max(48, self.hud_overlay.height()) + 8)
+        overlay.show()
+        overlay.raise_()
+
+    def start_frame_log(self, path):
+        """--frame-log: profiler selalu aktif, ringkasan JSON ditulis ke ``path``."""
+        self.scene.frame_prof = FrameProfiler(log_path=path)
+
     def toggle_colorblind(self, checked: bool):
         """Toggle color-blind mode and rebuild all visible bubbles."""
         self.colorblind_enabled = checked
@@ -2955,10 +2886,7 @@ class MainWindow(QMainWindow):
         # Rebuild all bubble visuals in-place if game is active
         if hasattr(self, 'scene'):
             for bubble in self.scene.bubbles:
-                # Remove old child items (symbol labels) then re-setup
-                for child in bubble.childItems():
-                    child.setParentItem(None)
-                bubble.setup_appearance()
+                bubble.setup_appearance()   # sprite atlas versi color-blind / normal
 
     # ── Menu-accessible Leaderboard / Achievement (from main menu) ───────────
 
@@ -3146,10 +3074,24 @@ class MainWindow(QMainWindow):
             self.scene.game_timer.stop()
             self._save_replay_after_session()
             self.save_game()
+        if self.scene.frame_prof is not None:
+            self.scene.frame_prof.close()
         event.accept()
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    from bubble_profile import get_profiler, profile_span
+    profiler = get_profiler()
+    if profiler:
+        profiler.end_imports()
+    with profile_span("QApplication()"):
+        app = QApplication(sys.argv)
+    with profile_span("MainWindow()"):
+        window = MainWindow()
+    frame_log = log_path_from(sys.argv)
+    if frame_log:
+        window.start_frame_log(frame_log)
+        app.aboutToQuit.connect(window.scene.frame_prof.close)
     window.show()
+    if profiler:
+        profiler.watch(app, window, loader=get_asset_loader())
     sys.exit(app.exec())
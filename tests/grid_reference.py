@@ -0,0 +1,120 @@
+"""
+Reference implementations and board generators shared by the grid tests and
+``benchmarks/bench_grid.py``.
+
+The flood fills are line-for-line copies of the original recursive
+``GameScene`` methods; the geometry helpers are brute-force scans over every
+cell. Both are slow on purpose — they define the expected answer.
+"""
+
+from __future__ import annotations
+
+import random
+
+from bubble_grid import _EVEN_ROW_DIRS, _ODD_ROW_DIRS
+
+
+def ref_neighbors(grid, row, col):
+    if row % 2 == 0:
+        directions = _EVEN_ROW_DIRS
+    else:
+        directions = _ODD_ROW_DIRS
+    out = []
+    for dr, dc in directions:
+        nr, nc = row + dr, col + dc
+        if 0 <= nr < len(grid) and 0 <= nc < len(grid[nr]):
+            if grid[nr][nc] is not None:
+                out.append((nr, nc))
+    return out
+
+
+def ref_matching(grid, row, col, color, matched):
+    """Line-for-line copy of the old recursive GameScene.find_matching."""
+    if (row, col) in matched:
+        return
+    cell_color = grid[row][col]
+    if cell_color is None:
+        return
+    if cell_color == color or cell_color == -1 or color == -1:
+        matched.add((row, col))
+        search_color = color if color != -1 else cell_color
+        for nr, nc in ref_neighbors(grid, row, col):
+            ref_matching(grid, nr, nc, search_color, matched)
+
+
+def ref_connected(grid, row, col, connected):
+    if (row, col) in connected:
+        return
+    if grid[row][col] is None:
+        return
+    connected.add((row, col))
+    for nr, nc in ref_neighbors(grid, row, col):
+        ref_connected(grid, nr, nc, connected)
+
+
+def ref_floating(grid) -> set:
+    """Filled cells not connected to row 0."""
+    connected = set()
+    for c in range(len(grid[0]) if grid else 0):
+        if grid[0][c] is not None:
+            ref_connected(grid, 0, c, connected)
+    return {(r, c) for r, row in enumerate(grid) for c, v in enumerate(row)
+            if v is not None and (r, c) not in connected}
+
+
+def hits_bubble(board, x: float, y: float, reach: float) -> bool:
+    """
+    True if any placed bubble centre lies within ``reach`` of (x, y).
+
+    Collision test for the stepped reference shot. Only the 3x3 block of
+    cells around (x, y) is tested, which covers every centre within 2 radii.
+    Boss reservations (-3) are skipped because bosses have their own hit test.
+    """
+    radius = board.radius
+    row_h = radius * 1.732
+    reach_sq = reach * reach
+    r0 = round((y - radius) / row_h)
+    for row in range(max(r0 - 1, 0), min(r0 + 2, board.rows)):
+        offset = radius if row % 2 == 1 else 0
+        c0 = round((x - board.grid_offset_x - radius - offset) / (radius * 2))
+        for col in range(max(c0 - 1, 0), min(c0 + 2, board.cols)):
+            v = board.get(row, col)
+            if v is None or v == -3:
+                continue
+            gx, gy = board.get_position(row, col)
+            if (x - gx) * (x - gx) + (y - gy) * (y - gy) < reach_sq:
+                return True
+    return False
+
+
+def nearest_empty(board, x: float, y: float):
+    """Empty cell nearest to (x, y) by full scan; ties go to the earlier cell."""
+    best, best_dist = None, float('inf')
+    for r in range(board.rows):
+        for c in range(board.cols):
+            if board.get(r, c) is not None:
+                continue
+            gx, gy = board.get_position(r, c)
+            dist = (x - gx) * (x - gx) + (y - gy) * (y - gy)
+            if dist < best_dist:
+                best, best_dist = (r, c), dist
+    return best
+
+
+def random_grid(rng: random.Random, rows: int, cols: int,
+                density: float = 0.7, colors: int = 6) -> list:
+    """Random test grid mixing colors, rainbow (-1), obstacle (-2) and boss (-3) cells."""
+    specials = (-1, -2, -3)
+    grid = []
+    for _ in range(rows):
+        row = []
+        for _ in range(cols):
+            roll = rng.random()
+            if roll >= density:
+                row.append(None)
+            elif roll < 0.03:
+                row.append(rng.choice(specials))
+            else:
+                row.append(rng.randrange(colors))
+        grid.append(row)
+    return grid
@@ -0,0 +1,94 @@
+"""
+``TweenSet`` on the NumPy path against the array-loop fallback: the same
+tweens on a fake clock put every item at the same position / opacity each
+frame and finish in the same order. The easing curves match
+``QEasingCurve``.
+"""
+
+import math
+import random
+
+import pytest
+from PySide6.QtCore import QEasingCurve
+from PySide6.QtWidgets import QGraphicsRectItem
+
+from bubble_anim import (
+    LINEAR, NUMPY_AVAILABLE, OUT_BOUNCE, OUT_CUBIC, OUT_QUAD,
+    FrameScheduler, TweenSet, ease,
+)
+
+
+TRIALS = 10
+TICKS = 200
+ITEMS = 24
+TOL = 1e-9
+CURVES = {
+    LINEAR: QEasingCurve.Linear,
+    OUT_QUAD: QEasingCurve.OutQuad,
+    OUT_CUBIC: QEasingCurve.OutCubic,
+    OUT_BOUNCE: QEasingCurve.OutBounce,
+}
+
+
+def _runs(use_numpy=False, seed: int = 0, trials: int = TRIALS):
+    """(trial, tick, items, selesai) tiap frame untuk tween acak di jam palsu."""
+    scenario = random.Random(seed)
+    for trial in range(trials):
+        clock = [0.0]
+        frames = FrameScheduler(clock=lambda: clock[0])
+        tweens = TweenSet(frames, capacity=4, use_numpy=use_numpy)   # sering tumbuh
+        items = [QGraphicsRectItem(0, 0, 10, 10) for _ in range(ITEMS)]
+        finished = []
+        for tick in range(TICKS):
+            for _ in range(scenario.choice((0, 0, 1, 3))):
+                i = scenario.randrange(ITEMS)
+                easing = scenario.choice(tuple(CURVES))
+                ms, delay = scenario.uniform(50, 900), scenario.choice((0, 0, 120))
+                done = (lambda i=i, t=tick: finished.append((i, t)))
+                if scenario.random() < 0.6:
+                    tweens.move(items[i], scenario.uniform(0, 800), scenario.uniform(0, 600),
+                                ms, easing, delay, done)
+                else:
+                    tweens.fade(items[i], scenario.random(), ms, easing, delay, done)
+            if scenario.random() < 0.03:
+                tweens.cancel(items[scenario.randrange(ITEMS)])
+            clock[0] += scenario.uniform(0.010, 0.030)
+            frames.tick()
+            yield trial, tick, items, finished
+
+
+def _values(items) -> list:
+    return [(item.pos().x(), item.pos().y(), item.opacity()) for item in items]
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+def test_numpy_step_matches_fallback():
+    for (trial, tick, fast, fast_done), (_, _, slow, slow_done) in zip(
+            _runs(use_numpy=True), _runs()):
+        for i, (a, b) in enumerate(zip(_values(fast), _values(slow))):
+            assert all(math.isclose(u, v, abs_tol=TOL) for u, v in zip(a, b)), \
+                f"trial {trial} tick {tick} item {i}: {a} != {b}"
+        assert fast_done == slow_done, f"trial {trial} tick {tick}"
+
+
+def test_easing_matches_qeasingcurve():
+    samples = [i / 200 for i in range(201)] + [4 / 11.0, 8 / 11.0, 10 / 11.0]
+    for code, curve_type in CURVES.items():
+        curve = QEasingCurve(curve_type)
+        for t in samples:
+            assert math.isclose(ease(code, t), curve.valueForProgress(t), abs_tol=1e-6), \
+                f"curve {code} t {t}"
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+def test_numpy_easing_matches_qeasingcurve():
+    import numpy as np
+    from bubble_anim import _ease_numpy
+
+    t = np.linspace(0.0, 1.0, 201)
+    for code, curve_type in CURVES.items():
+        curve = QEasingCurve(curve_type)
+        got = _ease_numpy(np.full(t.shape, code, dtype="int8"), t)
+        for u, value in zip(t.tolist(), got.tolist()):
+            assert math.isclose(value, curve.valueForProgress(u), abs_tol=1e-6), \
+                f"curve {code} t {u}"
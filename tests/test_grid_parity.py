@@ -0,0 +1,147 @@
+"""
+Parity of ``bubble_grid`` (and the compiled ``bubble_engine`` when it imports)
+against the recursive reference on randomized grids with rainbow, obstacle and
+boss cells, plus ``BubbleGrid`` geometry and incremental floating detection.
+"""
+
+import random
+
+import pytest
+
+import bubble_grid
+from bubble_grid import BubbleGrid
+from tests.grid_reference import (nearest_empty, random_grid, ref_connected,
+                                  ref_floating, ref_matching, ref_neighbors)
+
+
+TRIALS = 300
+
+
+def _implementations():
+    impls = [pytest.param(bubble_grid, id="bubble_grid")]
+    try:
+        import bubble_engine
+    except ImportError:
+        impls.append(pytest.param(None, id="bubble_engine",
+                                  marks=pytest.mark.skip(reason="bubble_engine not importable")))
+    else:
+        impls.append(pytest.param(bubble_engine, id="bubble_engine"))
+    return impls
+
+
+def _random_grids(seed: int = 0, trials: int = TRIALS):
+    """(trial, rng, grid) — papan acak 1..24 x 1..24 dengan density acak."""
+    rng = random.Random(seed)
+    for trial in range(trials):
+        rows = rng.randint(1, 24)
+        cols = rng.randint(1, 24)
+        yield trial, rng, random_grid(rng, rows, cols, density=rng.uniform(0.2, 0.95))
+
+
+def _load(grid) -> BubbleGrid:
+    board = BubbleGrid(len(grid), len(grid[0]), 22, initial_rows=0)
+    board.grid = grid
+    return board
+
+
+def _filled(grid) -> list:
+    return [(r, c) for r, row in enumerate(grid) for c, v in enumerate(row) if v is not None]
+
+
+@pytest.mark.parametrize("impl", _implementations())
+def test_list_api_matches_reference(impl):
+    for trial, rng, grid in _random_grids():
+        assert set(impl.find_floating_bubbles(grid)) == ref_floating(grid), f"trial {trial}"
+        filled = _filled(grid)
+        for r, c in rng.sample(filled, min(4, len(filled))):
+            want = set()
+            ref_matching(grid, r, c, grid[r][c], want)
+            assert set(impl.find_matching(grid, r, c)) == want, f"matching ({r},{c}) trial {trial}"
+            want = set()
+            ref_connected(grid, r, c, want)
+            assert set(impl.find_connected_cluster(grid, r, c)) == want, \
+                f"cluster ({r},{c}) trial {trial}"
+
+
+def test_bubble_grid_matches_reference():
+    for trial, rng, grid in _random_grids():
+        board = _load(grid)
+        assert board.grid == grid, f"2-D view round-trip, trial {trial}"
+        assert set(board.find_floating_bubbles()) == ref_floating(grid), f"trial {trial}"
+        filled = _filled(grid)
+        for r, c in rng.sample(filled, min(4, len(filled))):
+            assert sorted(board.get_neighbors(r, c)) == sorted(ref_neighbors(grid, r, c))
+            want = set()
+            ref_matching(grid, r, c, grid[r][c], want)
+            assert set(board.find_matching(r, c)) == want, f"matching ({r},{c}) trial {trial}"
+
+
+def test_nearest_empty_cell_matches_full_scan():
+    for trial, rng, grid in _random_grids(seed=1):
+        board = _load(grid)
+        radius = board.radius
+        width = board.cols * radius * 2 + radius * 2
+        height = board.rows * radius * 1.732 + radius * 2
+        for _ in range(8):
+            x = rng.uniform(-radius, width + radius)
+            y = rng.uniform(-radius, height + radius)
+            assert board.nearest_empty_cell(x, y) == nearest_empty(board, x, y), \
+                f"({x:.1f},{y:.1f}) trial {trial}"
+
+
+def test_pop_floating_matches_full_scan():
+    """Edit acak + push_row: pop_floating harus sama dengan scan penuh tiap ronde."""
+    for trial, rng, grid in _random_grids(seed=2):
+        board = _load(grid)
+        board.pop_floating()
+        for r, c in board.find_floating_bubbles():
+            board.set(r, c, None)
+        board.pop_floating()
+        for step in range(6):
+            for _ in range(rng.randint(1, 6)):
+                r, c = rng.randrange(board.rows), rng.randrange(board.cols)
+                board.set(r, c, None if rng.random() < 0.7 else rng.randrange(6))
+            if step == 3 and board.rows > 1:
+                board.push_row([rng.randrange(6) for _ in range(board.cols)])
+            want = board.find_floating_bubbles()
+            got = board.pop_floating()
+            assert got == want, f"trial {trial}, step {step}"
+            for r, c in got:
+                board.set(r, c, None)
+
+
+class _CountingEngine:
+    """List-API engine (bubble_grid) that records which grid objects it was given."""
+
+    def __init__(self):
+        self.grids = []
+
+    def find_matching(self, grid, row, col):
+        self.grids.append(grid)
+        return bubble_grid.find_matching(grid, row, col)
+
+    def find_connected_cluster(self, grid, row, col):
+        self.grids.append(grid)
+        return bubble_grid.find_connected_cluster(grid, row, col)
+
+    def find_floating_bubbles(self, grid):
+        self.grids.append(grid)
+        return bubble_grid.find_floating_bubbles(grid)
+
+
+def test_engine_snapshot_reused_until_write():
+    engine = _CountingEngine()
+    board = BubbleGrid(14, 20, 22, engine=engine, rng=random.Random(0))
+    board.find_matching(0, 0)
+    board.find_connected_cluster(0, 0)
+    board.find_floating_bubbles()
+    assert engine.grids[0] is engine.grids[1] is engine.grids[2]
+
+    board.set(0, 0, None)
+    assert board.find_floating_bubbles() == bubble_grid.find_floating_bubbles(board.grid)
+    assert engine.grids[-1] is not engine.grids[0]
+    assert engine.grids[-1][0][0] is None
+
+    board.push_row([1] * 20)
+    board.find_matching(0, 0)
+    assert engine.grids[-1] == board.grid
@@ -0,0 +1,109 @@
+"""
+``ParticleSystem`` against the per-particle physics of the old ``Particle``
+item: same bursts and ticks give the same positions, size and alpha, and a
+full pool drops its oldest particles first. The NumPy step must match the
+array-loop fallback.
+"""
+
+import math
+import random
+
+import pytest
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QColor
+
+from bubble_particles import DRAG, GRAVITY, NUMPY_AVAILABLE, SHRINK, ParticleSystem
+
+
+TRIALS = 20
+TICKS = 120
+CAPACITY = 64        # kecil, supaya pool sering penuh
+BOUNDS = QRectF(0, 0, 900, 700)
+TOL = 1e-9
+
+
+class _Particle:
+    """Fisika Particle lama (satu objek per partikel)."""
+
+    def __init__(self, x, y, color, life, rng):
+        self.size = rng.uniform(4, 9)
+        angle = rng.uniform(0, 2 * math.pi)
+        speed = rng.uniform(2, 8)
+        self.x, self.y = x, y
+        self.vx, self.vy = math.cos(angle) * speed, math.sin(angle) * speed
+        self.scale = 1.0
+        self.life = self.max_life = life
+        self.color = color.rgba()
+
+    def update(self) -> bool:
+        self.life -= 1
+        if self.life <= 0:
+            return False
+        self.x += self.vx
+        self.y += self.vy
+        self.vx *= DRAG
+        self.vy *= DRAG
+        self.vy += GRAVITY
+        self.scale *= SHRINK
+        return True
+
+
+def _runs(use_numpy=False, seed: int = 0, trials: int = TRIALS):
+    """(trial, tick, system, reference) tiap frame untuk ledakan acak."""
+    scenario = random.Random(seed)
+    for trial in range(trials):
+        system = ParticleSystem(BOUNDS, CAPACITY, random.Random(trial), use_numpy)
+        ref_rng = random.Random(trial)
+        reference = []
+        for tick in range(TICKS):
+            for _ in range(scenario.choice((0, 0, 0, 1, 2))):
+                x, y = scenario.uniform(0, 900), scenario.uniform(0, 700)
+                color = QColor.fromHsv(scenario.randrange(360), 200, 255)
+                n, life = scenario.randint(1, 30), scenario.randint(5, 60)
+                system.burst(x, y, color, n, life)
+                for _ in range(min(n, CAPACITY)):
+                    reference.append(_Particle(x, y, color, life, ref_rng))
+                del reference[:max(0, len(reference) - CAPACITY)]
+            system.step()
+            reference = [p for p in reference if p.update()]
+            yield trial, tick, system, reference
+
+
+def _state(system) -> list:
+    n = system.count
+    return list(zip(system.x[:n], system.y[:n], system.vx[:n], system.vy[:n],
+                    system.size[:n], system.scale[:n],
+                    (life / max_life for life, max_life
+                     in zip(system.life[:n], system.max_life[:n])),
+                    system.color[:n]))
+
+
+def test_pool_matches_particle_items():
+    for trial, tick, system, reference in _runs():
+        got = _state(system)
+        assert len(got) == len(reference), f"trial {trial} tick {tick}"
+        for i, (row, p) in enumerate(zip(got, reference)):
+            expected = (p.x, p.y, p.vx, p.vy, p.size, p.scale,
+                        p.life / p.max_life, p.color)
+            assert all(math.isclose(a, b, abs_tol=TOL) for a, b in zip(row, expected)), \
+                f"trial {trial} tick {tick} particle {i}: {row} != {expected}"
+
+
+def test_full_pool_drops_oldest():
+    system = ParticleSystem(BOUNDS, 10, random.Random(0), use_numpy=False)
+    system.burst(0, 0, QColor("red"), 6, life=40)
+    system.burst(500, 500, QColor("blue"), 6, life=40)
+    assert len(system) == 10
+    assert list(system.x[:4]) == [0.0] * 4
+    assert list(system.x[4:10]) == [500.0] * 6
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+def test_numpy_step_matches_fallback():
+    for (trial, tick, fast, _), (_, _, slow, _) in zip(_runs(use_numpy=True), _runs()):
+        assert fast.use_numpy and not slow.use_numpy
+        got, expected = _state(fast), _state(slow)
+        assert len(got) == len(expected), f"trial {trial} tick {tick}"
+        for i, (a, b) in enumerate(zip(got, expected)):
+            assert all(math.isclose(u, v, abs_tol=TOL) for u, v in zip(a, b)), \
+                f"trial {trial} tick {tick} particle {i}: {a} != {b}"
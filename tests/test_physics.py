@@ -0,0 +1,66 @@
+"""
+``predict_shot`` against a shot marched in small steps, and ``ShotFlight``
+driven through ``FixedStepClock`` with jittery frame times against one
+stepped directly.
+"""
+
+import math
+import random
+
+from bubble_grid import BubbleGrid
+from bubble_physics import CONTACT_REACH, FixedStepClock, ShotFlight, predict_shot
+from tests.grid_reference import hits_bubble
+
+
+TRIALS = 100
+STEP = 0.05          # px per langkah tembakan referensi
+RADIUS = 22
+ROWS, COLS = 14, 20
+WALL_LEFT = RADIUS
+WALL_RIGHT = COLS * RADIUS * 2 + RADIUS
+
+
+def _random_shots(seed: int = 0, trials: int = TRIALS):
+    """(trial, rng, board, x, y, ux, uy, path) untuk papan dan sudut acak."""
+    rng = random.Random(seed)
+    for trial in range(trials):
+        board = BubbleGrid(ROWS, COLS, RADIUS, initial_rows=rng.randint(0, 10))
+        for _ in range(40):
+            board.set(rng.randrange(ROWS), rng.randrange(COLS), None)
+        angle = math.radians(rng.uniform(15, 165))
+        ux, uy = math.cos(angle), -math.sin(angle)
+        x, y = WALL_RIGHT / 2 + ux * 40, 600 + uy * 40
+        path = predict_shot(board, x, y, ux, uy, WALL_LEFT, WALL_RIGHT)
+        yield trial, rng, board, x, y, ux, uy, path
+
+
+def test_prediction_matches_stepping():
+    reach = RADIUS * CONTACT_REACH
+    for trial, _, board, x, y, ux, uy, path in _random_shots():
+        travelled = 0.0
+        while y >= RADIUS and not hits_bubble(board, x, y, reach):
+            x, y, travelled = x + ux * STEP, y + uy * STEP, travelled + STEP
+            if x <= WALL_LEFT:
+                x, ux = 2 * WALL_LEFT - x, abs(ux)
+            elif x >= WALL_RIGHT:
+                x, ux = 2 * WALL_RIGHT - x, -abs(ux)
+        assert abs(travelled - path.distance) <= 2 * STEP, \
+            f"trial {trial}: stepped {travelled:.2f} px, predicted {path.distance:.2f} px"
+
+
+def test_flight_independent_of_frame_timing():
+    for trial, rng, *_, path in _random_shots(seed=1):
+        steady = ShotFlight(path)
+        while not steady.step():
+            pass
+        now = [0.0]
+        clock = FixedStepClock(clock=lambda: now[0])
+        clock.reset()
+        jittery = ShotFlight(path)
+        while not jittery.landed:
+            now[0] += rng.uniform(0.001, 0.09)
+            for _ in range(clock.advance()):
+                if jittery.step():
+                    break
+        assert (jittery.ticks, jittery.position()) == (steady.ticks, steady.position()), \
+            f"trial {trial}: flight depends on frame timing"
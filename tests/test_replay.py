@@ -0,0 +1,144 @@
+"""
+``ReplayRecorder`` + ``verify_replay`` round trip on the version 3 format:
+a seeded headless game recorded the way ``GameScene`` records it verifies
+clean, and a tampered shot fails at that shot, not somewhere later.
+"""
+
+import copy
+import json
+import random
+
+from bubble_replay import ReplayEvent, ReplayRecorder, verify_replay
+from bubble_sim import MAX_ANGLE, MIN_ANGLE, GreedyPolicy
+from bubble_state import GameListener, GameRng, GameState, Swap, UsePower
+
+
+SEEDS = (1, 2, 3)
+MAX_SHOTS = 60
+
+
+class _Recording(GameListener):
+    """Catat event di dalam ``land()`` persis seperti hook GameScene."""
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+        self.state = None
+
+    def state_matched(self, matched, x, y):
+        self.recorder.record_match(len(matched), self.state.score.score)
+
+    def state_floating_removed(self, count):
+        if count > 0:
+            self.recorder.record_drop(count)
+
+    def state_neighbors_dropped(self, count):
+        self.recorder.record_drop(count)
+
+
+def _record_game(seed: int):
+    """
+    Mainkan satu game ber-seed dengan bot greedy. Return (replay lewat JSON,
+    sudut alternatif per tembakan yang mendarat di cell lain, atau None).
+    """
+    recorder = ReplayRecorder()
+    listener = _Recording(recorder)
+    state = GameState(rng=GameRng(seed), listener=listener)
+    listener.state = state
+    policy, rng = GreedyPolicy(), random.Random(f"{seed}:replay")
+    alternates = []
+
+    recorder.start(seed)
+    recorder.begin(seed, json.loads(json.dumps(state.snapshot())))
+    state.rng.seed(seed)
+
+    shots = 0
+    while shots < MAX_SHOTS:
+        action = policy(state, rng)
+        if isinstance(action, Swap):
+            state.swap_colors()
+            recorder.record_swap()
+            continue
+        if isinstance(action, UsePower):
+            assert state.activate_power(action.power_type)
+            recorder.record_power(action.power_type)
+            continue
+
+        shots += 1
+        angle = action.angle
+        alternates.append(_other_angle(state, angle))
+        recorder.record_shot(angle, state.current_color)
+        path = state.fire(angle)
+        cx, cy = path.contact
+        bounced = len(path.points) > 2
+        recorder.record_land(path.cell, cx, cy, bounced, 1.0, 0)
+        result = state.land(path.cell, cx, cy, 1.0, bounced, 0)
+        if result is None or result.game_over:
+            break
+        if result.ceiling_due:
+            recorder.record_ceiling()
+            if not state.add_ceiling_row():
+                break
+
+    recorder.set_level(state.level)
+    recorder.set_final_score(state.score.score)
+    return json.loads(json.dumps(recorder.to_dict())), alternates
+
+
+def _other_angle(state: GameState, angle: float):
+    """Sudut terdekat dari ``angle`` yang mendarat di cell berbeda."""
+    cell = state.predict(*state.launch_point(angle)).cell
+    for offset in range(1, MAX_ANGLE - MIN_ANGLE):
+        for other in (angle + offset, angle - offset):
+            if MIN_ANGLE <= other <= MAX_ANGLE:
+                other_cell = state.predict(*state.launch_point(other)).cell
+                if other_cell is not None and other_cell != cell:
+                    return other
+    return None
+
+
+def _shot_indices(data: dict) -> list:
+    return [i for i, ev in enumerate(data["events"]) if ev["k"] == ReplayEvent.SHOT]
+
+
+def test_recorded_game_verifies():
+    for seed in SEEDS:
+        data, _ = _record_game(seed)
+        assert data["version"] == 3
+        assert any(ev["k"] == ReplayEvent.MATCH for ev in data["events"]), f"seed {seed}"
+        check = verify_replay(data)
+        assert check.ok, f"seed {seed}: {check.reason}"
+        assert check.shots == len(_shot_indices(data)), f"seed {seed}"
+        assert (check.score, check.level) == (data["score"], data["level"]), f"seed {seed}"
+
+
+def test_tampered_color_fails_at_that_shot():
+    for seed in SEEDS:
+        data, _ = _record_game(seed)
+        shots = _shot_indices(data)
+        for index in (shots[1], shots[len(shots) // 2], shots[-1]):
+            tampered = copy.deepcopy(data)
+            event = tampered["events"][index]
+            event["d"]["color"] = (event["d"]["color"] + 1) % 6
+            check = verify_replay(tampered)
+            assert not check.ok, f"seed {seed} event {index}"
+            assert check.divergence.index == index, f"seed {seed}: {check.reason}"
+            assert check.divergence.kind == "color", f"seed {seed}: {check.reason}"
+
+
+def test_tampered_angle_fails_at_that_shot():
+    for seed in SEEDS:
+        data, alternates = _record_game(seed)
+        shots = _shot_indices(data)
+        for shot in (1, len(shots) // 2, len(shots) - 1):
+            index = shots[shot]
+            if alternates[shot] is None:
+                continue
+            tampered = copy.deepcopy(data)
+            tampered["events"][index]["d"]["angle"] = alternates[shot]
+            check = verify_replay(tampered)
+            assert not check.ok, f"seed {seed} event {index}"
+            # Sudut tidak disimpan sebagai hasil; yang pertama beda adalah
+            # LAND milik tembakan itu sendiri (event tepat sesudahnya)
+            assert data["events"][index + 1]["k"] == ReplayEvent.LAND
+            assert check.divergence.index == index + 1, f"seed {seed}: {check.reason}"
+            assert check.divergence.kind == "landing", f"seed {seed}: {check.reason}"
@@ -0,0 +1,102 @@
+"""
+``SfxMixer`` driven through ``NullSink`` the way the game pumps it once per
+frame: identical requests coalesce into one voice, higher priority effects
+start first, a full mixer steals or drops by priority, and the NumPy and
+``array`` renderers produce the same bytes.
+"""
+
+import math
+import random
+from array import array
+
+import pytest
+
+from bubble_fx import COALESCE_MAX_GAIN, NUMPY_AVAILABLE, NullSink, SfxMixer
+
+
+CLIP_FRAMES = 4000       # > satu pump (rate // 60 = 735 frame), voice masih hidup
+NAMES = ("shoot", "burst", "clear", "combo")
+
+
+def _pcm(rng, frames: int, channels: int) -> bytes:
+    """PCM int16 acak, sebagian dekat batas supaya clipping ikut dites."""
+    peak = rng.choice((3000, 20000, 32767))
+    samples = array('h', (rng.randint(-peak, peak) for _ in range(frames * channels)))
+    return samples.tobytes()
+
+
+def _sink(use_numpy=None, max_voices=6, seed: int = 0) -> NullSink:
+    rng = random.Random(seed)
+    mixer = SfxMixer(max_voices=max_voices, use_numpy=use_numpy)
+    for i, name in enumerate(NAMES):
+        channels = 1 if i % 2 else 2
+        mixer.add_clip(name, _pcm(rng, CLIP_FRAMES, channels), channels)
+    return NullSink(mixer)
+
+
+def test_frame_requests_coalesce():
+    sink = _sink()
+    mixer = sink.mixer
+    for _ in range(20):
+        mixer.request("burst")
+    mixer.request("combo")
+    mixer.request("clear")
+    sink.pump()
+
+    assert len(mixer.voices) == 3
+    gains = {v.name: v.gain for v in mixer.voices}
+    assert gains["burst"] == COALESCE_MAX_GAIN
+    assert gains["combo"] == gains["clear"] == 1.0
+    assert mixer.stats["requested"] == 22
+    assert mixer.stats["coalesced"] == 19
+    assert not mixer.pending
+
+
+def test_priority_order_of_start():
+    sink = _sink()
+    mixer = sink.mixer
+    for name in ("burst", "burst", "clear", "burst", "combo"):
+        mixer.request(name)
+    sink.pump()
+
+    serial = {v.name: v.serial for v in mixer.voices}
+    assert serial["combo"] < serial["clear"] < serial["burst"]
+
+
+def test_full_mixer_steals_and_drops():
+    sink = _sink(max_voices=2)
+    mixer = sink.mixer
+    mixer.request("burst")
+    mixer.request("shoot")
+    sink.pump()
+    assert sorted(v.name for v in mixer.voices) == ["burst", "shoot"]
+
+    # combo mencuri voice prioritas terendah (burst)
+    mixer.request("combo")
+    sink.pump()
+    assert sorted(v.name for v in mixer.voices) == ["combo", "shoot"]
+    assert mixer.stats["stolen"] == 1
+
+    # burst tidak boleh mencuri voice shoot/combo: di-drop
+    mixer.request("burst")
+    sink.pump()
+    assert sorted(v.name for v in mixer.voices) == ["combo", "shoot"]
+    assert mixer.stats["dropped"] == 1
+    assert mixer.stats["played"] == 3
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+def test_numpy_render_matches_array():
+    for seed in range(5):
+        fast, slow = _sink(True, max_voices=3, seed=seed), _sink(False, max_voices=3, seed=seed)
+        assert fast.mixer.use_numpy and not slow.mixer.use_numpy
+        script = random.Random(seed)
+        for frame in range(40):
+            for _ in range(script.choice((0, 0, 1, 3, 8))):
+                name = script.choice(NAMES)
+                fast.mixer.request(name)
+                slow.mixer.request(name)
+            frames = script.choice((None, 1, 512, 2048))
+            assert fast.pump(frames) == slow.pump(frames), f"seed {seed} frame {frame}"
+        assert fast.frames_written == slow.frames_written
+        assert fast.mixer.stats == slow.mixer.stats, f"seed {seed}"
@@ -0,0 +1,34 @@
+"""
+``GameState.activate_power`` and ``GameState.reset``: freeze works right away
+without leaving a pending power, and a new game starts without leftovers
+from the previous one.
+"""
+
+from bubble_state import GameRng, GameState, PowerUpType
+
+
+def _state_with(power_type) -> GameState:
+    state = GameState(rng=GameRng(1))
+    state.powers.add_powerup_charge(power_type)
+    return state
+
+
+def test_freeze_is_not_left_pending():
+    state = _state_with(PowerUpType.FREEZE)
+    assert state.activate_power(PowerUpType.FREEZE)
+    assert state.freeze_shots_remaining == 5
+    assert state.active_power is None
+
+
+def test_reset_clears_previous_game():
+    state = _state_with(PowerUpType.BOMB)
+    assert state.activate_power(PowerUpType.BOMB)
+    state.freeze_shots_remaining = 3
+    state.level = 4
+    state.score.set_level(4)
+
+    state.reset()
+    assert state.level == 1
+    assert state.freeze_shots_remaining == 0
+    assert state.active_power is None
+    assert state.score.snapshot()["level"] == 1